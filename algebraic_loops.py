@@ -0,0 +1,194 @@
+"""Detection and solution of algebraic loops between variables
+
+Coupled systems are usually connected through states, e.g., with a
+placeholder variable and ``replace(placeholder, x2)``. When the loop goes
+through variables only, the forward pass has no valid order and the
+coupled variables have to satisfy a fixed-point equation at every step.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["find_algebraic_loops", "AlgebraicLoop", "AlgebraicLoopExecutor"]
+
+
+from numbers import Number
+from typing import List
+
+import numpy as np
+
+from cdcm import *
+from dag_utils import get_states, get_dag_index
+
+
+def find_algebraic_loops(system: System) -> List[List[str]]:
+    """Return the paths of the functions in each algebraic loop of a system.
+
+    Call it right after building a system to check the coupling.
+    """
+    dag = get_dag_index(system)
+    deps = dag.function_dependencies()
+    return [[dag.function_paths[i] for i in component]
+            for component in dag.strongly_connected_components()
+            if len(component) > 1 or component[0] in deps[component[0]]]
+
+
+class AlgebraicLoop:
+    """Solves the variables written by a strongly connected set of functions.
+
+    The loop is written as ``x = G(x)``, where ``x`` stacks the values of
+    all variables written inside the loop and ``G`` evaluates the loop
+    functions once in order. ``method="fixed_point"`` iterates the (damped)
+    map directly. ``method="newton"`` solves ``G(x) - x = 0`` with a
+    finite-difference Jacobian that is kept across steps and refreshed
+    with Broyden updates, so after the first step each iteration costs a
+    single loop evaluation.
+    """
+
+    def __init__(self,
+                 functions: List[Function],
+                 *,
+                 method: str="newton",
+                 tol: Number=1e-10,
+                 max_iter: int=50,
+                 damping: Number=1.0) -> None:
+        if method not in ("fixed_point", "newton"):
+            raise ValueError(f"Unknown method {method}.")
+        self.functions = functions
+        self.method = method
+        self.tol = tol
+        self.max_iter = max_iter
+        self.damping = damping
+        self.variables = [c for f in functions for c in f.children
+                          if not isinstance(c, State)]
+        self.shapes = None
+        self.jacobian = None
+        self.iterations = 0
+
+    def _get(self) -> np.ndarray:
+        values = [np.asarray(v.value, dtype=float) for v in self.variables]
+        self.shapes = [value.shape for value in values]
+        return np.concatenate([value.ravel() for value in values])
+
+    def _set(self, x: np.ndarray) -> None:
+        start = 0
+        for variable, shape in zip(self.variables, self.shapes):
+            size = int(np.prod(shape))
+            value = x[start:start + size]
+            variable.value = value.reshape(shape) if shape else value[0]
+            start += size
+
+    def _evaluate(self, x: np.ndarray) -> np.ndarray:
+        self._set(x)
+        for func in self.functions:
+            func.forward()
+        return self._get()
+
+    def _converged(self, x: np.ndarray, gx: np.ndarray) -> bool:
+        scale = 1.0 + np.max(np.abs(x), initial=0.0)
+        return np.max(np.abs(gx - x), initial=0.0) <= self.tol * scale
+
+    def solve(self) -> None:
+        """Solve the loop starting from the current values of its variables."""
+        x = self._get()
+        if self.method == "fixed_point":
+            self._solve_fixed_point(x)
+        else:
+            self._solve_newton(x)
+
+    def _solve_fixed_point(self, x: np.ndarray) -> None:
+        for i in range(self.max_iter):
+            gx = self._evaluate(x)
+            self.iterations = i + 1
+            if self._converged(x, gx):
+                return
+            x = x + self.damping * (gx - x)
+        raise RuntimeError(self._failure_message())
+
+    def _finite_difference_jacobian(self, x: np.ndarray, fx: np.ndarray) -> np.ndarray:
+        jacobian = np.empty((x.size, x.size))
+        for j in range(x.size):
+            h = 1e-7 * (1.0 + abs(x[j]))
+            xh = x.copy()
+            xh[j] += h
+            jacobian[:, j] = (self._evaluate(xh) - xh - fx) / h
+        # The loop variables hold G(x), not the last perturbed evaluation
+        self._set(x + fx)
+        return jacobian
+
+    def _solve_newton(self, x: np.ndarray) -> None:
+        gx = self._evaluate(x)
+        fx = gx - x
+        if self.jacobian is None or self.jacobian.shape[0] != x.size:
+            self.jacobian = self._finite_difference_jacobian(x, fx)
+        for i in range(self.max_iter):
+            self.iterations = i + 1
+            if self._converged(x, gx):
+                self._set(gx)
+                return
+            try:
+                dx = -self.damping * np.linalg.solve(self.jacobian, fx)
+            except np.linalg.LinAlgError:
+                self.jacobian = self._finite_difference_jacobian(x, fx)
+                continue
+            x_new = x + dx
+            gx = self._evaluate(x_new)
+            fx_new = gx - x_new
+            if np.linalg.norm(fx_new) > np.linalg.norm(fx):
+                # The stale Jacobian is no longer a good model
+                self.jacobian = self._finite_difference_jacobian(x_new, fx_new)
+            elif dx @ dx > 0.0:
+                self.jacobian += np.outer(fx_new - fx - self.jacobian @ dx, dx) / (dx @ dx)
+            x, fx = x_new, fx_new
+        raise RuntimeError(self._failure_message())
+
+    def _failure_message(self) -> str:
+        names = [f.name for f in self.functions]
+        return (f"Algebraic loop through {names} did not converge "
+                + f"in {self.max_iter} iterations.")
+
+
+class AlgebraicLoopExecutor:
+    """Runs the forward pass of a system that contains algebraic loops.
+
+    The loops are detected once when the executor is built. Functions
+    outside of loops are evaluated as usual and every loop is handed to
+    an ``AlgebraicLoop`` solver. Use it in place of ``system.forward()``
+    and ``system.transition()``.
+    """
+
+    def __init__(self, system: System, **solver_kwargs) -> None:
+        self.system = system
+        dag = get_dag_index(system)
+        functions = dag.functions
+        deps = dag.function_dependencies()
+        self.states = [s for _, s in get_states(system)]
+        self.plan = []
+        self.loops = []
+        for component in dag.strongly_connected_components():
+            if len(component) > 1 or component[0] in deps[component[0]]:
+                loop = AlgebraicLoop([functions[i] for i in component],
+                                     **solver_kwargs)
+                self.loops.append(loop)
+                self.plan.append(loop.solve)
+            else:
+                self.plan.append(functions[component[0]].forward)
+
+    def forward(self) -> None:
+        """Evaluate all functions of the system and solve all loops."""
+        for step in self.plan:
+            step()
+
+    def transition(self) -> None:
+        """Move all states to their next value."""
+        for state in self.states:
+            state.transition()
+
+    def __str__(self) -> str:
+        return (f"AlgebraicLoopExecutor(system={self.system.name}, "
+                + f"steps={len(self.plan)}, loops={len(self.loops)})")
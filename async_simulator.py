@@ -0,0 +1,253 @@
+"""Asyncio interface to the simulator for co-simulation
+
+The forward and transition passes stay synchronous. What is awaited are
+the inputs and outputs around them: rows fed from sockets or queues, and
+hooks that talk to external processes. Between steps control goes back
+to the event loop, so many simulators can share one loop:
+
+    feed = AsyncDataFeed([hab.cmd.heater_on], commands_queue)
+    sim = AsyncSimulator(hab, feeds=[feed])
+
+    @sim.on_forward
+    async def publish():
+        await writer.drain()
+
+    await asyncio.gather(sim.run(1000), other_sim.run(1000))
+
+A feed may also drive the columns of a ``DataSystem``, e.g., sensor rows
+that arrive over a socket, instead of the rows of its recorded data:
+
+    feed = AsyncDataFeed(sensors, socket_rows, columns=["T_in", "P_bus"])
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["AsyncDataFeed", "AsyncSimulator", "run_concurrently"]
+
+
+import asyncio
+import inspect
+from numbers import Number
+from typing import Any, Awaitable, Callable, Sequence, Union
+
+from cdcm import *
+from dag_utils import get_functions
+
+
+async def _call(hook: Callable, *args) -> Any:
+    result = hook(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class AsyncDataFeed:
+    """Writes rows from an asynchronous source into variables.
+
+    Every step one row is awaited and its entries are assigned to the
+    variables. When the source is exhausted the variables keep their last
+    values.
+
+    The feed may also drive the columns of a ``DataSystem``. The functions
+    that fetch these columns from the recorded data then return the entries
+    of the latest row instead, until ``close()`` puts them back. Other
+    variables written by a function are rejected, because the forward pass
+    would overwrite the fed values.
+
+    Arguments:
+        variables -- The variables that receive the entries of a row, or a
+                     ``DataSystem``.
+        source    -- An ``asyncio.Queue`` or an asynchronous iterable of rows.
+                     With a single variable a row may be a scalar.
+        columns   -- The names of the fed columns of a ``DataSystem``. By
+                     default all of its columns.
+        timeout   -- Seconds to wait for a row. On a timeout the variables
+                     keep their values and the row is assigned in a later
+                     step, once it arrived. By default wait forever.
+    """
+
+    def __init__(self,
+                 variables: Union[Sequence[Variable], DataSystem],
+                 source,
+                 *,
+                 columns: Sequence[str]=None,
+                 timeout: Number=None) -> None:
+        self.data_system = None
+        fetch = {}
+        if isinstance(variables, DataSystem):
+            self.data_system = variables
+            for _, func in get_functions(variables):
+                for child in func.children:
+                    if not isinstance(child, State):
+                        fetch[id(child)] = func
+            if columns is None:
+                variables = [c for func in dict.fromkeys(fetch.values())
+                             for c in func.children if id(c) in fetch]
+            else:
+                variables = [getattr(self.data_system, c) for c in columns]
+        elif columns is not None:
+            raise ValueError("Columns can only be selected from a DataSystem.")
+        for variable in variables:
+            writers = [p.name for p in variable.parents
+                       if isinstance(p, Function) and p is not fetch.get(id(variable))]
+            if writers:
+                raise ValueError(f"{variable.name} is written by {writers}, which "
+                                 + "would overwrite the fed values.")
+        self.variables = list(variables)
+        self.source = source
+        self.timeout = timeout
+        self.exhausted = False
+        self.missed = 0
+        self._iterator = None if hasattr(source, "get") else source.__aiter__()
+        # The row being awaited, kept across timeouts
+        self._pending = None
+        # The latest entries of the fed columns, returned by their fetch functions
+        self._latest = {id(v): v.value for v in self.variables if id(v) in fetch}
+        self._originals = []
+        for func in dict.fromkeys(fetch[key] for key in self._latest):
+            self._originals.append((func, func.func))
+            func.func = self._fetch(func)
+
+    def _fetch(self, func: Function) -> Callable:
+        original = func.func
+        children = list(func.children)
+        fed = [id(c) in self._latest for c in children]
+
+        def fetch(*values):
+            if all(fed):
+                out = [self._latest[id(c)] for c in children]
+            else:
+                # The other columns still come from the recorded data
+                out = original(*values)
+                out = list(out) if len(children) > 1 else [out]
+                for k, c in enumerate(children):
+                    if fed[k]:
+                        out[k] = self._latest[id(c)]
+            return tuple(out) if len(children) > 1 else out[0]
+
+        return fetch
+
+    async def _next(self) -> Any:
+        if self._iterator is None:
+            return await self.source.get()
+        return await self._iterator.__anext__()
+
+    async def update(self) -> None:
+        """Await the next row and assign it."""
+        if self.exhausted:
+            return
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._next())
+        try:
+            # A timeout must not cancel the source, or the row would be lost
+            row = await asyncio.wait_for(asyncio.shield(self._pending), self.timeout)
+        except asyncio.TimeoutError:
+            # The row may still arrive, even right after the timeout
+            self.missed += 1
+            return
+        except StopAsyncIteration:
+            self._pending = None
+            self.exhausted = True
+            return
+        self._pending = None
+        if len(self.variables) == 1 and not isinstance(row, (list, tuple)):
+            row = (row,)
+        for variable, value in zip(self.variables, row):
+            if id(variable) in self._latest:
+                self._latest[id(variable)] = value
+            variable.value = value
+
+    def close(self) -> None:
+        """Stop waiting for the pending row and restore the fetch functions."""
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        for func, original in self._originals:
+            func.func = original
+        self._originals = []
+
+
+class AsyncSimulator:
+    """Steps a ``Simulator`` from a coroutine.
+
+    A step awaits all data feeds concurrently, then it fires the due
+    asynchronous events and runs ``forward()``. After that it awaits the
+    ``on_forward`` hooks (e.g., sending outputs to an external process),
+    runs ``transition()`` and yields to the event loop. Events added with
+    ``Simulator.add_event()`` still work as before.
+
+    Arguments:
+        system    -- The system to simulate.
+        feeds     -- ``AsyncDataFeed`` objects updated before every step.
+        simulator -- An existing ``Simulator`` of the system. One is made if
+                     not given.
+    """
+
+    def __init__(self,
+                 system: System,
+                 *,
+                 feeds: Sequence[AsyncDataFeed]=(),
+                 simulator: Simulator=None) -> None:
+        self.system = system
+        self.simulator = Simulator(system) if simulator is None else simulator
+        self.feeds = list(feeds)
+        self.events = []
+        self.hooks = []
+        self.steps = 0
+        clock = getattr(system, "clock", None)
+        self.time = getattr(clock, "t", None)
+
+    def add_event(self, t: Number, event: Callable[[], Awaitable]) -> None:
+        """Await ``event()`` in the first step at which the clock reaches ``t``."""
+        if self.time is None:
+            raise ValueError(f"System {self.system.name} has no clock for timed events.")
+        self.events.append((t, event))
+        self.events.sort(key=lambda e: e[0])
+
+    def on_forward(self, hook: Callable[[], Awaitable]) -> Callable[[], Awaitable]:
+        """Register a hook awaited after every forward pass. Works as a decorator."""
+        self.hooks.append(hook)
+        return hook
+
+    async def step(self) -> None:
+        if self.feeds:
+            await asyncio.gather(*(feed.update() for feed in self.feeds))
+        while self.events and self.events[0][0] <= self.time.value:
+            _, event = self.events.pop(0)
+            await _call(event)
+        self.simulator.forward()
+        for hook in self.hooks:
+            await _call(hook)
+        self.simulator.transition()
+        self.steps += 1
+        # Let the other tasks of the loop run
+        await asyncio.sleep(0)
+
+    async def run(self,
+                  n_steps: int,
+                  *,
+                  until: Callable[[], bool]=None) -> int:
+        """Run ``n_steps`` steps, or stop early once ``until()`` is true.
+
+        Returns the number of steps taken.
+        """
+        for i in range(n_steps):
+            await self.step()
+            if until is not None and until():
+                return i + 1
+        return n_steps
+
+    def __str__(self) -> str:
+        return (f"AsyncSimulator(system={self.system.name}, feeds={len(self.feeds)}, "
+                + f"events={len(self.events)}, steps={self.steps})")
+
+
+async def run_concurrently(simulators: Sequence[AsyncSimulator], n_steps: int) -> list:
+    """Run several simulators on the current event loop, interleaving their steps."""
+    return await asyncio.gather(*(sim.run(n_steps) for sim in simulators))
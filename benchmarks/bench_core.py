@@ -0,0 +1,128 @@
+"""Benchmarks of the cdcm core: construction, stepping and saving
+
+Run with pytest-benchmark. Every benchmark fails when it exceeds its
+budget in ``budgets.json`` (see ``conftest.py``). For finer comparisons
+against a stored run:
+
+    pytest benchmarks/bench_core.py --benchmark-autosave
+    pytest benchmarks/bench_core.py --benchmark-compare \
+        --benchmark-compare-fail=mean:15%
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import numpy as np
+import pytest
+
+from cdcm import *
+from dag_utils import get_functions, get_function_levels
+from synthetic_systems import make_synthetic_system
+
+
+def _decay(x, r):
+    return x - 0.01 * r * x
+
+
+def make_flat_system(n_nodes: int) -> System:
+    """A flat system of independent decaying states with about ``n_nodes`` nodes."""
+    with System(name="flat") as system:
+        for i in range(max(1, n_nodes // 3)):
+            x = State(name=f"x{i}", value=1.0, units="m")
+            r = Parameter(name=f"r{i}", value=0.1, units="1/s")
+            Function(name=f"f{i}", func=_decay, parents=[x, r], children=x)
+    return system
+
+
+def make_nested_system(depth: int, width: int=3) -> System:
+    """A chain of ``depth`` nested systems, each with ``width`` states."""
+    with System(name=f"level{depth - 1}") as system:
+        if depth > 1:
+            make_nested_system(depth - 1, width)
+        rate = Parameter(name="r", value=1.0, units="1/s")
+        for i in range(width):
+            x = State(name=f"x{i}", value=1.0, units="m")
+            Function(name=f"f{i}", func=_decay, parents=[x, rate], children=x)
+    return system
+
+
+def run(system: System, n_steps: int) -> None:
+    for _ in range(n_steps):
+        system.forward()
+        system.transition()
+
+
+@pytest.mark.parametrize("n_nodes", [10, 1_000, 100_000])
+def test_construction(benchmark, n_nodes):
+    rounds = 1 if n_nodes > 10_000 else 5
+    benchmark.pedantic(make_flat_system, args=(n_nodes,), rounds=rounds)
+
+
+@pytest.mark.parametrize("n_nodes", [10, 1_000, 100_000])
+def test_step(benchmark, n_nodes):
+    system = make_flat_system(n_nodes)
+    rounds = 1 if n_nodes > 10_000 else 5
+    benchmark.pedantic(run, args=(system, 10), rounds=rounds)
+
+
+@pytest.mark.parametrize("layout", ["flat", "nested"])
+def test_step_nesting(benchmark, layout):
+    # Same number of states, one level vs 100 nested levels
+    system = make_flat_system(900) if layout == "flat" else make_nested_system(100)
+    benchmark.pedantic(run, args=(system, 10), rounds=5)
+
+
+@pytest.mark.parametrize("n_nodes", [1_000, 100_000, 1_000_000])
+def test_synthetic_construction(benchmark, n_nodes):
+    benchmark.pedantic(make_synthetic_system, args=(n_nodes,),
+                       kwargs=dict(n_subsystems=64, depth=4, seed=0), rounds=1)
+
+
+@pytest.mark.parametrize("n_nodes", [1_000, 100_000, 1_000_000])
+def test_synthetic_ordering(benchmark, n_nodes):
+    system = make_synthetic_system(n_nodes, n_subsystems=64, depth=4, seed=0)
+    functions = [func for _, func in get_functions(system)]
+    benchmark.pedantic(get_function_levels, args=(functions,), rounds=1)
+
+
+@pytest.mark.parametrize("n_nodes", [1_000, 100_000])
+def test_synthetic_step(benchmark, n_nodes):
+    system = make_synthetic_system(n_nodes, n_subsystems=64, depth=4, seed=0)
+    benchmark.pedantic(run, args=(system, 10), rounds=1)
+
+
+def test_simulation_saver(benchmark, tmp_path):
+    max_steps = 10_000
+    system = make_flat_system(30)
+
+    def save_run():
+        saver = SimulationSaver(str(tmp_path / "bench.h5"), system, max_steps=max_steps)
+        for _ in range(max_steps):
+            system.forward()
+            saver.save()
+            system.transition()
+        saver.file_handler.close()
+
+    benchmark.pedantic(save_run, rounds=1)
+
+
+def test_data_system(benchmark):
+    n_steps = 10_000
+    data = np.random.randn(n_steps, 4)
+
+    def replay():
+        data_system = DataSystem(
+            data=data,
+            name="data",
+            columns=["a", "b", "c", "d"],
+            column_units=["m"] * 4,
+            column_descriptions=["A column."] * 4
+        )
+        run(data_system, n_steps - 1)
+
+    benchmark.pedantic(replay, rounds=3)
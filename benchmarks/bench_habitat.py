@@ -0,0 +1,50 @@
+"""Benchmarks of the habitat models
+
+    pytest benchmarks/bench_habitat.py --benchmark-autosave
+
+The solar irradiance benchmark queries the ephemeris service and only
+runs when ``CDCM_BENCH_NETWORK=1``.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import os
+from datetime import datetime
+
+import pytest
+
+from cdcm import *
+
+
+@pytest.mark.skipif(os.environ.get("CDCM_BENCH_NETWORK") != "1",
+                    reason="needs the ephemeris service")
+def test_solar_irradiance(benchmark):
+    from exterior_variables import SolarIrradiance
+
+    def build():
+        with System(name="hab") as hab:
+            clock = make_clock(dt=1.0, units="hours")
+            SolarIrradiance("solar", clock, datetime(2022, 1, 10), 24 * 30)
+        return hab
+
+    benchmark.pedantic(build, rounds=1)
+
+
+def test_diagnostic_reasoner(benchmark):
+    pytest.importorskip("cdcm_ai")
+    pytest.importorskip("cdcm_abstractions")
+    from cdcm_abstractions import make_power_system
+    from cdcm_ai import DiagnosticReasoner
+
+    with System(name="hab") as hab:
+        clock = make_clock(dt=1, units="hr")
+        power_system = make_power_system("power")
+
+    reasoner = DiagnosticReasoner(hab)
+    benchmark(reasoner.process)
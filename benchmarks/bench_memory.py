@@ -0,0 +1,37 @@
+"""Memory benchmark: bytes per node of large systems
+
+    pytest benchmarks/bench_memory.py -s
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import pytest
+
+from node_memory import get_node_sizes, measure_bytes_per_node
+from synthetic_systems import make_synthetic_system
+
+
+@pytest.mark.parametrize("n_nodes", [10_000, 100_000])
+def test_bytes_per_node(n_nodes):
+    build = lambda: make_synthetic_system(n_nodes, n_subsystems=64, depth=4, seed=0)
+    before, n = measure_bytes_per_node(build)
+    after, _ = measure_bytes_per_node(build, intern=True)
+    shared, _ = measure_bytes_per_node(build, intern=True, share_empty=True)
+    sizes = get_node_sizes(build())
+    print(f"\n{n} nodes: {before:1.0f} bytes/node allocated, "
+          + f"{after:1.0f} bytes/node with interned strings, "
+          + f"{shared:1.0f} bytes/node with shared empty links")
+    for name, (size, count) in sizes.items():
+        print(f"    {name:10s} {count:8d} nodes, {size:6.0f} bytes/node "
+              + "(object, __dict__ and parent/child lists)")
+    # The shallow sizes are part of what was allocated
+    shallow = sum(size * count for size, count in sizes.values())
+    assert sum(count for _, count in sizes.values()) == n
+    assert shallow <= before * n
+    assert shared <= after
@@ -0,0 +1,121 @@
+"""Regression budgets of the benchmarks
+
+``budgets.json`` holds the median times of a run on a reference machine,
+times a fixed ``MARGIN``, together with a description of that machine.
+On the reference machine every benchmark with a budget fails when its
+median exceeds the budget, so a plain run catches slowdowns without a
+stored pytest-benchmark run:
+
+    pytest benchmarks/bench_core.py
+
+On another machine the budgets are only checked when ``CDCM_BENCH_SLACK``
+gives the factor by which that machine may be slower:
+
+    CDCM_BENCH_SLACK=2 pytest benchmarks/bench_core.py
+
+After an intended change, or to make this machine the reference, record
+the measured medians as the new budgets:
+
+    pytest benchmarks --update-budgets
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import json
+import os
+import platform
+
+import pytest
+
+
+BUDGETS = os.path.join(os.path.dirname(__file__), "budgets.json")
+# The budget recorded by --update-budgets, relative to the measured median
+MARGIN = 1.3
+
+
+def _get_machine() -> dict:
+    processor = platform.processor()
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo") as f:
+            models = [line.split(":", 1)[1].strip() for line in f
+                      if line.startswith("model name")]
+        processor = models[0] if models else processor
+    return {
+        "processor": processor,
+        "cpus": os.cpu_count(),
+        "system": platform.system(),
+        "python": platform.python_version(),
+    }
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-budgets", action="store_true", default=False,
+                     help="Record the measured benchmark medians in budgets.json.")
+
+
+def pytest_configure(config):
+    recorded = {"machine": None, "margin": MARGIN, "budgets": {}}
+    if os.path.exists(BUDGETS):
+        with open(BUDGETS) as f:
+            recorded = json.load(f)
+    config._cdcm_recorded = recorded
+    config._cdcm_measured = {}
+    slack = os.environ.get("CDCM_BENCH_SLACK")
+    if slack is not None:
+        config._cdcm_slack = float(slack)
+    elif recorded["machine"] == _get_machine():
+        config._cdcm_slack = 1.0
+    else:
+        # The budgets of another machine say nothing about this one
+        config._cdcm_slack = None
+
+
+def pytest_report_header(config):
+    machine = config._cdcm_recorded["machine"]
+    if config._cdcm_slack is None:
+        return (f"cdcm budgets: not checked, recorded on {machine}; "
+                + "set CDCM_BENCH_SLACK to check them")
+    return f"cdcm budgets: checked with slack {config._cdcm_slack}"
+
+
+@pytest.fixture(autouse=True)
+def check_budget(request):
+    yield
+    benchmark = request.node.funcargs.get("benchmark")
+    stats = getattr(benchmark, "stats", None)
+    if stats is None or not stats.stats.data:
+        return
+    config = request.config
+    name = f"{request.module.__name__}::{request.node.name}"
+    median = stats.stats.median
+    config._cdcm_measured[name] = median
+    budget = config._cdcm_recorded["budgets"].get(name)
+    if budget is None or config._cdcm_slack is None or config.getoption("--update-budgets"):
+        return
+    limit = budget * config._cdcm_slack
+    if median > limit:
+        pytest.fail(f"{name} took {median:1.3e} s (median), "
+                    + f"over its budget of {limit:1.3e} s.")
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if not config.getoption("--update-budgets") or not config._cdcm_measured:
+        return
+    recorded = config._cdcm_recorded
+    budgets = {}
+    if recorded["machine"] == _get_machine():
+        # Keep the budgets of the benchmarks that did not run
+        budgets.update(recorded["budgets"])
+    budgets.update({name: float(f"{MARGIN * median:1.3g}")
+                    for name, median in config._cdcm_measured.items()})
+    with open(BUDGETS, "w") as f:
+        json.dump({"machine": _get_machine(), "margin": MARGIN,
+                   "budgets": dict(sorted(budgets.items()))}, f, indent=4)
+        f.write("\n")
@@ -0,0 +1,506 @@
+"""Utilities to inspect the computational graph of a system
+
+Repeated graph queries go through a cached ``DagIndex`` with integer
+adjacency arrays instead of converting the system to ``networkx``:
+
+    dag = get_dag_index(hab)
+    dag.ancestors(hab.power.soc)
+    dag.subgraph("/habitat/power").topological_order()
+
+A cached index is rebuilt when the number of nodes or edges of the system
+changed. Use ``replace()`` from this module (or ``invalidate_dag_index()``)
+for rewiring that keeps these counts.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["iter_nodes", "get_functions", "get_states", "get_initializers",
+           "get_function_dependencies",
+           "get_function_levels", "get_strongly_connected_components",
+           "get_upstream_functions", "get_downstream_functions", "DagIndex",
+           "get_dag_index", "invalidate_dag_index", "replace"]
+
+
+import weakref
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+import numpy as np
+
+import cdcm
+from cdcm import *
+
+
+def iter_nodes(system: System, prefix: str="") -> Iterator[Tuple[str, Node]]:
+    """Yield ``(path, node)`` for every node owned by ``system``.
+
+    Paths follow the convention of the ``SimulationSaver``, e.g.
+    ``/combined_system/sys1/x1``. Nested systems are visited depth first
+    and in the order in which they appear in ``system.nodes``.
+    """
+    path = prefix + "/" + system.name
+    yield path, system
+    for node in system.nodes:
+        if isinstance(node, System):
+            yield from iter_nodes(node, path)
+        else:
+            yield path + "/" + node.name, node
+
+
+def get_functions(system: System) -> List[Tuple[str, Function]]:
+    """Return ``(path, function)`` for all functions of the system.
+
+    Functions do not have to be listed in the ``nodes`` of a system, so
+    they are also collected from the parents of the variables they write.
+    """
+    functions = []
+    seen = set()
+    for path, node in iter_nodes(system):
+        if isinstance(node, Function):
+            candidates = [(path, node)]
+        elif isinstance(node, Variable):
+            owner = path.rsplit("/", 1)[0]
+            candidates = [(owner + "/" + p.name, p) for p in node.parents
+                          if isinstance(p, Function)]
+        else:
+            continue
+        for fpath, func in candidates:
+            if id(func) not in seen:
+                seen.add(id(func))
+                functions.append((fpath, func))
+    return functions
+
+
+def get_states(system: System) -> List[Tuple[str, State]]:
+    """Return ``(path, state)`` for all states of the system."""
+    return [(path, node) for path, node in iter_nodes(system)
+            if isinstance(node, State)]
+
+
+def get_initializers(functions: List[Function]) -> List[Function]:
+    """Return the functions that only set the initial value of states.
+
+    A state may be written by two functions, e.g., ``init_x`` drawing the
+    initial value and ``f`` moving ``x`` forward. The initializers are the
+    writers of a state with several writers that do not read any of the
+    states they write.
+    """
+    writers = {}
+    for func in functions:
+        for child in func.children:
+            if isinstance(child, State):
+                writers.setdefault(id(child), []).append(func)
+    initializers = {}
+    for funcs in writers.values():
+        if len(funcs) < 2:
+            continue
+        for func in funcs:
+            read = {id(p) for p in func.parents}
+            if not any(id(c) in read for c in func.children if isinstance(c, State)):
+                initializers[id(func)] = func
+    return list(initializers.values())
+
+
+def get_function_dependencies(functions: List[Function]) -> Dict[int, List[int]]:
+    """Map each function index to the indices of the functions it waits for.
+
+    A function depends on another function if it reads a variable that the
+    other function writes during the forward pass. States are read at
+    their current value, so writing a state does not create a dependency.
+    """
+    index = {id(f): i for i, f in enumerate(functions)}
+    deps = {}
+    for i, func in enumerate(functions):
+        deps[i] = sorted({
+            index[id(w)]
+            for p in func.parents if not isinstance(p, State)
+            for w in p.parents if id(w) in index
+        })
+    return deps
+
+
+def get_function_levels(functions: List[Function]) -> List[List[int]]:
+    """Group function indices into topological levels.
+
+    All functions on the same level only depend on functions of earlier
+    levels, so they can be evaluated in any order. Within a level the
+    indices are sorted, which keeps the schedule deterministic.
+    """
+    return _get_levels(get_function_dependencies(functions),
+                       [func.name for func in functions])
+
+
+def _get_levels(deps: Dict[int, List[int]], names: List[str]) -> List[List[int]]:
+    waiting = {i: len(d) for i, d in deps.items()}
+    dependents = {i: [] for i in deps}
+    for i, d in deps.items():
+        for j in d:
+            dependents[j].append(i)
+    ready = sorted(i for i, n in waiting.items() if n == 0)
+    levels = []
+    done = 0
+    while ready:
+        levels.append(ready)
+        done += len(ready)
+        following = []
+        for i in ready:
+            for j in dependents[i]:
+                waiting[j] -= 1
+                if waiting[j] == 0:
+                    following.append(j)
+        ready = sorted(following)
+    if done < len(deps):
+        names = sorted(names[i] for i, n in waiting.items() if n > 0)
+        raise ValueError(f"The forward pass has a cycle through: {names}. "
+                         + "Use an AlgebraicLoopExecutor to solve it.")
+    return levels
+
+
+def get_strongly_connected_components(functions: List[Function]) -> List[List[int]]:
+    """Group function indices into strongly connected components.
+
+    The components are returned in an order in which they can be
+    evaluated, i.e., a component only depends on components that come
+    before it. A component with more than one function, or a function
+    that reads its own output, is an algebraic loop.
+    """
+    return _get_components(get_function_dependencies(functions))
+
+
+def _get_components(deps: Dict[int, List[int]]) -> List[List[int]]:
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    for root in deps:
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, k = work.pop()
+            if k == 0:
+                index[v] = low[v] = len(index)
+                stack.append(v)
+                on_stack.add(v)
+            for k in range(k, len(deps[v])):
+                w = deps[v][k]
+                if w not in index:
+                    work.append((v, k + 1))
+                    work.append((w, 0))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(sorted(component))
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+    return components
+
+
+def _search(start: Iterable[int], edges: Dict[int, List[int]]) -> Set[int]:
+    seen = set(start)
+    stack = list(seen)
+    while stack:
+        for j in edges[stack.pop()]:
+            if j not in seen:
+                seen.add(j)
+                stack.append(j)
+    return seen
+
+
+def _across_time_edges(functions: List[Function]) -> Dict[int, List[int]]:
+    """Map each function index to the functions whose outputs it reads.
+
+    Unlike ``get_function_dependencies()`` this includes the writers of the
+    states a function reads, i.e., dependencies through earlier steps.
+    """
+    index = {id(f): i for i, f in enumerate(functions)}
+    return {i: sorted({index[id(w)] for p in func.parents
+                       for w in p.parents if id(w) in index})
+            for i, func in enumerate(functions)}
+
+
+def get_upstream_functions(functions: List[Function], targets: Iterable[Variable]) -> Set[int]:
+    """The indices of all functions that ``targets`` depend on, across time.
+
+    This is the set of functions that has to run every step to keep the
+    targets correct, including the functions that update the states they
+    read.
+    """
+    index = {id(f): i for i, f in enumerate(functions)}
+    writers = {index[id(w)] for t in targets for w in t.parents if id(w) in index}
+    return _search(writers, _across_time_edges(functions))
+
+
+def get_downstream_functions(functions: List[Function], sources: Iterable[Variable]) -> Set[int]:
+    """The indices of all functions that are affected by ``sources``, across time."""
+    upstream = _across_time_edges(functions)
+    downstream = {i: [] for i in upstream}
+    for i, deps in upstream.items():
+        for j in deps:
+            downstream[j].append(i)
+    index = {id(f): i for i, f in enumerate(functions)}
+    readers = {index[id(r)] for s in sources for r in s.children if id(r) in index}
+    return _search(readers, downstream)
+
+
+def _csr(n: int, src: np.ndarray, dst: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order]
+
+
+def _neighbors(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """All entries of the given rows of a CSR matrix, without a Python loop."""
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return indices[:0]
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return indices[offsets + np.arange(total)]
+
+
+class DagIndex:
+    """Integer adjacency arrays of the graph of a system.
+
+    Variables (including parameters and states) and functions are numbered
+    in the order of ``iter_nodes()`` followed by the functions found by
+    ``get_functions()``. The edges from parents to children are stored
+    twice in CSR form, once by source (``indptr``/``indices``) and once by
+    target (``rindptr``/``rindices``). Edges into states write the value
+    of the next step; ``forward`` marks the edges of the current step.
+    ``functions`` lists the functions in index order; the function methods
+    number them by their position in this list.
+
+    Arguments:
+        system -- The system to index.
+    """
+
+    def __init__(self, system: System) -> None:
+        self.name = system.name
+        paths = []
+        nodes = []
+        for path, node in iter_nodes(system):
+            if isinstance(node, (Variable, Function)):
+                paths.append(path)
+                nodes.append(node)
+        seen = {id(node) for node in nodes}
+        for path, func in get_functions(system):
+            if id(func) not in seen:
+                paths.append(path)
+                nodes.append(func)
+        self._build(paths, nodes)
+
+    def _build(self, paths: List[str], nodes: List[Node]) -> None:
+        self.paths = paths
+        self.nodes = nodes
+        self.index = {id(node): i for i, node in enumerate(nodes)}
+        self.by_path = {path: i for i, path in enumerate(paths)}
+        self.is_state = np.array([isinstance(node, State) for node in nodes], dtype=bool)
+        self.function_indices = np.flatnonzero(
+            np.array([isinstance(node, Function) for node in nodes], dtype=bool))
+        self.functions = [nodes[i] for i in self.function_indices]
+        self.function_paths = [paths[i] for i in self.function_indices]
+        edges = [(i, self.index[id(c)]) for i, node in enumerate(nodes)
+                 for c in node.children if id(c) in self.index]
+        # A function can read the same variable through several arguments
+        edges = np.unique(np.array(edges, dtype=np.int64).reshape(-1, 2), axis=0)
+        src, dst = edges[:, 0], edges[:, 1]
+        n = len(nodes)
+        self.indptr, self.indices = _csr(n, src, dst)
+        self.rindptr, self.rindices = _csr(n, dst, src)
+        forward = ~self.is_state[dst]
+        self._forward = _csr(n, src[forward], dst[forward])
+        self._rforward = _csr(n, dst[forward], src[forward])
+        self._order = None
+        self._deps = None
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def locate(self, nodes) -> np.ndarray:
+        """The indices of nodes given as objects, paths or indices."""
+        if isinstance(nodes, np.ndarray):
+            return nodes.astype(np.int64)
+        if isinstance(nodes, (str, Node)):
+            nodes = [nodes]
+        try:
+            return np.array([self.by_path[n] if isinstance(n, str) else self.index[id(n)]
+                             for n in nodes], dtype=np.int64)
+        except KeyError as e:
+            raise KeyError(f"{e.args[0]} is not in the graph of {self.name}.") from None
+
+    def _closure(self, start: np.ndarray, indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        seen = np.zeros(len(self.nodes), dtype=bool)
+        frontier = np.unique(_neighbors(indptr, indices, start))
+        while frontier.size:
+            frontier = frontier[~seen[frontier]]
+            seen[frontier] = True
+            frontier = np.unique(_neighbors(indptr, indices, frontier))
+        return np.flatnonzero(seen)
+
+    def ancestor_indices(self, nodes, *, across_time: bool=True) -> np.ndarray:
+        """The sorted indices of everything the nodes depend on.
+
+        With ``across_time`` the closure continues through the functions
+        that update the states, i.e., through earlier steps.
+        """
+        indptr, indices = ((self.rindptr, self.rindices) if across_time
+                           else self._rforward)
+        return self._closure(self.locate(nodes), indptr, indices)
+
+    def descendant_indices(self, nodes, *, across_time: bool=True) -> np.ndarray:
+        """The sorted indices of everything that depends on the nodes."""
+        indptr, indices = ((self.indptr, self.indices) if across_time
+                           else self._forward)
+        return self._closure(self.locate(nodes), indptr, indices)
+
+    def ancestors(self, nodes, *, across_time: bool=True) -> List[Node]:
+        return [self.nodes[i] for i in self.ancestor_indices(nodes, across_time=across_time)]
+
+    def descendants(self, nodes, *, across_time: bool=True) -> List[Node]:
+        return [self.nodes[i] for i in self.descendant_indices(nodes, across_time=across_time)]
+
+    def topological_indices(self) -> np.ndarray:
+        """Node indices in the order of the forward pass.
+
+        States come before the functions that read them and after nothing,
+        since their writes only take effect in the next step.
+        """
+        if self._order is None:
+            indptr, indices = self._forward
+            waiting = np.diff(self._rforward[0])
+            ready = np.flatnonzero(waiting == 0)
+            order = []
+            while ready.size:
+                order.append(ready)
+                following = _neighbors(indptr, indices, ready)
+                waiting -= np.bincount(following, minlength=len(self.nodes))
+                ready = np.unique(following[waiting[following] == 0])
+            order = np.concatenate(order) if order else np.zeros(0, dtype=np.int64)
+            if order.size < len(self.nodes):
+                cycle = sorted(self.paths[i] for i in np.flatnonzero(waiting > 0))
+                raise ValueError(f"The forward pass has a cycle through: {cycle}. "
+                                 + "Use an AlgebraicLoopExecutor to solve it.")
+            self._order = order
+        return self._order
+
+    def topological_order(self) -> List[Node]:
+        return [self.nodes[i] for i in self.topological_indices()]
+
+    def function_dependencies(self) -> Dict[int, List[int]]:
+        """Like ``get_function_dependencies()`` for ``self.functions``.
+
+        A function waits for the writers of the variables it reads, except
+        for states, whose incoming edges are not part of the forward pass.
+        """
+        if self._deps is None:
+            indptr, indices = self._rforward
+            functions = self.function_indices
+            position = np.full(len(self.nodes), -1, dtype=np.int64)
+            position[functions] = np.arange(functions.size)
+            inputs = _neighbors(indptr, indices, functions)
+            reader = np.repeat(np.arange(functions.size),
+                               indptr[functions + 1] - indptr[functions])
+            writers = position[_neighbors(indptr, indices, inputs)]
+            reader = np.repeat(reader, indptr[inputs + 1] - indptr[inputs])
+            keep = writers >= 0
+            pairs = np.unique(np.stack([reader[keep], writers[keep]], axis=1), axis=0)
+            deps = {i: [] for i in range(functions.size)}
+            for i, j in pairs.tolist():
+                deps[i].append(j)
+            self._deps = deps
+        return self._deps
+
+    def function_levels(self) -> List[List[int]]:
+        """Like ``get_function_levels()`` for ``self.functions``."""
+        return _get_levels(self.function_dependencies(), self.function_paths)
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Like ``get_strongly_connected_components()`` for ``self.functions``."""
+        return _get_components(self.function_dependencies())
+
+    def subgraph(self, path: str) -> "DagIndex":
+        """The index of the nodes whose paths start with ``path``.
+
+        Only edges between these nodes are kept.
+        """
+        prefix = path.rstrip("/") + "/"
+        keep = [i for i, p in enumerate(self.paths) if p.startswith(prefix)]
+        if not keep:
+            raise KeyError(f"No nodes under {path} in the graph of {self.name}.")
+        sub = DagIndex.__new__(DagIndex)
+        sub.name = path.rsplit("/", 1)[-1]
+        sub._build([self.paths[i] for i in keep], [self.nodes[i] for i in keep])
+        return sub
+
+    def to_networkx(self):
+        """A ``networkx.DiGraph`` over the node objects, with their paths."""
+        import networkx as nx
+        graph = nx.DiGraph()
+        for path, node in zip(self.paths, self.nodes):
+            graph.add_node(node, path=path)
+        src = np.repeat(np.arange(len(self.nodes)), np.diff(self.indptr))
+        graph.add_edges_from((self.nodes[i], self.nodes[j])
+                             for i, j in zip(src.tolist(), self.indices.tolist()))
+        return graph
+
+    def __str__(self) -> str:
+        return (f"DagIndex(name={self.name}, nodes={len(self.nodes)}, "
+                + f"edges={self.indices.size})")
+
+
+# Cached indices, which are stale when their generation is older than this
+_generation = 0
+_dag_indices = weakref.WeakKeyDictionary()
+
+
+def get_dag_index(system: System) -> DagIndex:
+    """The cached ``DagIndex`` of a system.
+
+    A lookup does not walk the system. The index is rebuilt after
+    ``replace()`` from this module and after ``invalidate_dag_index()``,
+    which must be called after adding nodes or links to a system whose
+    index was already built.
+    """
+    cached = _dag_indices.get(system)
+    if cached is None or cached[0] != _generation:
+        cached = (_generation, DagIndex(system))
+        _dag_indices[system] = cached
+    return cached[1]
+
+
+def invalidate_dag_index(system: System=None) -> None:
+    """Drop the cached index of ``system``, or of all systems.
+
+    Needed after adding nodes or links, or after rewiring nodes without
+    ``replace()`` from this module.
+    """
+    global _generation
+    if system is None:
+        _generation += 1
+    else:
+        _dag_indices.pop(system, None)
+
+
+def replace(old: Node, new: Node) -> None:
+    """``cdcm.replace()`` that also invalidates the cached indices."""
+    cdcm.replace(old, new)
+    invalidate_dag_index()
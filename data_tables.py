@@ -0,0 +1,180 @@
+"""Typed multi-column tables for data systems
+
+Environment datasets have many columns of different kinds (irradiance,
+temperature, dust, radiation counts, flags). ``make_data_system()`` takes
+them as a structured (record) array, a dictionary of columns or a
+``pandas.DataFrame`` and builds a ``TableSystem`` over one packed record
+array. Every column keeps its own dtype, e.g., ``float32`` irradiance,
+``int16`` radiation counts and ``bool`` flags, unless ``dtype`` is given.
+A step fetches the current row once and populates all column variables
+from it:
+
+    env = make_data_system(
+        records, name="env",
+        column_units={"Q": "W/m^2", "T": "K", "dust": "kg/m^2"})
+
+``to_column_block()`` still makes the homogeneous (rows x columns) block
+a ``DataSystem`` expects.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["to_column_block", "to_record_block", "TableSystem", "make_data_system"]
+
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from cdcm import *
+
+
+def _get_columns(records,
+                 columns: Sequence[str]=None) -> Tuple[List[str], List[np.ndarray]]:
+    """The selected column names and arrays of a table."""
+    if isinstance(records, np.ndarray) and records.dtype.names is not None:
+        names = list(records.dtype.names)
+        get = records.__getitem__
+    elif isinstance(records, dict):
+        names = list(records)
+        get = records.__getitem__
+    elif hasattr(records, "columns") and hasattr(records, "to_numpy"):
+        names = [str(c) for c in records.columns]
+        get = lambda c: records[c].to_numpy()
+    else:
+        raise TypeError("Expected a structured array, a dict or a DataFrame, "
+                        + f"got {type(records).__name__}.")
+    columns = names if columns is None else list(columns)
+    missing = [c for c in columns if c not in names]
+    if missing:
+        raise ValueError(f"Columns {missing} are not in the table.")
+    return columns, [np.asarray(get(c)) for c in columns]
+
+
+def to_column_block(records,
+                    columns: Sequence[str]=None,
+                    dtype=None) -> Tuple[List[str], np.ndarray]:
+    """Turn a table into column names and a (rows x columns) C-ordered block.
+
+    Arguments:
+        records -- A structured array, a dictionary of 1D arrays or a
+                   ``pandas.DataFrame``.
+        columns -- The columns to keep, by default all of them.
+        dtype   -- The dtype of the block. By default the narrowest dtype
+                   that can hold every selected column.
+    """
+    columns, arrays = _get_columns(records, columns)
+    if dtype is None:
+        dtype = np.result_type(*[a.dtype for a in arrays])
+    block = np.empty((len(arrays[0]), len(arrays)), dtype=dtype)
+    for j, a in enumerate(arrays):
+        block[:, j] = a
+    return columns, block
+
+
+def to_record_block(records,
+                    columns: Sequence[str]=None,
+                    dtype=None) -> np.ndarray:
+    """Turn a table into a packed record array with one field per column.
+
+    The fields keep the dtypes of the columns, unless ``dtype`` is given.
+    The fields of a row are contiguous, so ``block[i]`` is a view of row
+    ``i``.
+
+    Arguments:
+        records -- A structured array, a dictionary of 1D arrays or a
+                   ``pandas.DataFrame``.
+        columns -- The columns to keep, by default all of them.
+        dtype   -- The dtype of every field. By default the dtype of each
+                   column.
+    """
+    columns, arrays = _get_columns(records, columns)
+    block = np.empty(len(arrays[0]),
+                     dtype=[(c, a.dtype if dtype is None else dtype)
+                            for c, a in zip(columns, arrays)])
+    for c, a in zip(columns, arrays):
+        block[c] = a
+    return block
+
+
+class TableSystem(System):
+    """A data system over a record array that fetches one row per step.
+
+    Like a ``DataSystem`` it has one variable per column. A single function
+    reads the current row of ``data`` and populates all of them, and the
+    ``row`` state moves to the next row on every transition.
+
+    Arguments:
+        data                -- A record array with one field per column, see
+                               ``to_record_block()``.
+        name                -- The name of the system.
+        column_units        -- The units of the columns by name.
+        column_descriptions -- The descriptions of the columns by name.
+    """
+
+    def __init__(self,
+                 data: np.ndarray,
+                 name: str,
+                 *,
+                 column_units: Dict[str, str]=None,
+                 column_descriptions: Dict[str, str]=None,
+                 **kwargs) -> None:
+        if data.dtype.names is None:
+            raise TypeError("The data of a TableSystem must be a record array.")
+        if "row" in data.dtype.names:
+            raise ValueError("A TableSystem cannot have a column named row.")
+        self.data = data
+        self.columns = list(data.dtype.names)
+        self.column_units = column_units or {}
+        self.column_descriptions = column_descriptions or {}
+        super().__init__(name=name, **kwargs)
+
+    def define_internal_nodes(self) -> None:
+        data = self.data
+        row = State(name="row", value=0, units="",
+                    description="The index of the current row.")
+        variables = [Variable(name=c,
+                              value=data[c][0].item(),
+                              units=self.column_units.get(c, ""),
+                              description=self.column_descriptions.get(c, ""))
+                     for c in self.columns]
+        single = len(variables) == 1
+
+        @make_function(row)
+        def next_row(row=row):
+            return row + 1
+
+        @make_function(*variables)
+        def fetch_row(row=row):
+            values = data[row].item()
+            return values[0] if single else values
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+def make_data_system(records,
+                     name: str,
+                     *,
+                     columns: Sequence[str]=None,
+                     column_units: Dict[str, str]=None,
+                     column_descriptions: Dict[str, str]=None,
+                     dtype=None,
+                     **kwargs) -> TableSystem:
+    """Make a ``TableSystem`` with one column variable per column of a table.
+
+    ``column_units`` and ``column_descriptions`` map column names to units
+    and descriptions; missing entries are left empty. With ``dtype`` all
+    columns are stored in that dtype.
+    """
+    return TableSystem(to_record_block(records, columns, dtype),
+                       name=name,
+                       column_units=column_units,
+                       column_descriptions=column_descriptions,
+                       **kwargs)
@@ -1,23 +1,166 @@
 """Model of the exterior environment
 
+``ExteriorEnvironment`` derives all exterior channels from one ephemeris
+query and stores them in a single ``DataSystem``. The surface temperature
+follows the irradiance with the thermal inertia of the regolith, so the
+regolith takes up heat during the day and gives it back at night:
+
+    env = ExteriorEnvironment("env", clock, start_time, 24 * 365,
+                              lat=-89.5, long=0.0)
+    env.exterior_temperature, env.regolith_heat_flux
+
+Ephemeris queries are cached, so several data systems at the same
+location and time span share one query.
+
 Author:
     Rashi Jain
 
 Date:
     09.21.2023
+    10.19.2026
 
 """
 
 
-__all__ = ["SolarIrradiance"]
+__all__ = ["SolarIrradiance", "ExteriorEnvironment", "get_irradiance",
+           "get_surface_temperature", "get_environment_channels"]
 
 
 import numpy as np
+from functools import lru_cache
 from numbers import Number
 from datetime import datetime, timedelta
+from typing import Dict
 
 from cdcm import *
 from cdcm_utils.solar_irradiation import get_insolation_ephemeris
+from data_tables import to_column_block
+from time_units import get_timestep
+
+
+# Stefan-Boltzmann constant (W/m^2/K^4)
+SIGMA = 5.670374419e-8
+
+# Mean solar irradiance at the distance of the Earth and the Moon (W/m^2)
+SOLAR_CONSTANT = 1361.0
+
+
+@lru_cache(maxsize=32)
+def _query_irradiance(start_time: str, end_time: str, step_size: str,
+                      lat: Number, long: Number) -> np.ndarray:
+    data = get_insolation_ephemeris(
+        start_time=start_time,
+        end_time=end_time,
+        step_size=step_size,
+        phi=lat,
+        lamda=long,
+        alpha=0.0,
+        beta=0.0
+    )
+    Q = np.array(data["Q"], dtype=float)
+    Q.setflags(write=False)
+    return Q
+
+
+def get_irradiance(clock: System,
+                   start_time: datetime,
+                   timesteps: Number,
+                   *,
+                   lat: Number=0.0,
+                   long: Number=0.0) -> np.ndarray:
+    """The solar irradiance (W/m^2) on a horizontal surface for every step.
+
+    The result is read-only and shared between calls with the same
+    arguments.
+    """
+    dt = get_timestep(clock)
+    end_time = start_time + (timesteps - 1) * dt
+    return _query_irradiance(start_time.isoformat(), end_time.isoformat(),
+                             str(int(clock.dt.value)) + clock.dt.units,
+                             float(lat), float(long))
+
+
+def get_surface_temperature(absorbed: np.ndarray,
+                            dt: timedelta,
+                            *,
+                            emissivity: Number=0.95,
+                            heat_capacity: Number=8.5e4,
+                            conductance: Number=0.1,
+                            deep_temperature: Number=250.0,
+                            initial_temperature: Number=None) -> np.ndarray:
+    """The temperature (K) of the surface layer of the regolith for every step.
+
+    The layer absorbs ``absorbed`` (W/m^2), radiates to space and exchanges
+    heat with the deep regolith at ``deep_temperature``:
+
+        C dT/dt = absorbed - emissivity * SIGMA * T^4 - G * (T - T_deep)
+
+    The steps are linearized backward Euler steps, which are stable for
+    any ``dt``.
+
+    Arguments:
+        absorbed            -- The absorbed solar flux for every step (W/m^2).
+        dt                  -- The duration of a step.
+        emissivity          -- The infrared emissivity of the regolith.
+        heat_capacity       -- The heat capacity C of the layer that follows
+                               the day (J/m^2/K), about the density times the
+                               specific heat times the diurnal skin depth.
+        conductance         -- The conductance G to the deep regolith
+                               (W/m^2/K).
+        deep_temperature    -- The temperature below the diurnal skin depth (K).
+        initial_temperature -- The temperature of the first step (K). By
+                               default the deep temperature.
+    """
+    h = dt.total_seconds()
+    T = np.empty(len(absorbed))
+    T_n = deep_temperature if initial_temperature is None else initial_temperature
+    for n, q in enumerate(np.asarray(absorbed, dtype=float).tolist()):
+        T[n] = T_n
+        radiated = emissivity * SIGMA * T_n ** 4
+        flux = q - radiated - conductance * (T_n - deep_temperature)
+        T_n += h * flux / (heat_capacity + h * (4.0 * radiated / T_n + conductance))
+    return T
+
+
+def get_environment_channels(Q: np.ndarray,
+                             dt: timedelta,
+                             *,
+                             albedo: Number=0.12,
+                             emissivity: Number=0.95,
+                             solar_constant: Number=SOLAR_CONSTANT,
+                             **kwargs) -> Dict[str, np.ndarray]:
+    """Derive the exterior channels from the irradiance, for all steps at once.
+
+    The surface temperature comes from ``get_surface_temperature()``, which
+    takes the remaining keyword arguments. The regolith heat flux is what
+    the surface absorbs minus what it radiates (positive into the ground).
+    The Sun view factor is that of a horizontal surface, i.e., the cosine
+    of the solar zenith angle.
+
+    Arguments:
+        Q              -- The solar irradiance on a horizontal surface (W/m^2).
+        dt             -- The duration of a step.
+        albedo         -- The albedo of the regolith.
+        emissivity     -- The infrared emissivity of the regolith.
+        solar_constant -- The irradiance at normal incidence (W/m^2).
+    """
+    Q = np.asarray(Q, dtype=float)
+    absorbed = (1.0 - albedo) * np.clip(Q, 0.0, None)
+    T = get_surface_temperature(absorbed, dt, emissivity=emissivity, **kwargs)
+    return {
+        "solar_irradiance": Q,
+        "exterior_temperature": T,
+        "regolith_heat_flux": absorbed - emissivity * SIGMA * T ** 4,
+        "sun_view_factor": np.clip(Q / solar_constant, 0.0, 1.0),
+    }
+
+
+_CHANNELS = {
+    "solar_irradiance": ("W/m^2", "solar irradiance at selected location"),
+    "exterior_temperature": ("K", "temperature of the regolith surface"),
+    "regolith_heat_flux": ("W/m^2", "net heat flux into the regolith"),
+    "sun_view_factor": ("", "view factor of a horizontal surface to the Sun"),
+}
 
 
 class SolarIrradiance(DataSystem):
@@ -38,24 +181,79 @@ class SolarIrradiance(DataSystem):
         self.lat = lat
         self.long = long
         self.start_time = start_time
-        self.dt = timedelta(**{clock.dt.units: clock.dt.value})
+        self.dt = get_timestep(clock)
         self.timesteps = timesteps
         self.end_time = self.start_time + (self.timesteps - 1) * self.dt
 
-        irradiation_data = get_insolation_ephemeris(
-            start_time=self.start_time.isoformat(),
-            end_time=self.end_time.isoformat(),
-            step_size=str(int(clock.dt.value)) + clock.dt.units,
-            phi=self.lat,
-            lamda=self.long,
-            alpha=0.0,
-            beta=0.0
-        )
-        super().__init__(data=np.array(irradiation_data["Q"]),
+        Q = get_irradiance(clock, start_time, timesteps, lat=lat, long=long)
+        super().__init__(data=np.array(Q),
                     name=name,
                     description="solar irradiance data for all timesteps",
                     columns="solar_irradiance",
                     column_units="W/m^2",
-                    column_description="solar irradiance at selected location",
+                    column_descriptions="solar irradiance at selected location",
+                    **kwargs)
+        self.forward()
+
+
+class ExteriorEnvironment(DataSystem):
+    """Exterior environment with all channels derived from one ephemeris query.
+
+    The columns are ``solar_irradiance``, ``exterior_temperature``,
+    ``regolith_heat_flux`` and ``sun_view_factor``. See
+    ``get_environment_channels()`` and ``get_surface_temperature()`` for
+    the model and the keyword arguments ``albedo``, ``emissivity``,
+    ``heat_capacity``, ``conductance`` and ``deep_temperature``.
+
+    The view factors of walls tilted by ``wall_tilt`` degrees from the
+    horizontal to the sky and to the ground do not change over time, so
+    they are the parameters ``sky_view_factor`` and ``ground_view_factor``.
+    """
+
+    def __init__(self,
+                 name: str,
+                 clock: System,
+                 start_time: datetime,
+                 timesteps: Number,
+                 *,
+                 planet: str="moon",
+                 lat: Number=0.0,
+                 long: Number=0.0,
+                 albedo: Number=0.12,
+                 emissivity: Number=0.95,
+                 heat_capacity: Number=8.5e4,
+                 conductance: Number=0.1,
+                 deep_temperature: Number=250.0,
+                 wall_tilt: Number=90.0,
+                 **kwargs) -> None:
+        self.planet = planet
+        self.lat = lat
+        self.long = long
+        self.start_time = start_time
+        self.dt = get_timestep(clock)
+        self.timesteps = timesteps
+        self.end_time = self.start_time + (self.timesteps - 1) * self.dt
+
+        Q = get_irradiance(clock, start_time, timesteps, lat=lat, long=long)
+        channels = get_environment_channels(Q, self.dt,
+                                            albedo=albedo,
+                                            emissivity=emissivity,
+                                            heat_capacity=heat_capacity,
+                                            conductance=conductance,
+                                            deep_temperature=deep_temperature)
+        columns, data = to_column_block(channels, list(_CHANNELS), dtype=float)
+        super().__init__(data=data,
+                    name=name,
+                    description="exterior environment data for all timesteps",
+                    columns=columns,
+                    column_units=[_CHANNELS[c][0] for c in columns],
+                    column_descriptions=[_CHANNELS[c][1] for c in columns],
                     **kwargs)
+        cos_tilt = np.cos(np.radians(wall_tilt))
+        self.nodes += [
+            Parameter(name="sky_view_factor", value=0.5 * (1.0 + cos_tilt), units="",
+                      description="view factor of the habitat walls to the sky"),
+            Parameter(name="ground_view_factor", value=0.5 * (1.0 - cos_tilt), units="",
+                      description="view factor of the habitat walls to the ground"),
+        ]
         self.forward()
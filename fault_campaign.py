@@ -0,0 +1,204 @@
+"""Fault-injection campaigns
+
+A campaign runs the same model under many fault scenarios. Each worker
+builds the model once, runs the warm-up once and then restores that
+snapshot before every scenario, so no scenario pays for construction or
+warm-up again:
+
+    def build():
+        with System(name="hab") as hab:
+            clock = make_clock(dt=1, units="hr")
+            power_system = make_power_system("power")
+        return hab
+
+    faults = [Fault("battery_short", short_battery, step=10), ...]
+    campaign = FaultCampaign(build, n_steps=24 * 30, warmup_steps=24,
+                             terminal=lambda hab: hab.power.soc.value < 0.05)
+    for summary in campaign.run(enumerate_scenarios(faults, order=2),
+                                processes=8):
+        print(summary)
+
+Everything passed to a campaign that runs on several processes has to be
+picklable, i.e., use module-level functions or ``functools.partial``.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["Fault", "enumerate_scenarios", "sample_scenarios", "FaultCampaign"]
+
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from cdcm import *
+from dag_utils import iter_nodes
+from system_state import get_snapshot, set_snapshot
+
+
+class Fault:
+    """A fault injected into a system at a given step after the warm-up.
+
+    Arguments:
+        name   -- The name of the fault.
+        inject -- A function that takes the system and changes it, like the
+                  events of the ``Simulator``.
+        step   -- The step at which the fault is injected.
+    """
+
+    def __init__(self, name: str, inject: Callable[[System], None], step: int=0) -> None:
+        self.name = name
+        self.inject = inject
+        self.step = step
+
+    def __repr__(self) -> str:
+        return f"Fault({self.name}, step={self.step})"
+
+
+def enumerate_scenarios(faults: Sequence[Fault], order: int=1) -> List[Tuple[Fault, ...]]:
+    """All combinations of up to ``order`` faults."""
+    return [scenario for k in range(1, order + 1)
+            for scenario in itertools.combinations(faults, k)]
+
+
+def sample_scenarios(faults: Sequence[Fault],
+                     n: int,
+                     order: int=1,
+                     seed: int=None) -> List[Tuple[Fault, ...]]:
+    """Sample ``n`` scenarios of exactly ``order`` distinct faults."""
+    rng = np.random.default_rng(seed)
+    return [tuple(faults[i] for i in sorted(rng.choice(len(faults), order, replace=False)))
+            for _ in range(n)]
+
+
+def _final_values(system: System, outputs: Sequence[str]) -> Dict[str, Any]:
+    """The default summary: the values of some variables at the end of a run."""
+    values = {path: node.value for path, node in iter_nodes(system)
+              if isinstance(node, Variable)}
+    return {path: values[path] for path in outputs}
+
+
+class FaultCampaign:
+    """Runs fault scenarios from a shared warm-started state.
+
+    Arguments:
+        build_system -- A function without arguments that returns the system.
+        n_steps      -- The maximum number of steps per scenario.
+        warmup_steps -- The number of fault-free steps to run once before the
+                        scenarios. All scenarios start from the resulting state.
+        terminal     -- A function of the system; the scenario stops as soon as
+                        it returns ``True``.
+        summarize    -- A function of the system returning a compact summary of
+                        the run. By default the final values of ``outputs``.
+        outputs      -- The paths reported by the default summary.
+        seed         -- Scenario ``i`` seeds ``np.random`` with ``seed + i``, so
+                        results do not depend on the number of processes.
+    """
+
+    def __init__(self,
+                 build_system: Callable[[], System],
+                 n_steps: int,
+                 *,
+                 warmup_steps: int=0,
+                 terminal: Callable[[System], bool]=None,
+                 summarize: Callable[[System], Dict[str, Any]]=None,
+                 outputs: Sequence[str]=(),
+                 seed: int=0) -> None:
+        self.build_system = build_system
+        self.n_steps = n_steps
+        self.warmup_steps = warmup_steps
+        self.terminal = terminal
+        self.summarize = summarize
+        self.outputs = list(outputs)
+        self.seed = seed
+        self.system = None
+        self.snapshot = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers build their own system
+        state = self.__dict__.copy()
+        state["system"] = None
+        state["snapshot"] = None
+        return state
+
+    def _warm_up(self) -> None:
+        self.system = self.build_system()
+        np.random.seed(self.seed)
+        for _ in range(self.warmup_steps):
+            self.system.forward()
+            self.system.transition()
+        self.snapshot = get_snapshot(self.system)
+
+    def run_scenario(self, index: int, scenario: Sequence[Fault]) -> Dict[str, Any]:
+        """Run one scenario and return its summary."""
+        if self.system is None:
+            self._warm_up()
+        system = self.system
+        set_snapshot(system, self.snapshot)
+        np.random.seed(self.seed + index)
+        by_step = {}
+        for fault in scenario:
+            by_step.setdefault(fault.step, []).append(fault)
+        terminated = False
+        step = 0
+        while step < self.n_steps:
+            for fault in by_step.get(step, ()):
+                fault.inject(system)
+            system.forward()
+            system.transition()
+            step += 1
+            if self.terminal is not None and self.terminal(system):
+                terminated = True
+                break
+        summary = {
+            "index": index,
+            "faults": [fault.name for fault in scenario],
+            "steps": step,
+            "terminated": terminated,
+        }
+        if self.summarize is not None:
+            summary.update(self.summarize(system))
+        else:
+            summary.update(_final_values(system, self.outputs))
+        return summary
+
+    def run(self,
+            scenarios: Sequence[Sequence[Fault]],
+            *,
+            processes: int=None,
+            chunksize: int=16) -> Iterator[Dict[str, Any]]:
+        """Run all scenarios and yield their summaries one at a time.
+
+        With ``processes`` the scenarios are spread over a process pool and
+        the summaries come back in the order of the scenarios.
+        """
+        if not processes or processes < 2:
+            for i, scenario in enumerate(scenarios):
+                yield self.run_scenario(i, scenario)
+            return
+        with ProcessPoolExecutor(max_workers=processes,
+                                 initializer=_init_worker,
+                                 initargs=(self,)) as pool:
+            yield from pool.map(_run_in_worker, range(len(scenarios)), scenarios,
+                                chunksize=chunksize)
+
+
+_worker_campaign = None
+
+
+def _init_worker(campaign: FaultCampaign) -> None:
+    global _worker_campaign
+    _worker_campaign = campaign
+    _worker_campaign._warm_up()
+
+
+def _run_in_worker(index: int, scenario: Sequence[Fault]) -> Dict[str, Any]:
+    return _worker_campaign.run_scenario(index, scenario)
@@ -0,0 +1,208 @@
+"""Cached fault-propagation index for online diagnosis
+
+A fault in a parameter or a state can only show up in the sensors that it
+reaches through the graph, either within a step or through the transition
+of states. This module precomputes that reachability once per system, so
+that diagnosis can run every simulated hour without touching the graph
+again:
+
+    index = FaultPropagationIndex(hab, sensors=[y1, y2])
+    index.update({"/hab/sys1/y1": True})   # y1 is anomalous
+    index.update({"/hab/sys2/y2": False})  # only y2 changed
+    index.candidates()                     # explain every anomaly
+
+Archived trajectories are diagnosed in one sweep with ``diagnose_batch()``,
+which shares the structural analysis across all steps.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["FaultPropagationIndex"]
+
+
+from concurrent.futures import ProcessPoolExecutor
+from numbers import Number
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+from cdcm import *
+from dag_utils import get_dag_index
+
+
+class FaultPropagationIndex:
+    """Ancestor/descendant index over the variables of a system.
+
+    Arguments:
+        system     -- The system to index.
+        sensors    -- The observed variables (or their paths).
+        candidates -- The variables that may be faulty. By default all
+                      parameters and states of the system.
+    """
+
+    def __init__(self,
+                 system: System,
+                 sensors: Sequence[Union[Variable, str]],
+                 candidates: Sequence[Union[Variable, str]]=None) -> None:
+        self.system = system
+        self.dag = dag = get_dag_index(system)
+        variables = [i for i, node in enumerate(dag.nodes) if isinstance(node, Variable)]
+        self.paths = [dag.paths[i] for i in variables]
+        self._index = {id(dag.nodes[i]): k for k, i in enumerate(variables)}
+        self._index.update({path: k for k, path in enumerate(self.paths)})
+        # Graph index of each variable and variable number of each graph
+        # node, -1 for the functions
+        self._nodes = np.array(variables, dtype=np.int64)
+        self._variable = np.full(len(dag), -1, dtype=np.int64)
+        self._variable[variables] = np.arange(len(variables))
+        self.sensors = [self.paths[self._lookup(s)] for s in sensors]
+        if candidates is None:
+            candidates = [self.paths[k] for k, i in enumerate(variables)
+                          if isinstance(dag.nodes[i], (Parameter, State))]
+        candidate_ids = {self._lookup(c) for c in candidates}
+        self.candidate_paths = sorted(self.paths[i] for i in candidate_ids)
+        self.sensor_candidates = {
+            sensor: frozenset(self.paths[i] for i in self._reach(self._lookup(sensor), upstream=True)
+                              if i in candidate_ids)
+            for sensor in self.sensors
+        }
+        self._descendants = {}
+        self.anomalous = set()
+        self._support = {}
+
+    def _lookup(self, node: Union[Variable, str]) -> int:
+        key = node if isinstance(node, str) else id(node)
+        if key not in self._index:
+            raise ValueError(f"{node} is not a variable of {self.system.name}.")
+        return self._index[key]
+
+    def _reach(self, start: int, *, upstream: bool) -> set:
+        """The variables reachable from variable ``start``, including ``start``."""
+        closure = self.dag.ancestor_indices if upstream else self.dag.descendant_indices
+        reached = self._variable[closure(self._nodes[[start]])]
+        return set(reached[reached >= 0].tolist()) | {start}
+
+    def ancestors(self, node: Union[Variable, str]) -> List[str]:
+        """The paths of all variables that can influence ``node``."""
+        i = self._lookup(node)
+        return sorted(self.paths[j] for j in self._reach(i, upstream=True) if j != i)
+
+    def descendants(self, node: Union[Variable, str]) -> List[str]:
+        """The paths of all variables that ``node`` can influence."""
+        i = self._lookup(node)
+        if i not in self._descendants:
+            self._descendants[i] = frozenset(self._reach(i, upstream=False) - {i})
+        return sorted(self.paths[j] for j in self._descendants[i])
+
+    def update(self, observations: Dict[Union[Variable, str], bool]) -> None:
+        """Update the anomaly flags of some sensors, given as nodes or paths.
+
+        Only the sensors whose flag changed are processed, so the cost
+        depends on the new observations and not on the size of the system.
+        """
+        flags = {}
+        for sensor, is_anomalous in observations.items():
+            path = self.paths[self._lookup(sensor)]
+            if path not in self.sensor_candidates:
+                raise ValueError(f"{path} is not one of the sensors {self.sensors}.")
+            flags[path] = bool(is_anomalous)
+        for sensor, is_anomalous in flags.items():
+            if is_anomalous == (sensor in self.anomalous):
+                continue
+            change = 1 if is_anomalous else -1
+            if is_anomalous:
+                self.anomalous.add(sensor)
+            else:
+                self.anomalous.discard(sensor)
+            for candidate in self.sensor_candidates[sensor]:
+                count = self._support.get(candidate, 0) + change
+                if count:
+                    self._support[candidate] = count
+                else:
+                    del self._support[candidate]
+
+    def candidates(self) -> List[str]:
+        """The single-fault candidates that explain all anomalous sensors."""
+        n = len(self.anomalous)
+        if n == 0:
+            return []
+        return sorted(c for c, count in self._support.items() if count == n)
+
+    def ranking(self) -> List[str]:
+        """All suspected candidates, ordered by the number of anomalies they explain."""
+        return sorted(self._support, key=lambda c: (-self._support[c], c))
+
+    def incidence_matrix(self) -> np.ndarray:
+        """Boolean (sensors x candidates) matrix of which faults reach which sensor."""
+        column = {c: j for j, c in enumerate(self.candidate_paths)}
+        incidence = np.zeros((len(self.sensors), len(self.candidate_paths)), dtype=bool)
+        for i, sensor in enumerate(self.sensors):
+            incidence[i, [column[c] for c in self.sensor_candidates[sensor]]] = True
+        return incidence
+
+    def diagnose_batch(self,
+                       observations: Union[np.ndarray, str],
+                       *,
+                       lower: Union[Number, np.ndarray]=None,
+                       upper: Union[Number, np.ndarray]=None,
+                       processes: int=None,
+                       chunk_size: int=100000) -> np.ndarray:
+        """Diagnose many snapshots at once.
+
+        Arguments:
+            observations -- A (timesteps x sensors) array, columns ordered like
+                            ``self.sensors``, or the name of an HDF5 file written
+                            by the ``SimulationSaver``. Boolean arrays are taken
+                            as anomaly flags. Otherwise a value is anomalous if
+                            it is outside ``[lower, upper]``.
+            processes    -- Split long archives in chunks of ``chunk_size``
+                            steps over this many processes.
+
+        Returns a boolean (timesteps x candidates) array, columns ordered like
+        ``self.candidate_paths``, that marks the single-fault candidates that
+        explain all anomalies of each step.
+        """
+        if isinstance(observations, str):
+            import h5py
+
+            with h5py.File(observations, "r") as f:
+                observations = np.column_stack([f[s][:] for s in self.sensors])
+        observations = np.asarray(observations)
+        if observations.dtype == bool:
+            anomalies = observations
+        else:
+            anomalies = np.zeros(observations.shape, dtype=bool)
+            if lower is not None:
+                anomalies |= observations < lower
+            if upper is not None:
+                anomalies |= observations > upper
+        incidence = self.incidence_matrix()
+        chunks = [anomalies[i:i + chunk_size]
+                  for i in range(0, anomalies.shape[0], chunk_size)]
+        if processes and processes > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = list(pool.map(_diagnose_chunk, chunks,
+                                        [incidence] * len(chunks)))
+        else:
+            results = [_diagnose_chunk(chunk, incidence) for chunk in chunks]
+        if not results:
+            return np.zeros((0, incidence.shape[1]), dtype=bool)
+        return np.concatenate(results)
+
+    def __str__(self) -> str:
+        return (f"FaultPropagationIndex(system={self.system.name}, "
+                + f"variables={len(self.paths)}, sensors={len(self.sensors)}, "
+                + f"anomalous={len(self.anomalous)})")
+
+
+def _diagnose_chunk(anomalies: np.ndarray, incidence: np.ndarray) -> np.ndarray:
+    """Candidates that reach every anomalous sensor, for each row."""
+    support = anomalies.astype(np.int32) @ incidence.astype(np.int32)
+    n_anomalous = anomalies.sum(axis=1)
+    return (support == n_anomalous[:, None]) & (n_anomalous[:, None] > 0)
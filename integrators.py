@@ -0,0 +1,212 @@
+"""Integrators for states defined through their time derivative
+
+Instead of writing the update of a state by hand, e.g., ``x - dt * omega * x``,
+declare its time derivative and let an integrator advance it:
+
+    @make_derivative(x, dt=clock.dt, method="rk45")
+    def dxdt(x=x, omega=omega):
+        return -omega * x
+
+The decorator builds an ordinary ``Function`` that writes the next value of
+the states, so the system, the simulator and the savers work as before.
+All states listed in the same decorator are advanced together as one
+vector. The clock time is advanced to the time of every stage, so
+time-dependent forcing, e.g., the day/night cycle, keeps the order of the
+method:
+
+    @make_derivative(T, dt=clock.dt, t=clock.t, method="rk4")
+    def dTdt(T=T, t=clock.t, Q=Q_peak, k=k):
+        return Q * max(0.0, np.cos(2.0 * np.pi * t / 708.7)) - k * T
+
+All other parents that are not integrated states are held constant during
+a step.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["make_derivative", "INTEGRATORS"]
+
+
+import inspect
+
+import numpy as np
+
+from cdcm import *
+
+
+# The integrators call ``rhs(s, x)`` with the time ``s`` since the start of
+# the step
+
+
+def _euler(rhs, x, h, **kwargs):
+    return x + h * rhs(0.0, x)
+
+
+def _rk4(rhs, x, h, **kwargs):
+    k1 = rhs(0.0, x)
+    k2 = rhs(0.5 * h, x + 0.5 * h * k1)
+    k3 = rhs(0.5 * h, x + 0.5 * h * k2)
+    k4 = rhs(h, x + h * k3)
+    return x + h / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+
+
+# Dormand-Prince 5(4) tableau
+_DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+_DP_B5 = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0])
+_DP_B4 = np.array([5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200,
+                   187 / 2100, 1 / 40])
+
+
+def _rk45(rhs, x, h, *, rtol=1e-6, atol=1e-9, max_substeps=10000, hint=None):
+    """Adaptive Dormand-Prince over one step of length ``h``.
+
+    ``hint`` is a one-element list holding the substep proposed after the
+    last accepted one, so that consecutive steps do not have to rediscover
+    it. A substep that is cut short to end on the step does not shrink it.
+    """
+    t = 0.0
+    sub = min(h, hint[0]) if hint and hint[0] else h
+    for _ in range(max_substeps):
+        if t >= h:
+            if hint is not None:
+                hint[0] = sub
+            return x
+        trial = min(sub, h - t)
+        k = []
+        for a, c in zip(_DP_A, _DP_C):
+            xi = x + trial * sum(aj * kj for aj, kj in zip(a, k)) if a else x
+            k.append(rhs(t + c * trial, xi))
+        x5 = x + trial * sum(b * kj for b, kj in zip(_DP_B5, k))
+        x4 = x + trial * sum(b * kj for b, kj in zip(_DP_B4, k))
+        scale = atol + rtol * np.maximum(np.abs(x), np.abs(x5))
+        err = np.sqrt(np.mean(((x5 - x4) / scale) ** 2)) if x.size else 0.0
+        proposed = trial * min(5.0, max(0.2, 0.9 * (1.0 / max(err, 1e-10)) ** 0.2))
+        if err <= 1.0:
+            t += trial
+            x = x5
+            # Keep the longer step if this one was only cut short by the end
+            sub = max(sub, proposed) if trial < sub else proposed
+        else:
+            sub = proposed
+    raise RuntimeError(f"rk45 needed more than {max_substeps} substeps.")
+
+
+def _implicit_euler(rhs, x, h, *, tol=1e-10, max_iter=20, **kwargs):
+    """Backward Euler solved with Newton's method, for stiff states."""
+    x_new = x + h * rhs(0.0, x)
+    for _ in range(max_iter):
+        f0 = rhs(h, x_new)
+        residual = x_new - x - h * f0
+        jacobian = np.eye(x.size)
+        for j in range(x.size):
+            eps = 1e-7 * (1.0 + abs(x_new[j]))
+            xj = x_new.copy()
+            xj[j] += eps
+            jacobian[:, j] -= h * (rhs(h, xj) - f0) / eps
+        dx = np.linalg.solve(jacobian, -residual)
+        x_new = x_new + dx
+        if np.max(np.abs(dx), initial=0.0) <= tol * (1.0 + np.max(np.abs(x_new), initial=0.0)):
+            return x_new
+    raise RuntimeError(f"implicit_euler did not converge in {max_iter} iterations.")
+
+
+INTEGRATORS = {
+    "euler": _euler,
+    "rk4": _rk4,
+    "rk45": _rk45,
+    "implicit_euler": _implicit_euler,
+}
+
+
+def make_derivative(*states: State,
+                    dt: Variable,
+                    t: State=None,
+                    method: str="rk4",
+                    **options):
+    """Make a function that integrates the time derivative of some states.
+
+    Arguments:
+        states  -- The states whose derivative the decorated function returns.
+        dt      -- The timestep variable, usually ``clock.dt``. The derivative
+                   is assumed to be per unit of ``dt``.
+        t       -- The time variable, usually ``clock.t``. The argument of the
+                   derivative that defaults to it gets the time of each stage.
+                   By default a state argument named ``t`` is taken to be the
+                   clock time.
+        method  -- One of ``"euler"``, ``"rk4"``, ``"rk45"`` or
+                   ``"implicit_euler"``.
+        options -- Passed to the integrator, e.g., ``rtol`` and ``atol`` for
+                   ``"rk45"``.
+    """
+    if method not in INTEGRATORS:
+        raise ValueError(f"Unknown method {method}. "
+                         + f"Choose one of {list(INTEGRATORS)}.")
+    integrator = INTEGRATORS[method]
+
+    def decorator(derivative):
+        signature = inspect.signature(derivative)
+        names = list(signature.parameters)
+        parents = [p.default for p in signature.parameters.values()]
+        state_names = []
+        for state in states:
+            matches = [n for n, p in zip(names, parents) if p is state]
+            if not matches:
+                raise ValueError(f"State {state.name} is not an argument of "
+                                 + f"{derivative.__name__}.")
+            state_names.append(matches[0])
+        if t is None:
+            time_names = [n for n, p in zip(names, parents)
+                          if isinstance(p, State) and p.name == "t"
+                          and all(p is not s for s in states)]
+        else:
+            time_names = [n for n, p in zip(names, parents) if p is t]
+        hint = [None]
+
+        def step(*values):
+            h = values[-1]
+            args = dict(zip(names, values[:-1]))
+            shapes = [np.shape(args[n]) for n in state_names]
+            sizes = [int(np.prod(s)) for s in shapes]
+
+            def unpack(x):
+                out = np.split(x, np.cumsum(sizes)[:-1])
+                return [o.reshape(s) if s else o[0] for o, s in zip(out, shapes)]
+
+            t0 = {n: args[n] for n in time_names}
+
+            def rhs(s, x):
+                args.update(zip(state_names, unpack(x)))
+                for n, value in t0.items():
+                    args[n] = value + s
+                dxdt = derivative(**args)
+                if len(state_names) == 1:
+                    dxdt = (dxdt,)
+                return np.concatenate([np.ravel(d) for d in dxdt]).astype(float)
+
+            x0 = np.concatenate([np.ravel(args[n]) for n in state_names]).astype(float)
+            x1 = unpack(integrator(rhs, x0, h, hint=hint, **options))
+            return x1[0] if len(x1) == 1 else tuple(x1)
+
+        return Function(
+            name=derivative.__name__,
+            func=step,
+            parents=parents + [dt],
+            children=list(states)
+        )
+
+    return decorator
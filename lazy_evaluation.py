@@ -0,0 +1,122 @@
+"""Pull-based evaluation of variables that no state depends on
+
+Emissions like ``y1 = x1 + s1 * np.random.randn()`` are usually only
+looked at now and then, but ``system.forward()`` computes them every
+step. The ``LazyExecutor`` only runs eagerly the functions that the states
+(and the observed variables) depend on. Everything else is computed on
+the first ``pull()`` after a ``forward()`` and cached for the rest of the
+step:
+
+    executor = LazyExecutor(sys, observed=[sys.sys1.x1])
+    for i in range(n_steps):
+        executor.forward()
+        if i % 100 == 0:
+            print(executor.pull(sys.sys1.y1))
+        executor.transition()
+
+Until they are pulled, lazy variables hold the values of an earlier step.
+Give recorders and savers the executor, so that they pull the variables
+they read before every row:
+
+    recorder = TrajectoryRecorder(sys, executor=executor)
+
+Skipped functions do not draw from ``np.random``, so a lazy run does not
+reproduce the random numbers of a full run. Give such variables their
+own generator (see ``random_streams``) if that matters.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["LazyExecutor"]
+
+
+from typing import Any, Dict, List, Sequence, Union
+
+import numpy as np
+
+from cdcm import *
+from dag_utils import get_dag_index
+
+
+class LazyExecutor:
+    """Runs the forward pass eagerly only where the next step needs it.
+
+    Arguments:
+        system   -- The system to simulate.
+        observed -- Variables (or paths) that are computed every step anyway,
+                    e.g., the ones saved by a ``SimulationSaver``.
+    """
+
+    def __init__(self,
+                 system: System,
+                 observed: Sequence[Union[Variable, str]]=()) -> None:
+        self.system = system
+        self.dag = dag = get_dag_index(system)
+        states = np.flatnonzero(dag.is_state)
+        eager = set(dag.ancestor_indices(states).tolist())
+        if len(observed):
+            eager.update(dag.ancestor_indices(dag.locate(observed)).tolist())
+        order = [i for i in dag.topological_indices().tolist()
+                 if isinstance(dag.nodes[i], Function)]
+        self.eager = [dag.nodes[i] for i in order if i in eager]
+        self.lazy = [dag.nodes[i] for i in order if i not in eager]
+        self._lazy = {i for i in order if i not in eager}
+        self._position = {i: k for k, i in enumerate(order)}
+        self.states = [dag.nodes[i] for i in states]
+        self._plans: Dict[int, List[Function]] = {}
+        self._done = set()
+
+    def forward(self) -> None:
+        """Run the functions that the states and observed variables need."""
+        self._done.clear()
+        for func in self.eager:
+            func.forward()
+
+    def transition(self) -> None:
+        for state in self.states:
+            state.transition()
+
+    def _plan(self, variable: Union[Variable, str]) -> List[Function]:
+        i = int(self.dag.locate(variable)[0])
+        if i not in self._plans:
+            ancestors = self.dag.ancestor_indices(np.array([i]), across_time=False)
+            needed = [j for j in ancestors.tolist() if j in self._lazy]
+            needed.sort(key=self._position.__getitem__)
+            self._plans[i] = [self.dag.nodes[j] for j in needed]
+        return self._plans[i]
+
+    def pull(self, variable: Union[Variable, str]) -> Any:
+        """The value of a variable in the current step, computed if needed."""
+        for func in self._plan(variable):
+            if id(func) not in self._done:
+                func.forward()
+                self._done.add(id(func))
+        if isinstance(variable, str):
+            variable = self.dag.nodes[self.dag.by_path[variable]]
+        return variable.value
+
+    def pull_all(self, variables: Sequence[Union[Variable, str]]=None) -> None:
+        """Compute the lazy functions that ``variables`` need, by default all.
+
+        Call it before reading ``.value`` directly, e.g., before a
+        ``SimulationSaver.save()``.
+        """
+        if variables is None:
+            plans = [self.lazy]
+        else:
+            plans = [self._plan(variable) for variable in variables]
+        for plan in plans:
+            for func in plan:
+                if id(func) not in self._done:
+                    func.forward()
+                    self._done.add(id(func))
+
+    def __str__(self) -> str:
+        return (f"LazyExecutor(system={self.system.name}, eager={len(self.eager)}, "
+                + f"lazy={len(self.lazy)})")
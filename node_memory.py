@@ -0,0 +1,144 @@
+"""Memory footprint of the nodes of a system
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["intern_strings", "share_empty_links", "unshare_empty_links",
+           "measure_bytes_per_node", "get_node_sizes"]
+
+
+import gc
+import sys
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+
+from cdcm import *
+from dag_utils import iter_nodes, get_functions
+
+
+_STRING_ATTRIBUTES = ("name", "units", "description")
+_LINK_ATTRIBUTES = ("parents", "children")
+
+
+def _get_nodes(system: System) -> list:
+    nodes = [node for _, node in iter_nodes(system)]
+    nodes += [func for _, func in get_functions(system)]
+    return list({id(node): node for node in nodes}.values())
+
+
+def intern_strings(system: System) -> int:
+    """Intern the names, units and descriptions of all nodes of a system.
+
+    Models built in loops or loaded from YAML files carry one copy of the
+    same unit or description string per node. Interning makes them share
+    a single copy. Returns the number of strings interned.
+    """
+    count = 0
+    for node in _get_nodes(system):
+        for attribute in _STRING_ATTRIBUTES:
+            value = getattr(node, attribute, None)
+            if type(value) is not str:
+                continue
+            try:
+                setattr(node, attribute, sys.intern(value))
+            except AttributeError:
+                # Read-only attribute
+                continue
+            count += 1
+    return count
+
+
+def share_empty_links(system: System) -> int:
+    """Replace the empty parent and child lists of all nodes by one empty tuple.
+
+    Parameters have no parents and outputs nobody reads have no children,
+    yet each of them carries its own empty list. Call this once the system
+    is complete: adding a link to a node with a shared empty tuple fails
+    with an ``AttributeError``, until ``unshare_empty_links()`` is called.
+    Empty descriptions need no sentinel, as the empty string is already
+    shared. Returns the number of lists replaced.
+    """
+    count = 0
+    for node in _get_nodes(system):
+        for attribute in _LINK_ATTRIBUTES:
+            value = getattr(node, attribute, None)
+            if type(value) is not list or value:
+                continue
+            try:
+                setattr(node, attribute, ())
+            except AttributeError:
+                # Read-only attribute
+                continue
+            count += 1
+    return count
+
+
+def unshare_empty_links(system: System) -> int:
+    """Give every node with a shared empty tuple its own empty list again.
+
+    Returns the number of lists restored.
+    """
+    count = 0
+    for node in _get_nodes(system):
+        for attribute in _LINK_ATTRIBUTES:
+            value = getattr(node, attribute, None)
+            if type(value) is tuple and not value:
+                setattr(node, attribute, [])
+                count += 1
+    return count
+
+
+def measure_bytes_per_node(build_system: Callable[[], System],
+                           *,
+                           intern: bool=False,
+                           share_empty: bool=False) -> Tuple[float, int]:
+    """Measure the memory allocated per node by ``build_system()``.
+
+    With ``intern`` the strings are interned and with ``share_empty`` the
+    empty links are shared before measuring. Returns the bytes per node and
+    the number of nodes, counting variables, parameters, states, functions
+    and systems.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        system = build_system()
+        if intern:
+            intern_strings(system)
+        if share_empty:
+            share_empty_links(system)
+        if intern or share_empty:
+            gc.collect()
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    n_nodes = len(_get_nodes(system))
+    return allocated / n_nodes, n_nodes
+
+
+def get_node_sizes(system: System) -> Dict[str, Tuple[float, int]]:
+    """The mean shallow size of the nodes of a system by node type.
+
+    The size of a node is ``sys.getsizeof()`` of the object, its
+    ``__dict__`` and its parent and child lists, without the values and
+    strings they refer to. Returns the type name -> (bytes per node, count).
+    """
+    sizes = defaultdict(list)
+    for node in _get_nodes(system):
+        size = sys.getsizeof(node)
+        attributes = getattr(node, "__dict__", None)
+        if attributes is not None:
+            size += sys.getsizeof(attributes)
+        for attribute in ("parents", "children"):
+            value = getattr(node, attribute, None)
+            if isinstance(value, list):
+                size += sys.getsizeof(value)
+        sizes[type(node).__name__].append(size)
+    return {name: (sum(s) / len(s), len(s)) for name, s in sorted(sizes.items())}
@@ -0,0 +1,206 @@
+"""Streaming output backends for simulation results
+
+The ``StreamingSaver`` buffers the tracked variables of a system in a
+``TrajectoryRecorder`` and hands them to an output backend in batches:
+
+    backend = ParquetBackend("campaign", run_id=17)
+    with StreamingSaver(sys, backend, batch_size=4096) as saver:
+        for i in range(max_steps):
+            sys.forward()
+            saver.save()
+            sys.transition()
+
+The Parquet backend writes a hive-partitioned dataset, i.e., one
+``run_id=<id>`` directory per run, so that ensembles can be queried with
+predicate pushdown:
+
+    import pyarrow.dataset as ds
+    table = ds.dataset("campaign", partitioning="hive").to_table(
+        filter=ds.field("run_id") == 17)
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["OutputBackend", "HDF5Backend", "ArrowIPCBackend", "ParquetBackend",
+           "StreamingSaver"]
+
+
+import abc
+import os
+from typing import Dict
+
+import numpy as np
+
+from cdcm import *
+from trajectory_recorder import TrajectoryRecorder
+
+
+class OutputBackend(abc.ABC):
+    """Interface of the output backends.
+
+    A backend receives batches of rows as a dictionary mapping node paths to
+    arrays whose first dimension is the step. ``start`` is the index of the
+    first step in the batch.
+    """
+
+    @abc.abstractmethod
+    def write_batch(self, columns: Dict[str, np.ndarray], start: int) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class HDF5Backend(OutputBackend):
+    """Writes one resizable dataset per node path, like the ``SimulationSaver``."""
+
+    def __init__(self, filename: str) -> None:
+        import h5py
+
+        self.file_handler = h5py.File(filename, "w")
+
+    def write_batch(self, columns: Dict[str, np.ndarray], start: int) -> None:
+        for path, column in columns.items():
+            if path not in self.file_handler:
+                self.file_handler.create_dataset(
+                    path, shape=(0,) + column.shape[1:], dtype=column.dtype,
+                    maxshape=(None,) + column.shape[1:], chunks=True)
+            dataset = self.file_handler[path]
+            dataset.resize(start + column.shape[0], axis=0)
+            dataset[start:] = column
+
+    def close(self) -> None:
+        self.file_handler.close()
+
+
+def _to_arrow_table(columns: Dict[str, np.ndarray], start: int, run_id=None):
+    """Convert a batch to an Arrow table with ``step`` and ``run_id`` columns."""
+    import pyarrow as pa
+
+    n = len(next(iter(columns.values()))) if columns else 0
+    arrays = {"step": pa.array(np.arange(start, start + n))}
+    if run_id is not None:
+        arrays["run_id"] = pa.array(np.full(n, run_id))
+    for path, column in columns.items():
+        if column.ndim == 1:
+            arrays[path] = pa.array(column)
+        else:
+            flat = column.reshape(n, -1)
+            arrays[path] = pa.FixedSizeListArray.from_arrays(
+                pa.array(flat.ravel()), flat.shape[1])
+    return pa.table(arrays)
+
+
+class ArrowIPCBackend(OutputBackend):
+    """Streams batches to an Arrow IPC file, one record batch per flush."""
+
+    def __init__(self, filename: str, *, run_id=None) -> None:
+        self.filename = filename
+        self.run_id = run_id
+        self.writer = None
+
+    def write_batch(self, columns: Dict[str, np.ndarray], start: int) -> None:
+        import pyarrow as pa
+
+        table = _to_arrow_table(columns, start, self.run_id)
+        if self.writer is None:
+            self.writer = pa.ipc.new_file(self.filename, table.schema)
+        self.writer.write_table(table)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class ParquetBackend(OutputBackend):
+    """Streams batches as row groups of a Parquet file partitioned by run id.
+
+    The file is written to ``<root>/run_id=<run_id>/part-0.parquet``. The
+    ``run_id`` column itself is kept out of the file because it is encoded
+    in the directory name.
+    """
+
+    def __init__(self, root: str, *, run_id=0, compression: str="zstd") -> None:
+        self.directory = os.path.join(root, f"run_id={run_id}")
+        self.compression = compression
+        self.writer = None
+
+    def write_batch(self, columns: Dict[str, np.ndarray], start: int) -> None:
+        import pyarrow.parquet as pq
+
+        table = _to_arrow_table(columns, start)
+        if self.writer is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.writer = pq.ParquetWriter(
+                os.path.join(self.directory, "part-0.parquet"), table.schema,
+                compression=self.compression)
+        self.writer.write_table(table)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class StreamingSaver:
+    """Saves a simulation through an output backend in batches.
+
+    It has the same ``save()`` call as the ``SimulationSaver``, but the rows
+    are buffered in memory and only written when ``batch_size`` of them
+    have been collected, or when the saver is closed.
+
+    Arguments:
+        system     -- The system to save.
+        backend    -- An ``OutputBackend``.
+        batch_size -- The number of steps per batch.
+        nodes      -- The variables (or paths) to save. By default all
+                      variables with ``track=True``.
+        executor   -- A ``LazyExecutor`` that computes the saved variables
+                      before every row.
+    """
+
+    def __init__(self,
+                 system: System,
+                 backend: OutputBackend,
+                 *,
+                 batch_size: int=1024,
+                 nodes=None,
+                 executor=None) -> None:
+        self.system = system
+        self.backend = backend
+        self.batch_size = batch_size
+        self.buffer = TrajectoryRecorder(system, nodes, capacity=batch_size,
+                                         executor=executor)
+        self.steps_written = 0
+
+    def save(self) -> None:
+        """Save the current values of the system."""
+        self.buffer.record()
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows to the backend."""
+        if len(self.buffer) == 0:
+            return
+        self.backend.write_batch(self.buffer.to_numpy(), self.steps_written)
+        self.steps_written += len(self.buffer)
+        self.buffer.clear()
+
+    def close(self) -> None:
+        """Flush the remaining rows and close the backend."""
+        self.flush()
+        self.backend.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,155 @@
+"""Level-parallel execution of the forward pass of a system
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["LevelParallelExecutor"]
+
+
+import os
+import time
+from numbers import Number
+from concurrent.futures import ThreadPoolExecutor
+
+from cdcm import *
+from dag_utils import get_states, get_initializers, get_dag_index
+
+
+class LevelParallelExecutor:
+    """Runs the forward pass of a system one topological level at a time.
+
+    Functions on the same level of the DAG do not depend on each other, so
+    they are dispatched to a thread pool. This only pays off for functions
+    that release the GIL (e.g., large NumPy operations). A simple cost
+    model decides per level whether to go parallel: the costs of all
+    functions are measured during a serial calibration step and a level is
+    only dispatched if the estimated parallel time, including the
+    per-task overhead, beats the serial time.
+
+    Functions sharing mutable state, e.g., drawing from the global
+    ``np.random`` generator like the emission functions ``g1``/``g2``, would
+    make the results depend on the schedule. So only the functions listed
+    in ``thread_safe_functions`` are ever dispatched to the pool; all
+    others run on the calling thread in a fixed order, which keeps the
+    results deterministic. Two thread-safe functions that write the same
+    node are rejected, because they could run at the same time.
+
+    Initializers of states (see ``get_initializers()``) only run in the
+    first forward pass, before all other functions.
+
+    Use it in place of ``system.forward()`` and ``system.transition()``:
+
+        with LevelParallelExecutor(sys, max_workers=4,
+                                   thread_safe_functions=[f1, f2]) as executor:
+            for i in range(n_steps):
+                executor.forward()
+                executor.transition()
+    """
+
+    def __init__(self,
+                 system: System,
+                 *,
+                 max_workers: int=None,
+                 task_overhead: Number=5e-5,
+                 thread_safe_functions=()) -> None:
+        self.system = system
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.task_overhead = task_overhead
+        dag = get_dag_index(system)
+        self.paths = dag.function_paths
+        self.functions = dag.functions
+        self.states = [s for _, s in get_states(system)]
+        self.initializers = get_initializers(self.functions)
+        init_ids = {id(f) for f in self.initializers}
+        levels = [[i for i in level if id(self.functions[i]) not in init_ids]
+                  for level in dag.function_levels()]
+        self.levels = [level for level in levels if level]
+        safe_ids = {id(f) for f in thread_safe_functions}
+        self._serial = [id(f) not in safe_ids for f in self.functions]
+        writers = {}
+        for level in self.levels:
+            for i in level:
+                if self._serial[i]:
+                    continue
+                for child in self.functions[i].children:
+                    writers.setdefault(id(child), []).append(self.paths[i])
+        for paths in writers.values():
+            if len(paths) > 1:
+                raise ValueError(f"The thread-safe functions {paths} write the same node.")
+        self.costs = None
+        self._plan = None
+        self._pool = None
+
+    def calibrate(self) -> None:
+        """Run the first, serial forward pass measuring the cost of each function."""
+        costs = [0.0] * len(self.functions)
+        for func in self.initializers:
+            func.forward()
+        for level in self.levels:
+            for i in level:
+                start = time.perf_counter()
+                self.functions[i].forward()
+                costs[i] = time.perf_counter() - start
+        self.costs = costs
+        self._plan = [self._split_level(level) for level in self.levels]
+
+    def _split_level(self, level):
+        """Split a level in the functions to run serially and in parallel."""
+        serial = [i for i in level if self._serial[i]]
+        candidates = [i for i in level if not self._serial[i]]
+        if self.max_workers < 2 or len(candidates) < 2:
+            return serial + candidates, []
+        costs = [self.costs[i] for i in candidates]
+        serial_time = sum(costs)
+        parallel_time = (max(max(costs), serial_time / self.max_workers)
+                         + self.task_overhead * len(candidates))
+        if parallel_time < serial_time:
+            return serial, candidates
+        return serial + candidates, []
+
+    def forward(self) -> None:
+        """Evaluate all functions of the system."""
+        if self._plan is None:
+            self.calibrate()
+            return
+        for serial, parallel in self._plan:
+            futures = []
+            if parallel:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+                futures = [self._pool.submit(self.functions[i].forward)
+                           for i in parallel]
+            for i in serial:
+                self.functions[i].forward()
+            for future in futures:
+                future.result()
+
+    def transition(self) -> None:
+        """Move all states to their next value."""
+        for state in self.states:
+            state.transition()
+
+    def close(self) -> None:
+        """Shut down the thread pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        n_parallel = 0 if self._plan is None else sum(
+            1 for _, parallel in self._plan if parallel)
+        return (f"LevelParallelExecutor(system={self.system.name}, "
+                f"functions={len(self.functions)}, levels={len(self.levels)}, "
+                f"parallel_levels={n_parallel}, max_workers={self.max_workers})")
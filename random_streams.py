@@ -0,0 +1,208 @@
+"""Reproducible random streams for stochastic functions
+
+Functions that call the global ``np.random.randn()`` depend on the order in
+which they run and cannot be parallelized reproducibly. ``RandomStreams``
+gives every stochastic function its own counter-based Philox stream,
+keyed by ``(seed, run_id, path)`` where ``path`` is the path of the
+function in the system. The draws of a function at a step only depend on
+that key, the step and how many draws the function already made in that
+step, so the results are the same whatever the number of workers or the
+evaluation order. The functions pass themselves, so two functions can
+never share a stream by accident:
+
+    streams = RandomStreams(seed=1, run_id=run_id)
+
+    @make_function(y1)
+    def g1(x1=x1, s1=s1):
+        return x1 + s1 * streams.normal(g1)
+
+    sys = System(name="sys", nodes=[...])
+    streams.bind(sys)
+    for i in range(n_steps):
+        sys.forward()
+        sys.transition()
+        streams.advance()
+
+The noise of many steps can also be generated in one vectorized call with
+``normal_block()`` or ``pregenerate()``.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["RandomStreams"]
+
+
+import hashlib
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+from cdcm import *
+from dag_utils import get_functions
+
+
+Shape = Union[int, Tuple[int, ...]]
+Stream = Union[Function, str]
+
+# The words of the 256-bit Philox counter: the step times the blocks per
+# step plus the block, the blocks per step, the draw within the step (low
+# half) and the distribution (high half), and the generator flag. The
+# blocks per step keep the steps of different sizes apart.
+_UNIFORM = 0
+_NORMAL = 1
+
+
+class RandomStreams:
+    """Counter-based random streams keyed by run id and node path.
+
+    A stream is given as a ``Function`` of the bound system, or as the path
+    of one. Calls of ``uniform()`` and ``normal()`` at the current step get
+    consecutive draw indices, so a function that draws twice per step gets
+    independent numbers. Uniform and normal draws use separate counters, and
+    so do draws of different sizes, even in consecutive steps.
+
+    Arguments:
+        seed   -- The seed of the whole study.
+        run_id -- The id of the run, e.g., the index of an ensemble member.
+        system -- The system whose functions draw from the streams. It can
+                  also be given later with ``bind()``.
+    """
+
+    def __init__(self, seed: int=0, run_id: int=0, system: System=None) -> None:
+        self.seed = seed
+        self.run_id = run_id
+        self.step = 0
+        self._keys = {}
+        self._generators = {}
+        self._draws = {}
+        self._paths = None
+        if system is not None:
+            self.bind(system)
+
+    def bind(self, system: System) -> None:
+        """Resolve the streams of the functions of ``system`` by their paths."""
+        self._paths = {id(func): path for path, func in get_functions(system)}
+        self._known = set(self._paths.values())
+
+    def path(self, stream: Stream) -> str:
+        """The path of a stream, checked against the bound system."""
+        if isinstance(stream, str):
+            if self._paths is not None and stream not in self._known:
+                raise ValueError(f"{stream} is not the path of a function of the bound system.")
+            return stream
+        if self._paths is None:
+            raise ValueError(f"Bind the system of {stream.name} before drawing from its stream.")
+        if id(stream) not in self._paths:
+            raise ValueError(f"{stream.name} is not a function of the bound system.")
+        return self._paths[id(stream)]
+
+    def key(self, stream: Stream) -> int:
+        """The 128-bit Philox key of a stream."""
+        path = self.path(stream)
+        if path not in self._keys:
+            digest = hashlib.blake2b(f"{self.seed}:{self.run_id}:{path}".encode(),
+                                     digest_size=16).digest()
+            self._keys[path] = int.from_bytes(digest, "little")
+        return self._keys[path]
+
+    def generator(self, stream: Stream) -> np.random.Generator:
+        """A general purpose generator for a path, e.g., for other distributions.
+
+        Unlike ``uniform()`` and ``normal()`` it is not addressable by step,
+        so draws depend on how often it has been called.
+        """
+        path = self.path(stream)
+        if path not in self._generators:
+            # Counters with the top word set never collide with the per-step
+            # counters used below
+            bit_generator = np.random.Philox(key=self.key(path), counter=[0, 0, 0, 1])
+            self._generators[path] = np.random.Generator(bit_generator)
+        return self._generators[path]
+
+    def advance(self, n: int=1) -> None:
+        """Move the default step forward, usually once per transition."""
+        self.step += n
+        self._draws.clear()
+
+    def _raw(self, stream: Stream, start_step: int, n_steps: int, size: int,
+             draw: int, kind: int) -> np.ndarray:
+        """Raw 64-bit words, ``size`` per step, as an (n_steps, size) array."""
+        blocks = max(1, -(-size // 4))
+        counter = start_step * blocks + (blocks << 64) + (draw << 128) + (kind << 160)
+        bit_generator = np.random.Philox(key=self.key(stream), counter=counter)
+        raw = bit_generator.random_raw(n_steps * blocks * 4)
+        return raw.reshape(n_steps, blocks * 4)[:, :size]
+
+    @staticmethod
+    def _to_uniform(raw: np.ndarray) -> np.ndarray:
+        """Map 64-bit words to doubles in the open interval (0, 1)."""
+        return ((raw >> np.uint64(11)).astype(float) + 0.5) * 2.0 ** -53
+
+    def uniform_block(self, stream: Stream, start_step: int, n_steps: int,
+                      size: Shape=(), draw: int=0) -> np.ndarray:
+        """Uniform draws of ``n_steps`` consecutive steps, shape (n_steps, *size).
+
+        ``draw`` selects the draw within each step, i.e., the result equals
+        the ``draw + 1``-th call of ``uniform()`` in each of the steps.
+        """
+        shape = (size,) if isinstance(size, int) else tuple(size)
+        n = int(np.prod(shape))
+        u = self._to_uniform(self._raw(stream, start_step, n_steps, n, draw, _UNIFORM))
+        return u.reshape((n_steps,) + shape)
+
+    def normal_block(self, stream: Stream, start_step: int, n_steps: int,
+                     size: Shape=(), draw: int=0) -> np.ndarray:
+        """Standard normal draws of ``n_steps`` consecutive steps.
+
+        Uses the Box-Muller transform, so every step consumes a fixed number
+        of words and any range of steps can be generated directly. ``draw``
+        works like for ``uniform_block()``.
+        """
+        shape = (size,) if isinstance(size, int) else tuple(size)
+        n = int(np.prod(shape))
+        pairs = -(-n // 2)
+        u = self._to_uniform(self._raw(stream, start_step, n_steps, 2 * pairs, draw, _NORMAL))
+        radius = np.sqrt(-2.0 * np.log(u[:, :pairs]))
+        angle = 2.0 * np.pi * u[:, pairs:]
+        z = np.concatenate([radius * np.cos(angle), radius * np.sin(angle)], axis=1)
+        return z[:, :n].reshape((n_steps,) + shape)
+
+    def _next_draw(self, stream: Stream, kind: int) -> int:
+        """The index of the next draw of a stream in the current step."""
+        key = (self.path(stream), kind)
+        draw = self._draws.get(key, 0)
+        self._draws[key] = draw + 1
+        return draw
+
+    def uniform(self, stream: Stream, size: Shape=None, *, step: int=None, draw: int=0):
+        """Uniform draws of a stream.
+
+        Without ``step`` this is the next draw of the current step. With
+        ``step`` it is the draw with index ``draw`` of that step.
+        """
+        if step is None:
+            step, draw = self.step, self._next_draw(stream, _UNIFORM)
+        u = self.uniform_block(stream, step, 1, () if size is None else size, draw)[0]
+        return u if size is not None else float(u)
+
+    def normal(self, stream: Stream, size: Shape=None, *, step: int=None, draw: int=0):
+        """Standard normal draws of a stream, addressed like ``uniform()``."""
+        if step is None:
+            step, draw = self.step, self._next_draw(stream, _NORMAL)
+        z = self.normal_block(stream, step, 1, () if size is None else size, draw)[0]
+        return z if size is not None else float(z)
+
+    def pregenerate(self, sizes: Dict[Stream, Shape], start_step: int,
+                    n_steps: int) -> Dict[str, np.ndarray]:
+        """Normal noise (the first draw of each step) of many streams, keyed by path."""
+        return {self.path(stream): self.normal_block(stream, start_step, n_steps, size)
+                for stream, size in sizes.items()}
+
+    def __str__(self) -> str:
+        return f"RandomStreams(seed={self.seed}, run_id={self.run_id}, step={self.step})"
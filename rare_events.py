@@ -0,0 +1,195 @@
+"""Rare-event estimation with multilevel splitting
+
+Plain Monte Carlo needs about ``100 / p`` runs to estimate a failure
+probability ``p`` with 10% relative error. Multilevel splitting instead
+writes the failure event as a sequence of nested, less rare events
+``score >= levels[0]``, ``score >= levels[1]``, ... and only continues the
+runs that reached the previous level, cloning their state at the crossing:
+
+    def score(hab):
+        return 1.0 - hab.power.soc.value
+
+    levels = pilot_levels(hab, score, threshold=0.95, n_steps=24 * 30)
+    result = multilevel_splitting(hab, score, levels, n_steps=24 * 30,
+                                  n_particles=1000)
+    print(result.estimate, result.confidence_interval())
+
+With the levels fixed in advance the estimator is unbiased. That is why
+``pilot_levels()`` picks them in a separate, cheaper run.
+
+The model is assumed to draw its randomness from ``np.random``. Every
+run segment reseeds it, so clones of the same state diverge.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["SplittingResult", "multilevel_splitting", "pilot_levels"]
+
+
+from numbers import Number
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from cdcm import *
+from system_state import get_snapshot, set_snapshot
+
+
+class SplittingResult:
+    """The output of ``multilevel_splitting()``.
+
+    Attributes:
+        estimate            -- The estimated probability of the final level.
+        levels              -- The levels used.
+        level_probabilities -- The conditional probability of each level.
+        n_particles         -- The number of runs per level.
+        n_steps_simulated   -- The total number of simulated steps.
+    """
+
+    def __init__(self, levels, level_probabilities, n_particles, n_steps_simulated) -> None:
+        self.levels = list(levels)
+        self.level_probabilities = list(level_probabilities)
+        self.n_particles = n_particles
+        self.n_steps_simulated = n_steps_simulated
+        self.estimate = float(np.prod(self.level_probabilities))
+
+    @property
+    def relative_error(self) -> float:
+        """Asymptotic relative standard error of the estimate.
+
+        This is the error for independent levels. The resampling makes the
+        levels correlated, so the actual error is somewhat larger.
+        """
+        p = np.array(self.level_probabilities)
+        if self.estimate == 0.0:
+            return np.inf
+        return float(np.sqrt(np.sum((1.0 - p) / (self.n_particles * p))))
+
+    def confidence_interval(self, z: Number=1.96) -> Tuple[float, float]:
+        """A normal-approximation confidence interval for the estimate."""
+        half_width = z * self.relative_error * self.estimate
+        return max(0.0, self.estimate - half_width), self.estimate + half_width
+
+    def __str__(self) -> str:
+        return (f"SplittingResult(estimate={self.estimate:1.3e}, "
+                + f"relative_error={self.relative_error:1.2f}, "
+                + f"levels={len(self.levels)}, n_particles={self.n_particles}, "
+                + f"n_steps_simulated={self.n_steps_simulated})")
+
+
+def _run_segment(system: System,
+                 score: Callable[[System], Number],
+                 start: Tuple[Dict[str, Any], int],
+                 level: Number,
+                 n_steps: int,
+                 seed: int) -> Tuple[Any, Number, int]:
+    """Run from ``start`` until ``score >= level`` or the horizon.
+
+    Returns the ``(snapshot, step)`` at the crossing (or ``None``), the
+    maximum score reached and the number of steps taken.
+    """
+    snapshot, step = start
+    set_snapshot(system, snapshot)
+    np.random.seed(seed)
+    first_step = step
+    max_score = score(system)
+    while max_score < level and step < n_steps:
+        system.forward()
+        system.transition()
+        step += 1
+        max_score = max(max_score, score(system))
+    crossing = (get_snapshot(system), step) if max_score >= level else None
+    return crossing, max_score, step - first_step
+
+
+def _seeds(rng: np.random.Generator, n: int) -> np.ndarray:
+    return rng.integers(0, 2 ** 32, size=n)
+
+
+def multilevel_splitting(system: System,
+                         score: Callable[[System], Number],
+                         levels: Sequence[Number],
+                         n_steps: int,
+                         *,
+                         n_particles: int=1000,
+                         seed: int=None) -> SplittingResult:
+    """Estimate the probability that ``score`` reaches ``levels[-1]`` within ``n_steps``.
+
+    Fixed-effort splitting: ``n_particles`` runs are started at every level
+    from states resampled among the crossings of the previous level.
+
+    Arguments:
+        system      -- The system, in its initial state.
+        score       -- A function of the system; larger is closer to failure.
+        levels      -- Increasing levels; the last one defines the failure.
+        n_steps     -- The time horizon in steps.
+        n_particles -- The number of runs per level.
+        seed        -- Seed for the resampling and for the runs.
+    """
+    rng = np.random.default_rng(seed)
+    initial = (get_snapshot(system), 0)
+    starts = [initial] * n_particles
+    probabilities = []
+    n_steps_simulated = 0
+    for level in levels:
+        crossings = []
+        for start, s in zip(starts, _seeds(rng, n_particles)):
+            crossing, _, taken = _run_segment(system, score, start, level, n_steps, s)
+            n_steps_simulated += taken
+            if crossing is not None:
+                crossings.append(crossing)
+        probabilities.append(len(crossings) / n_particles)
+        if not crossings:
+            probabilities += [0.0] * (len(levels) - len(probabilities))
+            break
+        starts = [crossings[i] for i in rng.integers(0, len(crossings), size=n_particles)]
+    set_snapshot(system, initial[0])
+    return SplittingResult(levels, probabilities, n_particles, n_steps_simulated)
+
+
+def pilot_levels(system: System,
+                 score: Callable[[System], Number],
+                 threshold: Number,
+                 n_steps: int,
+                 *,
+                 n_particles: int=100,
+                 p0: Number=0.1,
+                 max_levels: int=50,
+                 seed: int=None) -> List[float]:
+    """Choose levels so that each one is reached with probability about ``p0``.
+
+    This is an adaptive (subset simulation) pass: each new level is the
+    ``1 - p0`` quantile of the maximum score reached by the current runs.
+    """
+    rng = np.random.default_rng(seed)
+    initial = (get_snapshot(system), 0)
+    starts = [initial] * n_particles
+    levels = []
+    while len(levels) < max_levels:
+        maxima = [_run_segment(system, score, start, np.inf, n_steps, s)[1]
+                  for start, s in zip(starts, _seeds(rng, n_particles))]
+        level = min(threshold, float(np.quantile(maxima, 1.0 - p0)))
+        if levels and level <= levels[-1]:
+            level = threshold
+        levels.append(level)
+        if level >= threshold:
+            break
+        crossings = []
+        for start, s in zip(starts, _seeds(rng, n_particles)):
+            crossing = _run_segment(system, score, start, level, n_steps, s)[0]
+            if crossing is not None:
+                crossings.append(crossing)
+        if not crossings:
+            levels[-1] = threshold
+            break
+        starts = [crossings[i] for i in rng.integers(0, len(crossings), size=n_particles)]
+    set_snapshot(system, initial[0])
+    if levels[-1] < threshold:
+        levels.append(threshold)
+    return levels
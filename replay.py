@@ -0,0 +1,171 @@
+"""Fast replay of recorded data through the part of a system it drives
+
+In a regular simulation a ``DataSystem`` advances one row per
+``forward()``/``transition()`` together with everything else. During a
+replay only the functions that depend on the data columns (and the
+functions these need, e.g., the clock) are evaluated. The data columns
+themselves are written straight from blocks of rows, without going
+through the functions of the ``DataSystem``. Columns that no replayed
+function reads are only written when a callback needs them and at the
+end of the run, so pure data columns cost nothing per step:
+
+    replay = DataReplay(hab, sensors, columns=["T_in", "P_bus"])
+    replay.run()                                    # as fast as possible
+    replay.run(speedup=60.0, dt=timedelta(hours=1)) # one hour per minute
+
+The row counter of the ``DataSystem`` itself is not advanced by a
+replay. Call ``replay.sync()`` before stepping the data system normally
+again; it sets the counter to the next row directly.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["DataReplay"]
+
+
+import time
+from datetime import timedelta
+from numbers import Number
+from typing import Callable, Sequence
+
+import numpy as np
+
+from cdcm import *
+from data_tables import to_record_block
+from dag_utils import get_functions, get_dag_index
+
+
+class DataReplay:
+    """Replays the rows of a ``DataSystem`` through the functions it drives.
+
+    Arguments:
+        system      -- The system that contains the data system.
+        data_system -- The ``DataSystem`` to replay.
+        columns     -- The names of the replayed columns, in the order of the
+                       columns of ``data``.
+        data        -- The recorded data, by default ``data_system.data``. A
+                       structured array is read by the names in ``columns``.
+        start_row   -- The first row to replay. The data system itself is
+                       expected at row 0, i.e., not stepped yet.
+        batch_size  -- The number of rows fetched at once.
+    """
+
+    def __init__(self,
+                 system: System,
+                 data_system: DataSystem,
+                 columns: Sequence[str],
+                 data: np.ndarray=None,
+                 *,
+                 start_row: int=0,
+                 batch_size: int=4096) -> None:
+        self.system = system
+        self.data_system = data_system
+        data = data_system.data if data is None else data
+        if not (isinstance(data, np.ndarray) and data.dtype.names is not None):
+            data = np.asarray(data).reshape(len(data), -1)
+            data = {c: data[:, j] for j, c in enumerate(columns)}
+        # One packed row per step
+        self.data = to_record_block(data, columns)
+        self.columns = [getattr(data_system, c) for c in columns]
+        self.row = start_row
+        self.batch_size = batch_size
+
+        dag = get_dag_index(system)
+        own_functions = [func for _, func in get_functions(data_system)]
+        own = {id(func) for func in own_functions}
+        driven = np.intersect1d(dag.descendant_indices(self.columns), dag.function_indices)
+        outputs = [c for i in driven for c in dag.nodes[i].children]
+        needed = np.union1d(driven, dag.ancestor_indices(outputs))
+        # In the order of the forward pass
+        rank = np.empty(len(dag), dtype=np.int64)
+        rank[dag.topological_indices()] = np.arange(len(dag))
+        needed = needed[np.argsort(rank[needed])]
+        self.plan = [dag.nodes[i] for i in needed
+                     if isinstance(dag.nodes[i], Function) and id(dag.nodes[i]) not in own]
+        self.states = [c for func in self.plan for c in func.children
+                       if isinstance(c, State)]
+        read = {id(p) for func in self.plan for p in func.parents}
+        self.driving = [j for j, c in enumerate(self.columns) if id(c) in read]
+        self.pure = [j for j, c in enumerate(self.columns) if id(c) not in read]
+        # The row counters of the data system and their values at row 0
+        self.counters = [(c, c.value) for func in own_functions
+                         for c in func.children if isinstance(c, State)]
+
+    def __len__(self) -> int:
+        """The number of rows left to replay."""
+        return max(0, self.data.shape[0] - self.row)
+
+    def run(self,
+            n_steps: int=None,
+            *,
+            speedup: Number=None,
+            dt: timedelta=None,
+            callback: Callable[[int], None]=None) -> int:
+        """Replay ``n_steps`` rows (by default all remaining rows).
+
+        Without ``speedup`` the replay runs as fast as possible. With it, step
+        ``i`` is not started before ``i * dt / speedup`` of wall-clock time has
+        passed. ``callback`` is called with the row index after every forward
+        pass, e.g., to run the diagnosis. Returns the number of steps.
+        """
+        n_steps = len(self) if n_steps is None else min(n_steps, len(self))
+        if n_steps == 0:
+            return 0
+        if not self.plan and callback is None and speedup is None:
+            # Nothing depends on the rows in between
+            self._write(self.pure + self.driving, self.data[self.row + n_steps - 1])
+            self.row += n_steps
+            return n_steps
+        if speedup is not None:
+            if dt is None:
+                raise ValueError("Pacing needs the duration dt of a step.")
+            period = dt.total_seconds() / speedup
+            start = time.perf_counter()
+        driving = [self.columns[j] for j in self.driving]
+        names = [self.data.dtype.names[j] for j in self.driving]
+        done = 0
+        while done < n_steps:
+            block = self.data[self.row:self.row + min(self.batch_size, n_steps - done)]
+            rows = block[names].tolist() if names else [()] * len(block)
+            for k, values in enumerate(rows):
+                if speedup is not None:
+                    delay = start + done * period - time.perf_counter()
+                    if delay > 0.0:
+                        time.sleep(delay)
+                for column, value in zip(driving, values):
+                    column.value = value
+                for func in self.plan:
+                    func.forward()
+                if callback is not None:
+                    self._write(self.pure, block[k])
+                    callback(self.row)
+                for state in self.states:
+                    state.transition()
+                self.row += 1
+                done += 1
+        self._write(self.pure, self.data[self.row - 1])
+        return done
+
+    def _write(self, columns: Sequence[int], values: np.ndarray) -> None:
+        for j in columns:
+            self.columns[j].value = values[j].item()
+
+    def sync(self) -> None:
+        """Move the row counter of the ``DataSystem`` to the next row to replay.
+
+        The counter counts up by one per step, so it is set to its value at
+        row 0 plus ``start_row`` plus the replayed rows.
+        """
+        for counter, start in self.counters:
+            counter.value = start + self.row
+
+    def __str__(self) -> str:
+        return (f"DataReplay(data_system={self.data_system.name}, "
+                + f"columns={len(self.columns)}, functions={len(self.plan)}, "
+                + f"row={self.row}/{self.data.shape[0]})")
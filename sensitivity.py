@@ -0,0 +1,221 @@
+"""Global sensitivity analysis over the parameters of a system
+
+The system is built once (per worker). Every design point restores the
+initial snapshot, assigns the parameter values by path and runs the
+simulation, so the system is never rebuilt:
+
+    analysis = SensitivityAnalysis(
+        build,
+        bounds={"/combined_system/sys1/c1": (0.05, 0.2),
+                "/combined_system/sys2/c2": (10.0, 30.0)},
+        output=lambda sys: sys.sys2.x1.value,
+        n_steps=100)
+    result = analysis.sobol(n=1024)
+    print(result["S1"], result["S1_conf"])
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["get_parameters", "SensitivityAnalysis"]
+
+
+from concurrent.futures import ProcessPoolExecutor
+from numbers import Number
+from statistics import NormalDist
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from cdcm import *
+from dag_utils import iter_nodes
+from system_state import get_snapshot, set_snapshot
+
+
+def get_parameters(system: System) -> Dict[str, Parameter]:
+    """All parameters of a system keyed by their path."""
+    return {path: node for path, node in iter_nodes(system)
+            if isinstance(node, Parameter)}
+
+
+class SensitivityAnalysis:
+    """Morris screening and Sobol indices of a scalar output.
+
+    Arguments:
+        build_system -- A function without arguments that returns the system.
+        bounds       -- The range of each varied parameter, keyed by path.
+        output       -- A function of the system returning the scalar output
+                        at the end of a run.
+        n_steps      -- The number of steps per run.
+        seed         -- Every run seeds ``np.random`` with it (common random
+                        numbers), so differences only come from the parameters.
+    """
+
+    def __init__(self,
+                 build_system: Callable[[], System],
+                 bounds: Dict[str, Tuple[Number, Number]],
+                 output: Callable[[System], Number],
+                 n_steps: int,
+                 *,
+                 seed: int=0) -> None:
+        self.build_system = build_system
+        self.names = list(bounds)
+        self.lower = np.array([bounds[n][0] for n in self.names], dtype=float)
+        self.upper = np.array([bounds[n][1] for n in self.names], dtype=float)
+        self.output = output
+        self.n_steps = n_steps
+        self.seed = seed
+        self.system = None
+
+    def __getstate__(self):
+        # Workers build their own system
+        state = self.__dict__.copy()
+        state["system"] = None
+        state.pop("parameters", None)
+        state.pop("snapshot", None)
+        return state
+
+    def _setup(self) -> None:
+        self.system = self.build_system()
+        parameters = get_parameters(self.system)
+        missing = [n for n in self.names if n not in parameters]
+        if missing:
+            raise ValueError(f"Parameters {missing} are not in {self.system.name}. "
+                             + f"Available: {sorted(parameters)}.")
+        self.parameters = [parameters[n] for n in self.names]
+        self.snapshot = get_snapshot(self.system)
+
+    def run(self, values: np.ndarray) -> float:
+        """Run the model for one set of parameter values."""
+        if self.system is None:
+            self._setup()
+        set_snapshot(self.system, self.snapshot)
+        for parameter, value in zip(self.parameters, values):
+            parameter.value = float(value)
+        np.random.seed(self.seed)
+        for _ in range(self.n_steps):
+            self.system.forward()
+            self.system.transition()
+        return float(self.output(self.system))
+
+    def evaluate(self, U: np.ndarray, processes: int=None) -> np.ndarray:
+        """Evaluate a design given in the unit hypercube."""
+        X = self.lower + U * (self.upper - self.lower)
+        if processes and processes > 1:
+            chunksize = max(1, len(X) // (4 * processes))
+            with ProcessPoolExecutor(max_workers=processes,
+                                     initializer=_init_worker,
+                                     initargs=(self,)) as pool:
+                return np.array(list(pool.map(_run_in_worker, X, chunksize=chunksize)))
+        return np.array([self.run(x) for x in X])
+
+    def _sample(self, n: int, d: int, seed: int) -> np.ndarray:
+        try:
+            from scipy.stats import qmc
+        except ImportError:
+            return np.random.default_rng(seed).random((n, d))
+        return qmc.Sobol(d, scramble=True, seed=seed).random(n)
+
+    def sobol(self,
+              n: int=1024,
+              *,
+              n_bootstrap: int=200,
+              confidence: Number=0.95,
+              seed: int=None,
+              processes: int=None) -> Dict[str, np.ndarray]:
+        """First-order and total Sobol indices with bootstrap confidence intervals.
+
+        Uses the Saltelli design with ``n * (d + 2)`` runs and the Saltelli
+        (2010) and Jansen estimators.
+        """
+        d = len(self.names)
+        AB = self._sample(n, 2 * d, seed)
+        A, B = AB[:, :d], AB[:, d:]
+        ABi = np.repeat(A[None, :, :], d, axis=0)
+        for i in range(d):
+            ABi[i, :, i] = B[:, i]
+        y = self.evaluate(np.concatenate([A, B, ABi.reshape(-1, d)]), processes)
+        fA, fB, fABi = y[:n], y[n:2 * n], y[2 * n:].reshape(d, n)
+
+        def indices(idx):
+            a, b, ab = fA[idx], fB[idx], fABi[:, idx]
+            variance = np.var(np.concatenate([a, b]))
+            if variance == 0.0:
+                return np.zeros(d), np.zeros(d)
+            s1 = np.mean(b * (ab - a), axis=1) / variance
+            st = 0.5 * np.mean((a - ab) ** 2, axis=1) / variance
+            return s1, st
+
+        S1, ST = indices(np.arange(n))
+        rng = np.random.default_rng(seed)
+        boot = [indices(rng.integers(0, n, size=n)) for _ in range(n_bootstrap)]
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return {
+            "names": self.names,
+            "S1": S1,
+            "S1_conf": z * np.std([b[0] for b in boot], axis=0),
+            "ST": ST,
+            "ST_conf": z * np.std([b[1] for b in boot], axis=0),
+        }
+
+    def morris(self,
+               n_trajectories: int=20,
+               *,
+               n_levels: int=4,
+               n_bootstrap: int=200,
+               confidence: Number=0.95,
+               seed: int=None,
+               processes: int=None) -> Dict[str, np.ndarray]:
+        """Morris elementary effects with ``n_trajectories * (d + 1)`` runs.
+
+        Returns ``mu_star`` (mean absolute effect) with a bootstrap confidence
+        interval, ``mu`` and ``sigma``.
+        """
+        d = len(self.names)
+        rng = np.random.default_rng(seed)
+        delta = n_levels / (2.0 * (n_levels - 1))
+        grid = np.arange(n_levels // 2) / (n_levels - 1)
+        points = []
+        steps = []
+        for _ in range(n_trajectories):
+            x = rng.choice(grid, size=d)
+            order = rng.permutation(d)
+            trajectory = [x.copy()]
+            for i in order:
+                x = x.copy()
+                x[i] += delta
+                trajectory.append(x)
+            points.extend(trajectory)
+            steps.append(order)
+        y = self.evaluate(np.array(points), processes).reshape(n_trajectories, d + 1)
+        effects = np.empty((n_trajectories, d))
+        for t, order in enumerate(steps):
+            effects[t, order] = np.diff(y[t]) / delta
+        mu_star = np.mean(np.abs(effects), axis=0)
+        boot = [np.mean(np.abs(effects[rng.integers(0, n_trajectories, n_trajectories)]), axis=0)
+                for _ in range(n_bootstrap)]
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        return {
+            "names": self.names,
+            "mu_star": mu_star,
+            "mu_star_conf": z * np.std(boot, axis=0),
+            "mu": np.mean(effects, axis=0),
+            "sigma": np.std(effects, axis=0, ddof=1) if n_trajectories > 1 else np.zeros(d),
+        }
+
+
+_worker_analysis = None
+
+
+def _init_worker(analysis: SensitivityAnalysis) -> None:
+    global _worker_analysis
+    _worker_analysis = analysis
+
+
+def _run_in_worker(values: np.ndarray) -> float:
+    return _worker_analysis.run(values)
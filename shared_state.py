@@ -0,0 +1,221 @@
+"""Exchange of states and parameters through shared memory
+
+The values of selected variables are mirrored in a
+``multiprocessing.shared_memory`` block. The block starts with its own
+layout (node path -> offset, dtype, shape), so another process only needs
+the name of the block to read the states without copies or to push new
+parameter values:
+
+    # Simulation process
+    block = SharedStateBlock(hab, name="hab0")
+    for i in range(n_steps):
+        block.pull()        # parameter updates of the coordinator
+        hab.forward()
+        hab.transition()
+        block.push()        # the new states for the monitors
+
+    # Monitor or coordinator process
+    block = SharedStateBlock.attach("hab0")
+    soc = block.view("/habitat/power/soc")
+    block.write("/habitat/power/capacity", 20.0)
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["SharedStateBlock"]
+
+
+import json
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from cdcm import *
+from dag_utils import iter_nodes
+
+
+# The header holds the sequence counters of the two writers and the size
+# of the layout
+_HEADER = 32
+_ALIGN = 64
+_PUSH = 0
+_SIZE = 1
+_WRITE = 2
+# The names of the blocks created by this process
+_created = set()
+
+
+class SharedStateBlock:
+    """Variable values in a shared memory block with a published layout.
+
+    ``push()`` copies the states (and other non-parameter variables) of the
+    system into the block and ``pull()`` copies the parameters from the
+    block into the system. The simulation (``push()``) and the coordinator
+    (``write()``) each bump their own sequence counter before and after
+    every update, so ``read()`` and ``pull()`` can return consistent
+    copies while the other side keeps writing. Each side must be a single
+    writer, i.e., one coordinator per block.
+
+    Integer and boolean parameters keep their dtype. Integer values of
+    other variables are stored as ``float64``, since they are usually
+    unset initial values of variables that become floats later on.
+
+    Arguments:
+        system -- The system that owns the values.
+        nodes  -- The variables (or paths) to share. By default all states
+                  and parameters.
+        name   -- The name of the block. A random one by default.
+    """
+
+    def __init__(self,
+                 system: System,
+                 nodes: Sequence[Union[Variable, str]]=None,
+                 *,
+                 name: str=None) -> None:
+        self.system = system
+        variables = [(path, node) for path, node in iter_nodes(system)
+                     if isinstance(node, Variable)]
+        if nodes is None:
+            variables = [(path, node) for path, node in variables
+                         if isinstance(node, (State, Parameter))]
+        else:
+            wanted = {n if isinstance(n, str) else id(n) for n in nodes}
+            variables = [(path, node) for path, node in variables
+                         if path in wanted or id(node) in wanted]
+            if len(variables) < len(wanted):
+                raise ValueError("Some of the requested nodes are not in "
+                                 + f"system {system.name}.")
+        layout = {}
+        offset = 0
+        for path, node in variables:
+            value = np.asarray(node.value)
+            if value.dtype.kind not in "biuf":
+                raise TypeError(f"{path} has a non-numeric value of type "
+                                + f"{type(node.value).__name__}.")
+            if value.dtype.kind in "iu" and not isinstance(node, Parameter):
+                dtype = np.float64
+            else:
+                dtype = value.dtype
+            layout[path] = (offset, np.dtype(dtype).str, list(value.shape))
+            offset += -(-value.size * np.dtype(dtype).itemsize // 8) * 8
+        header = json.dumps(layout).encode()
+        start = -(-(_HEADER + len(header)) // _ALIGN) * _ALIGN
+        self.memory = shared_memory.SharedMemory(name=name, create=True,
+                                                 size=start + max(offset, 8))
+        self.memory.buf[_HEADER:_HEADER + len(header)] = header
+        np.ndarray(4, dtype=np.uint64, buffer=self.memory.buf)[:] = (0, len(header), 0, 0)
+        self._map(layout, start)
+        self.variables = {path: node for path, node in variables}
+        self.owner = True
+        _created.add(self.memory.name)
+        self.push(all_nodes=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedStateBlock":
+        """Attach to the block of another process by its name."""
+        block = cls.__new__(cls)
+        block.system = None
+        block.variables = {}
+        block.owner = False
+        try:
+            block.memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            block.memory = shared_memory.SharedMemory(name=name)
+            # Before Python 3.13 attaching registers the block with the
+            # resource tracker, which would unlink it when this process exits
+            if block.memory.name not in _created:
+                resource_tracker.unregister(block.memory._name, "shared_memory")
+        size = int(np.ndarray(4, dtype=np.uint64, buffer=block.memory.buf)[_SIZE])
+        layout = json.loads(bytes(block.memory.buf[_HEADER:_HEADER + size]).decode())
+        block._map(layout, -(-(_HEADER + size) // _ALIGN) * _ALIGN)
+        return block
+
+    def _map(self, layout: Dict[str, Tuple[int, str, list]], start: int) -> None:
+        self.layout = layout
+        self.sequence = np.ndarray(4, dtype=np.uint64, buffer=self.memory.buf)
+        self.arrays = {path: np.ndarray(tuple(shape), dtype=np.dtype(dtype),
+                                        buffer=self.memory.buf, offset=start + offset)
+                       for path, (offset, dtype, shape) in layout.items()}
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def push(self, *, all_nodes: bool=False) -> None:
+        """Copy the values of the system into the block.
+
+        Parameters are only copied with ``all_nodes``, so that updates
+        written by a coordinator are not overwritten.
+        """
+        self.sequence[_PUSH] += 1
+        for path, node in self.variables.items():
+            if all_nodes or not isinstance(node, Parameter):
+                self.arrays[path][...] = node.value
+        self.sequence[_PUSH] += 1
+
+    def pull(self, max_tries: int=1000) -> None:
+        """Copy the parameter values of the block into the system.
+
+        The values are copied while no ``write()`` is in progress, retrying
+        if one started in the meantime.
+        """
+        parameters = [(path, node) for path, node in self.variables.items()
+                      if isinstance(node, Parameter)]
+        values = self._consistent(lambda: [self.arrays[path].copy() for path, _ in parameters],
+                                  (_WRITE,), max_tries)
+        for (_, node), array in zip(parameters, values):
+            node.value = array.item() if array.ndim == 0 else array
+
+    def view(self, path: str) -> np.ndarray:
+        """The live array of a node in the block, without copying."""
+        return self.arrays[path]
+
+    def write(self, path: str, value) -> None:
+        """Write a value into the block, e.g., a parameter update."""
+        self.sequence[_WRITE] += 1
+        self.arrays[path][...] = value
+        self.sequence[_WRITE] += 1
+
+    def read(self, max_tries: int=1000) -> Dict[str, np.ndarray]:
+        """A consistent copy of all values, retrying while a writer is busy."""
+        return self._consistent(
+            lambda: {path: array.copy() for path, array in self.arrays.items()},
+            (_PUSH, _WRITE), max_tries)
+
+    def _consistent(self, copy, counters: Tuple[int, ...], max_tries: int):
+        """The result of ``copy()`` while none of the counted writers was busy."""
+        for _ in range(max_tries):
+            before = [int(self.sequence[i]) for i in counters]
+            if all(count % 2 == 0 for count in before):
+                values = copy()
+                if [int(self.sequence[i]) for i in counters] == before:
+                    return values
+            # Let a descheduled writer finish
+            time.sleep(0)
+        raise RuntimeError(f"Could not read a consistent copy of {self.name}.")
+
+    def close(self) -> None:
+        """Detach from the block. The creating process also frees it."""
+        self.arrays = {}
+        self.sequence = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+            _created.discard(self.memory.name)
+
+    def __enter__(self) -> "SharedStateBlock":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __str__(self) -> str:
+        return f"SharedStateBlock(name={self.name}, nodes={len(self.layout)})"
@@ -0,0 +1,212 @@
+"""Stopping criteria for simulations
+
+Run a simulation until the answer is known instead of for a fixed number
+of steps:
+
+    criteria = [
+        PeriodicSteadyState.from_clock(hab.power.soc, hab.clock),
+        Threshold(hab.power.soc, lower=0.05),
+    ]
+    steps, reason = run_until(simulator, criteria, max_steps=24 * 365)
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["LUNAR_DAY", "StoppingCriterion", "Converged", "PeriodicSteadyState",
+           "Threshold", "Predicate", "run_until"]
+
+
+import abc
+from datetime import timedelta
+from numbers import Number
+from typing import Callable, Sequence, Tuple
+
+import numpy as np
+
+from cdcm import *
+from time_units import get_timestep
+
+
+# The synodic lunar day, i.e., the period of the day/night cycle on the Moon
+LUNAR_DAY = timedelta(days=29.530589)
+
+
+class StoppingCriterion(abc.ABC):
+    """Interface of the stopping criteria.
+
+    ``update()`` is called once per step, after the forward pass, and
+    returns ``True`` when the simulation should stop.
+    """
+
+    reason = ""
+
+    def reset(self) -> None:
+        pass
+
+    @abc.abstractmethod
+    def update(self) -> bool:
+        pass
+
+
+class Converged(StoppingCriterion):
+    """Stops when the running mean of a variable no longer changes.
+
+    The mean over the last ``window`` steps is compared with the mean over
+    the ``window`` steps before them.
+    """
+
+    def __init__(self,
+                 variable: Variable,
+                 window: int,
+                 *,
+                 rtol: Number=1e-3,
+                 atol: Number=0.0) -> None:
+        self.variable = variable
+        self.window = window
+        self.rtol = rtol
+        self.atol = atol
+        self.reset()
+
+    def reset(self) -> None:
+        self.buffer = np.zeros(2 * self.window)
+        self.count = 0
+
+    def update(self) -> bool:
+        self.buffer[self.count % (2 * self.window)] = self.variable.value
+        self.count += 1
+        if self.count < 2 * self.window:
+            return False
+        start = self.count % (2 * self.window)
+        ordered = np.roll(self.buffer, -start)
+        previous = ordered[:self.window].mean()
+        last = ordered[self.window:].mean()
+        if abs(last - previous) <= self.atol + self.rtol * abs(last):
+            self.reason = (f"{self.variable.name} converged to {last:1.4g} "
+                           + f"after {self.count} steps")
+            return True
+        return False
+
+
+class PeriodicSteadyState(StoppingCriterion):
+    """Stops when a variable repeats itself from one period to the next.
+
+    The trajectory over the last period is compared with the trajectory
+    one period earlier. The period is given in steps and does not have to
+    be an integer, e.g., a lunar day with an hourly clock; the earlier
+    trajectory is then linearly interpolated. The test passes when the
+    root mean square difference is at most ``atol + rtol * range``, where
+    ``range`` is the range of the variable over the last period. So it
+    does not depend on the offset of the signal, and the interpolation
+    error at a kink, e.g., sunrise in a clipped irradiance profile, does
+    not block it.
+    """
+
+    def __init__(self,
+                 variable: Variable,
+                 period: Number,
+                 *,
+                 rtol: Number=1e-3,
+                 atol: Number=0.0) -> None:
+        self.variable = variable
+        self.period = period
+        self.n = max(1, int(period))
+        self.rtol = rtol
+        self.atol = atol
+        self.reset()
+
+    @classmethod
+    def from_clock(cls,
+                   variable: Variable,
+                   clock: System,
+                   period: timedelta=LUNAR_DAY,
+                   **kwargs) -> "PeriodicSteadyState":
+        """Use a period given as a duration, by default the lunar day."""
+        return cls(variable, period / get_timestep(clock), **kwargs)
+
+    def reset(self) -> None:
+        self.buffer = np.zeros(self.n + int(np.ceil(self.period)) + 1)
+        self.count = 0
+
+    def update(self) -> bool:
+        size = self.buffer.size
+        self.buffer[self.count % size] = self.variable.value
+        self.count += 1
+        if self.count < size or self.count % self.n:
+            return False
+        ordered = np.roll(self.buffer, -(self.count % size))
+        last = np.arange(size - self.n, size)
+        previous = np.interp(last - self.period, np.arange(size), ordered)
+        current = ordered[last]
+        difference = np.sqrt(np.mean((current - previous) ** 2))
+        if difference <= self.atol + self.rtol * np.ptp(current):
+            self.reason = (f"{self.variable.name} is periodic after "
+                           + f"{self.count / self.period:1.1f} periods")
+            return True
+        return False
+
+
+class Threshold(StoppingCriterion):
+    """Stops when a variable leaves ``[lower, upper]``."""
+
+    def __init__(self,
+                 variable: Variable,
+                 *,
+                 lower: Number=None,
+                 upper: Number=None) -> None:
+        self.variable = variable
+        self.lower = lower
+        self.upper = upper
+
+    def update(self) -> bool:
+        value = self.variable.value
+        if self.lower is not None and np.any(value < self.lower):
+            self.reason = f"{self.variable.name} fell below {self.lower}"
+            return True
+        if self.upper is not None and np.any(value > self.upper):
+            self.reason = f"{self.variable.name} exceeded {self.upper}"
+            return True
+        return False
+
+
+class Predicate(StoppingCriterion):
+    """Stops when a function without arguments returns ``True``."""
+
+    def __init__(self, predicate: Callable[[], bool], reason: str="terminal condition") -> None:
+        self.predicate = predicate
+        self.message = reason
+
+    def update(self) -> bool:
+        if self.predicate():
+            self.reason = self.message
+            return True
+        return False
+
+
+def run_until(simulator,
+              criteria: Sequence[StoppingCriterion],
+              max_steps: int,
+              *,
+              savers: Sequence=()) -> Tuple[int, str]:
+    """Step a ``Simulator`` (or a ``System``) until a criterion fires.
+
+    Every step runs ``forward()``, saves, checks all criteria and then runs
+    ``transition()``. Returns the number of steps taken and the reason for
+    stopping.
+    """
+    for criterion in criteria:
+        criterion.reset()
+    for step in range(1, max_steps + 1):
+        simulator.forward()
+        for saver in savers:
+            saver.save()
+        fired = [c for c in criteria if c.update()]
+        simulator.transition()
+        if fired:
+            return step, "; ".join(c.reason for c in fired)
+    return max_steps, "reached max_steps"
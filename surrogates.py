@@ -0,0 +1,183 @@
+"""Surrogate models for expensive functions
+
+Record the inputs and outputs of a function during a regular run, fit a
+cheap emulator and swap it in place of the original body of the function.
+The graph is not touched: the function keeps its parents and children,
+so the rest of the system does not notice the swap:
+
+    recorder = SurrogateRecorder(sys.thermal.f_heat)
+    for i in range(n_steps):
+        sys.forward()
+        sys.transition()
+    recorder.stop()
+
+    surrogate = PolynomialSurrogate(degree=2).fit(recorder.X, recorder.Y)
+    swap = SurrogateSwap(sys.thermal.f_heat, surrogate, validate=True)
+    ...                # run as usual, the surrogate is used
+    swap.errors()      # accuracy against the original on this run
+    swap.restore()
+
+Any object with ``fit(X, Y)`` and ``predict(X)``, e.g., a scikit-learn
+Gaussian process or MLP, can be used instead of ``PolynomialSurrogate``.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["PolynomialSurrogate", "SurrogateRecorder", "SurrogateSwap",
+           "get_subsystem_functions"]
+
+
+import itertools
+from numbers import Number
+from typing import Dict, List
+
+import numpy as np
+
+from cdcm import *
+from dag_utils import get_functions
+
+
+def get_subsystem_functions(system: System, subsystem_path: str) -> List[Function]:
+    """All functions of ``system`` whose path starts with ``subsystem_path``."""
+    prefix = subsystem_path.rstrip("/") + "/"
+    return [func for path, func in get_functions(system) if path.startswith(prefix)]
+
+
+def _flatten(values) -> np.ndarray:
+    return np.concatenate([np.ravel(np.asarray(v, dtype=float)) for v in values])
+
+
+class PolynomialSurrogate:
+    """Ridge regression on all monomials of the inputs up to ``degree``."""
+
+    def __init__(self, degree: int=2, alpha: Number=1e-8) -> None:
+        self.degree = degree
+        self.alpha = alpha
+        self.terms = None
+        self.coefficients = None
+
+    def _features(self, X: np.ndarray) -> np.ndarray:
+        Z = (X - self.mean) / self.scale
+        columns = [np.ones(len(Z))]
+        for term in self.terms:
+            columns.append(np.prod(Z[:, term], axis=1))
+        return np.column_stack(columns)
+
+    def fit(self, X: np.ndarray, Y: np.ndarray):
+        X = np.asarray(X, dtype=float)
+        Y = np.asarray(Y, dtype=float)
+        self.mean = X.mean(axis=0)
+        self.scale = np.where(X.std(axis=0) > 0.0, X.std(axis=0), 1.0)
+        self.terms = [list(term) for d in range(1, self.degree + 1)
+                      for term in itertools.combinations_with_replacement(range(X.shape[1]), d)]
+        F = self._features(X)
+        A = F.T @ F + self.alpha * np.eye(F.shape[1])
+        self.coefficients = np.linalg.solve(A, F.T @ Y)
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self._features(np.atleast_2d(X)) @ self.coefficients
+
+
+class SurrogateRecorder:
+    """Records the input/output pairs of a function.
+
+    The inputs are the values of the parents of the function and the
+    outputs are the values it writes to its children, both flattened.
+    """
+
+    def __init__(self, function: Function) -> None:
+        self.function = function
+        self.original = function.func
+        self._X = []
+        self._Y = []
+        self.output_shapes = None
+
+        def recording(*values):
+            out = self.original(*values)
+            outputs = out if len(function.children) > 1 else (out,)
+            if self.output_shapes is None:
+                self.output_shapes = [np.shape(o) for o in outputs]
+            self._X.append(_flatten(values))
+            self._Y.append(_flatten(outputs))
+            return out
+
+        function.func = recording
+
+    @property
+    def X(self) -> np.ndarray:
+        return np.array(self._X)
+
+    @property
+    def Y(self) -> np.ndarray:
+        return np.array(self._Y)
+
+    def stop(self) -> None:
+        """Put the original function back."""
+        self.function.func = self.original
+
+
+class SurrogateSwap:
+    """Replaces the body of a function with a fitted surrogate.
+
+    Arguments:
+        function      -- The function to replace.
+        surrogate     -- A fitted model with ``predict(X)``.
+        output_shapes -- The shapes of the outputs, as recorded by the
+                         ``SurrogateRecorder``. By default all scalars.
+        validate      -- Also evaluate the original function at every call and
+                         keep track of the error of the surrogate.
+    """
+
+    def __init__(self,
+                 function: Function,
+                 surrogate,
+                 *,
+                 output_shapes=None,
+                 validate: bool=False) -> None:
+        self.function = function
+        self.original = function.func
+        self.surrogate = surrogate
+        self.output_shapes = output_shapes or [()] * len(function.children)
+        self.validate = validate
+        self._errors = []
+        self._references = []
+
+        sizes = [int(np.prod(s)) for s in self.output_shapes]
+        splits = np.cumsum(sizes)[:-1]
+
+        def emulated(*values):
+            y = np.ravel(self.surrogate.predict(_flatten(values)[None, :]))
+            if self.validate:
+                out = self.original(*values)
+                reference = _flatten(out if len(function.children) > 1 else (out,))
+                self._errors.append(y - reference)
+                self._references.append(reference)
+            outputs = [part.reshape(s) if s else part[0]
+                       for part, s in zip(np.split(y, splits), self.output_shapes)]
+            return tuple(outputs) if len(outputs) > 1 else outputs[0]
+
+        function.func = emulated
+
+    def errors(self) -> Dict[str, np.ndarray]:
+        """RMSE, maximum absolute error and R^2 of each output on the validation run."""
+        if not self._errors:
+            raise RuntimeError("No validation data; build the swap with validate=True.")
+        E = np.array(self._errors)
+        R = np.array(self._references)
+        variance = R.var(axis=0)
+        return {
+            "rmse": np.sqrt(np.mean(E ** 2, axis=0)),
+            "max_abs_error": np.max(np.abs(E), axis=0),
+            "r2": 1.0 - np.mean(E ** 2, axis=0) / np.where(variance > 0.0, variance, np.nan),
+        }
+
+    def restore(self) -> None:
+        """Put the original function back."""
+        self.function.func = self.original
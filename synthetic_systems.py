@@ -0,0 +1,130 @@
+"""Synthetic coupled systems for scaling tests
+
+Builds random but reproducible systems that look like habitat models:
+leaf subsystems with chains of variables and states, nested into groups,
+and coupled to each other with the placeholder + ``replace()`` pattern of
+``sys1``/``sys2``. Only states are read across subsystems, so the forward
+pass has no algebraic loops:
+
+    sys = make_synthetic_system(100_000, n_subsystems=64, depth=3,
+                                state_fraction=0.2, coupling=0.05, seed=1)
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["make_synthetic_system"]
+
+
+from numbers import Number
+
+import numpy as np
+
+from cdcm import *
+
+
+def _transition(x, *inputs):
+    return 0.99 * x + 0.01 * sum(inputs) / max(1, len(inputs))
+
+
+def _emission(rate, *inputs):
+    return rate * sum(inputs) / max(1, len(inputs))
+
+
+def make_synthetic_system(n_nodes: int,
+                          *,
+                          n_subsystems: int=4,
+                          depth: int=1,
+                          fan_in: int=2,
+                          max_fan_out: int=None,
+                          state_fraction: Number=0.3,
+                          coupling: Number=0.1,
+                          name: str="synthetic",
+                          seed: int=0) -> System:
+    """Make a random coupled system with about ``n_nodes`` nodes.
+
+    Arguments:
+        n_nodes        -- The approximate number of variables, parameters
+                          and functions.
+        n_subsystems   -- The number of leaf subsystems.
+        depth          -- The nesting depth; leaf subsystems are grouped
+                          pairwise into ``depth - 1`` levels of systems.
+        fan_in         -- The number of inputs of every function.
+        max_fan_out    -- The maximum number of functions reading a variable
+                          within a subsystem. Unlimited by default.
+        state_fraction -- The fraction of variables that are states.
+        coupling       -- The probability that an input is a state of
+                          another subsystem.
+        seed           -- Everything is drawn from a generator with this seed.
+    """
+    rng = np.random.default_rng(seed)
+    n_variables = max(n_subsystems, (n_nodes - n_subsystems) // 2)
+    per_subsystem = np.full(n_subsystems, n_variables // n_subsystems)
+    per_subsystem[:n_variables % n_subsystems] += 1
+
+    leaves = []
+    states = []
+    placeholders = []
+    for s, size in enumerate(per_subsystem):
+        rate = Parameter(name="rate", value=float(rng.uniform(0.5, 1.5)), units="1/s")
+        variables = []
+        readers = []
+        # Indices of the variables that can still be read
+        open_ = []
+        nodes = [rate]
+        own_states = []
+        for i in range(size):
+            is_state = rng.random() < state_fraction
+            inputs = []
+            picked = set()
+            for _ in range(fan_in):
+                if rng.random() < coupling and n_subsystems > 1:
+                    placeholder = Variable(name=f"placeholder{len(placeholders)}",
+                                           value=0.0, units="")
+                    placeholders.append((s, placeholder))
+                    inputs.append(placeholder)
+                elif len(picked) < len(open_):
+                    k = int(rng.integers(len(open_)))
+                    while open_[k] in picked:
+                        k = int(rng.integers(len(open_)))
+                    j = open_[k]
+                    picked.add(j)
+                    inputs.append(variables[j])
+                    readers[j] += 1
+                    if max_fan_out is not None and readers[j] >= max_fan_out:
+                        open_[k] = open_[-1]
+                        open_.pop()
+            if is_state:
+                node = State(name=f"x{i}", value=float(rng.normal()), units="")
+                func = Function(name=f"f{i}", func=_transition,
+                                parents=[node] + inputs, children=node)
+                own_states.append(node)
+            else:
+                node = Variable(name=f"v{i}", value=0.0, units="")
+                func = Function(name=f"g{i}", func=_emission,
+                                parents=[rate] + inputs, children=node)
+            open_.append(len(variables))
+            variables.append(node)
+            readers.append(0)
+            nodes += [node, func]
+        states.append(own_states)
+        leaves.append(System(name=f"sub{s}", nodes=nodes))
+
+    # Connect the placeholders to states of other subsystems
+    for s, placeholder in placeholders:
+        others = [t for t in range(n_subsystems) if t != s and states[t]]
+        if not others:
+            continue
+        t = others[int(rng.integers(len(others)))]
+        replace(placeholder, states[t][int(rng.integers(len(states[t])))])
+
+    groups = leaves
+    for level in range(depth - 1):
+        groups = [System(name=f"group{level}_{g}", nodes=groups[i:i + 2])
+                  for g, i in enumerate(range(0, len(groups), 2))]
+    return System(name=name, nodes=groups)
@@ -0,0 +1,90 @@
+"""Simulate only the part of a system that some target variables depend on
+
+The slice is the closure of the targets over their ancestors across time,
+i.e., including the functions that update the states they read. Stepping
+the slice gives the targets exactly the values of a full simulation:
+
+    soc = slice_system(hab, targets=[hab.power.soc])
+    recorder = soc.recorder()
+    for i in range(n_steps):
+        soc.forward()
+        recorder.record()
+        soc.transition()
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["SystemSlice", "slice_system"]
+
+
+from typing import Sequence, Union
+
+from cdcm import *
+from dag_utils import get_dag_index
+from output_backends import OutputBackend, StreamingSaver
+from trajectory_recorder import TrajectoryRecorder
+
+
+class SystemSlice:
+    """The reduced forward/transition plan of a system for some targets.
+
+    Arguments:
+        system  -- The full system. It is not modified.
+        targets -- The variables (or their paths) to keep correct.
+    """
+
+    def __init__(self,
+                 system: System,
+                 targets: Sequence[Union[Variable, str]]) -> None:
+        self.system = system
+        dag = get_dag_index(system)
+        target_indices = dag.locate(targets)
+        keep = set(dag.ancestor_indices(target_indices).tolist())
+        keep.update(target_indices.tolist())
+        order = [i for i in dag.topological_indices().tolist() if i in keep]
+        self.targets = [dag.nodes[i] for i in target_indices]
+        self.plan = [dag.nodes[i] for i in order if isinstance(dag.nodes[i], Function)]
+        self.paths = [dag.paths[i] for i in sorted(keep)
+                      if isinstance(dag.nodes[i], Variable)]
+        self.variables = [dag.nodes[dag.by_path[p]] for p in self.paths]
+        in_plan = {id(func) for func in self.plan}
+        self.states = [v for v in self.variables if isinstance(v, State)
+                       and any(id(w) in in_plan for w in v.parents)]
+        self.n_functions = sum(isinstance(node, Function) for node in dag.nodes)
+
+    def forward(self) -> None:
+        for func in self.plan:
+            func.forward()
+
+    def transition(self) -> None:
+        for state in self.states:
+            state.transition()
+
+    def recorder(self, **kwargs) -> TrajectoryRecorder:
+        """A ``TrajectoryRecorder`` of the tracked variables of the slice."""
+        return TrajectoryRecorder(self.system, self._tracked(), **kwargs)
+
+    def saver(self, backend: OutputBackend, **kwargs) -> StreamingSaver:
+        """A ``StreamingSaver`` of the tracked variables of the slice."""
+        return StreamingSaver(self.system, backend, nodes=self._tracked(), **kwargs)
+
+    def _tracked(self):
+        return [p for p, v in zip(self.paths, self.variables)
+                if getattr(v, "track", True)]
+
+    def __str__(self) -> str:
+        return (f"SystemSlice(system={self.system.name}, targets={len(self.targets)}, "
+                + f"functions={len(self.plan)}/{self.n_functions}, "
+                + f"variables={len(self.variables)})")
+
+
+def slice_system(system: System,
+                 targets: Sequence[Union[Variable, str]]) -> SystemSlice:
+    """Make the ``SystemSlice`` of ``system`` that keeps ``targets`` correct."""
+    return SystemSlice(system, targets)
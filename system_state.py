@@ -0,0 +1,37 @@
+"""Snapshots of the values of a system
+
+A snapshot maps the path of every variable of a system to a copy of its
+value. Restoring a snapshot puts the system back to where it was, which
+lets many runs start from the same warmed-up state without rebuilding
+the system.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["get_snapshot", "set_snapshot"]
+
+
+import copy
+from typing import Any, Dict
+
+from cdcm import *
+from dag_utils import iter_nodes
+
+
+def get_snapshot(system: System) -> Dict[str, Any]:
+    """Copy the values of all variables of a system."""
+    return {path: copy.deepcopy(node.value) for path, node in iter_nodes(system)
+            if isinstance(node, Variable)}
+
+
+def set_snapshot(system: System, snapshot: Dict[str, Any]) -> None:
+    """Restore the values of a system from a snapshot."""
+    for path, node in iter_nodes(system):
+        if path in snapshot:
+            node.value = copy.deepcopy(snapshot[path])
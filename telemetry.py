@@ -0,0 +1,260 @@
+"""Live telemetry of a running simulation
+
+``Telemetry`` steps a ``Simulator`` (or a ``System``) and, every
+``sample_every`` steps, measures and exports:
+
+* the steps per second since the last sample,
+* the time spent in the functions of each subsystem,
+* the number of pending events,
+* the fill of the saver buffers,
+* the resident and the peak resident memory of the process.
+
+Only the sampled steps are instrumented, so the other steps run at full
+speed:
+
+    telemetry = Telemetry(simulator, sample_every=1000,
+                          exporters=[PrometheusExporter(port=9109),
+                                     JSONLinesExporter("run17.jsonl")],
+                          savers=[saver])
+    for i in range(n_steps):
+        telemetry.forward()
+        saver.save()
+        telemetry.transition()
+    telemetry.close()
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["MetricsExporter", "JSONLinesExporter", "PrometheusExporter", "Telemetry"]
+
+
+import abc
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from numbers import Number
+from typing import Dict, Optional, Sequence
+
+from dag_utils import get_functions
+
+
+class MetricsExporter(abc.ABC):
+    """Interface of the exporters.
+
+    ``export()`` receives a dictionary of metric names to numbers, or to
+    dictionaries of label values to numbers for labelled metrics.
+    """
+
+    @abc.abstractmethod
+    def export(self, metrics: Dict) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JSONLinesExporter(MetricsExporter):
+    """Appends one JSON object per sample to a file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = open(path, "a")
+
+    def export(self, metrics: Dict) -> None:
+        self.file.write(json.dumps(metrics) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class PrometheusExporter(MetricsExporter):
+    """Serves the last sample in the Prometheus text format.
+
+    The server runs on a daemon thread and only listens on ``host``, i.e.,
+    on localhost by default. Metric names are prefixed with ``prefix``.
+    """
+
+    def __init__(self,
+                 port: int=9109,
+                 *,
+                 host: str="127.0.0.1",
+                 prefix: str="cdcm_") -> None:
+        self.prefix = prefix
+        self.text = b""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.end_headers()
+                self.wfile.write(exporter.text)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def export(self, metrics: Dict) -> None:
+        lines = []
+        for name, value in metrics.items():
+            if isinstance(value, dict):
+                label = "subsystem" if name == "subsystem_seconds" else "name"
+                lines += [f'{self.prefix}{name}{{{label}="{k}"}} {v}' for k, v in value.items()]
+            elif isinstance(value, Number):
+                lines.append(f"{self.prefix}{name} {value}")
+        self.text = ("\n".join(lines) + "\n").encode()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _resident_memory() -> Optional[int]:
+    """The resident memory of the process in bytes, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _peak_resident_memory() -> Optional[int]:
+    """The peak resident memory of the process in bytes, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # In kilobytes, except on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Telemetry:
+    """Samples performance metrics of a simulation and exports them.
+
+    Arguments:
+        simulator    -- A ``Simulator`` or a ``System``.
+        exporters    -- The ``MetricsExporter`` objects that get every sample.
+        sample_every -- The number of steps between samples.
+        savers       -- Savers whose buffer fill is reported, e.g.,
+                        ``StreamingSaver`` objects. Savers without a
+                        ``buffer`` and ``batch_size`` are not reported.
+        depth        -- The depth of the subsystem paths the function times
+                        are summed over, e.g., 2 for ``/habitat/power``.
+    """
+
+    def __init__(self,
+                 simulator,
+                 *,
+                 exporters: Sequence[MetricsExporter]=(),
+                 sample_every: int=1000,
+                 savers: Sequence=(),
+                 depth: int=2) -> None:
+        self.simulator = simulator
+        self.system = getattr(simulator, "system", simulator)
+        self.exporters = list(exporters)
+        self.sample_every = sample_every
+        self.savers = list(savers)
+        self.functions = [(func, "/".join(path.split("/")[:depth + 1]))
+                          for path, func in get_functions(self.system)]
+        self.steps = 0
+        self.last_steps = 0
+        self.last_time = time.perf_counter()
+        self.metrics = {}
+
+    def forward(self) -> None:
+        if (self.steps + 1) % self.sample_every:
+            self.simulator.forward()
+        else:
+            self._timed_forward()
+
+    def transition(self) -> None:
+        self.simulator.transition()
+        self.steps += 1
+        if self.steps % self.sample_every == 0:
+            self.sample()
+
+    def _timed_forward(self) -> None:
+        self.times = defaultdict(float)
+        originals = []
+        for func, subsystem in self.functions:
+            originals.append(func.func)
+            func.func = self._timed(func.func, subsystem)
+        try:
+            self.simulator.forward()
+        finally:
+            for (func, _), original in zip(self.functions, originals):
+                func.func = original
+
+    def _timed(self, original, subsystem: str):
+        times = self.times
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                times[subsystem] += time.perf_counter() - start
+
+        return timed
+
+    def _saver_fill(self, saver) -> Optional[Number]:
+        """The fill of the buffer of a saver, or None if it has none."""
+        buffer = getattr(saver, "buffer", None)
+        size = getattr(saver, "batch_size", None)
+        if buffer is None or not size:
+            return None
+        return len(buffer) / size
+
+    def sample(self) -> Dict:
+        """Measure the metrics now and hand them to the exporters."""
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        fills = {getattr(s, "name", f"saver{i}"): self._saver_fill(s)
+                 for i, s in enumerate(self.savers)}
+        self.metrics = {
+            "time": time.time(),
+            "steps_total": self.steps,
+            "steps_per_second": (self.steps - self.last_steps) / elapsed if elapsed > 0 else 0.0,
+            "subsystem_seconds": dict(getattr(self, "times", {})),
+            "event_queue_depth": len(getattr(self.simulator, "events", ())),
+            # Savers without a buffer are left out
+            "saver_buffer_fill": {name: fill for name, fill in fills.items()
+                                  if fill is not None},
+        }
+        # Memory metrics that cannot be measured here are left out
+        memory = {"resident_memory_bytes": _resident_memory(),
+                  "peak_resident_memory_bytes": _peak_resident_memory()}
+        self.metrics.update({name: value for name, value in memory.items()
+                             if value is not None})
+        self.last_steps = self.steps
+        self.last_time = now
+        for exporter in self.exporters:
+            exporter.export(self.metrics)
+        return self.metrics
+
+    def close(self) -> None:
+        for exporter in self.exporters:
+            exporter.close()
+
+    def __str__(self) -> str:
+        return (f"Telemetry(system={self.system.name}, sample_every={self.sample_every}, "
+                + f"steps={self.steps}, exporters={len(self.exporters)})")
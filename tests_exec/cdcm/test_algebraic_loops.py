@@ -0,0 +1,93 @@
+"""Test the detection and solution of algebraic loops.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from algebraic_loops import *
+import numpy as np
+
+
+def make_system():
+    with System(name="loop_sys") as sys:
+        clock = make_clock(0.1)
+
+        # A linear loop: a = 0.5 b + 1, b = 0.25 a + 2
+        a = make_node("V:a:0.0")
+        b = make_node("V:b:0.0")
+
+        @make_function(a)
+        def fa(b=b):
+            return 0.5 * b + 1.0
+
+        @make_function(b)
+        def fb(a=a):
+            return 0.25 * a + 2.0
+
+        # A nonlinear loop: c = cos(d), d = c
+        c = make_node("V:c:0.0")
+        d = make_node("V:d:0.0")
+
+        @make_function(c)
+        def fc(d=d):
+            return np.cos(d)
+
+        @make_function(d)
+        def fd(c=c):
+            return c
+
+        # A state driven by the loop, without being part of it
+        x = make_node("S:x:0.0")
+
+        @make_function(x)
+        def fx(x=x, a=a, dt=clock.dt):
+            return x + a * dt
+
+    return sys
+
+
+sys = make_system()
+loops = sorted(sorted(loop) for loop in find_algebraic_loops(sys))
+print(loops)
+assert loops == [["/loop_sys/fa", "/loop_sys/fb"], ["/loop_sys/fc", "/loop_sys/fd"]]
+
+# Known solutions
+a = 2.0 / 0.875
+b = 0.25 * a + 2.0
+dottie = 0.7390851332151607
+
+for method in ["newton", "fixed_point"]:
+    sys = make_system()
+    executor = AlgebraicLoopExecutor(sys, method=method, max_iter=200)
+    print(executor)
+    for i in range(10):
+        executor.forward()
+        print(f"{method}: a = {sys.a.value:1.6f}, b = {sys.b.value:1.6f}, "
+              + f"c = {sys.c.value:1.6f}, x = {sys.x.value:1.4f}")
+        executor.transition()
+    assert abs(sys.a.value - a) < 1e-8
+    assert abs(sys.b.value - b) < 1e-8
+    assert abs(sys.c.value - dottie) < 1e-8
+    assert abs(sys.d.value - dottie) < 1e-8
+    # x is updated with a in every step
+    assert abs(sys.x.value - 10 * 0.1 * a) < 1e-8
+
+# Starting at the solution, the finite-difference Jacobian does not leave
+# the perturbed values behind
+for method in ["newton", "fixed_point"]:
+    sys = make_system()
+    sys.a.value, sys.b.value = a, b
+    sys.c.value, sys.d.value = dottie, dottie
+    executor = AlgebraicLoopExecutor(sys, method=method)
+    executor.forward()
+    print(f"{method}: a - a* = {sys.a.value - a:.1e}, b - b* = {sys.b.value - b:.1e}")
+    assert abs(sys.a.value - a) < 1e-12
+    assert abs(sys.b.value - b) < 1e-12
+    assert abs(sys.c.value - dottie) < 1e-12
+    assert abs(sys.d.value - dottie) < 1e-12
@@ -0,0 +1,137 @@
+"""Test the asyncio interface of the simulator.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import asyncio
+
+from cdcm import *
+from async_simulator import *
+import numpy as np
+
+
+def make_system():
+    with System(name="cosim") as sys:
+        clock = make_clock(1.0)
+        u = make_node("P:u:0.0:W")
+        E = make_node("S:E:0.0:J")
+
+        @make_function(E)
+        def f_E(E=E, u=u, dt=clock.dt):
+            return E + u * dt
+
+    return sys
+
+
+def make_data_system(n_rows):
+    with System(name="cosim") as sys:
+        clock = make_clock(1.0)
+        sensors = DataSystem(
+            data=np.column_stack([-np.arange(n_rows), 100.0 + np.arange(n_rows)]),
+            name="sensors",
+            columns=["u", "v"],
+            column_units=["W", ""],
+            column_descriptions=["power", "other"]
+        )
+        E = make_node("S:E:0.0:J")
+
+        @make_function(E)
+        def f_E(E=E, u=sensors.u, dt=clock.dt):
+            return E + u * dt
+
+    return sys
+
+
+async def slow_rows(rows, delay):
+    for row in rows:
+        await asyncio.sleep(delay)
+        yield row
+
+
+async def main():
+    # Every row of a queue ends up in the state
+    sys = make_system()
+    queue = asyncio.Queue()
+    for value in [1.0, 2.0, 3.0]:
+        queue.put_nowait(value)
+    sim = AsyncSimulator(sys, feeds=[AsyncDataFeed([sys.u], queue)])
+    assert await sim.run(3) == 3
+    print(sim, sys.E.value)
+    assert sys.E.value == 6.0
+
+    # A slow source misses steps, but no row is lost on a timeout
+    sys = make_system()
+    feed = AsyncDataFeed([sys.u], slow_rows([1.0, 10.0, 100.0], 0.05), timeout=0.01)
+    sim = AsyncSimulator(sys, feeds=[feed])
+    seen = []
+
+    @sim.on_forward
+    def record():
+        seen.append(sys.u.value)
+
+    await sim.run(100, until=lambda: feed.exhausted)
+    print(f"missed {feed.missed} steps, u = {seen}")
+    assert feed.missed > 0
+    assert [u for i, u in enumerate(seen) if i == 0 or u != seen[i - 1]] == [0.0, 1.0, 10.0, 100.0]
+    # u is held between the rows
+    assert sys.E.value == sum(seen)
+
+    # Timed events and two simulators on one loop
+    a, b = make_system(), make_system()
+    sim_a = AsyncSimulator(a, feeds=[AsyncDataFeed([a.u], slow_rows([1.0] * 5, 0.0))])
+    sim_b = AsyncSimulator(b)
+
+    async def switch_on():
+        b.u.value = 2.0
+
+    sim_b.add_event(2.0, switch_on)
+    assert await run_concurrently([sim_a, sim_b], 5) == [5, 5]
+    print(a.E.value, b.E.value)
+    assert a.E.value == 5.0
+    assert b.E.value == 2.0 * 3
+
+    # Variables written by functions would be overwritten by forward()
+    sys = make_system()
+    try:
+        AsyncDataFeed([sys.E], queue)
+        assert False
+    except ValueError as e:
+        print(e)
+    feed = AsyncDataFeed([sys.u], slow_rows([1.0], 1.0), timeout=0.0)
+    await feed.update()
+    feed.close()
+    assert feed.missed == 1
+
+    # The columns of a DataSystem come from the feed instead of the data
+    sys = make_data_system(10)
+    queue = asyncio.Queue()
+    for value in [1.0, 2.0, 3.0, 4.0]:
+        queue.put_nowait(value)
+    feed = AsyncDataFeed(sys.sensors, queue, columns=["u"])
+    assert feed.variables == [sys.sensors.u]
+    sim = AsyncSimulator(sys, feeds=[feed])
+    assert await sim.run(4) == 4
+    print(sys.E.value, sys.sensors.v.value)
+    assert sys.E.value == 10.0
+    # The other column is still read from the recorded data
+    assert 100.0 <= sys.sensors.v.value < 110.0
+    feed.close()
+
+    # All columns at once, for longer than the two recorded rows
+    sys = make_data_system(2)
+    feed = AsyncDataFeed(sys.sensors, slow_rows([(1.0, 10.0), (2.0, 20.0)], 0.0))
+    assert feed.variables == [sys.sensors.u, sys.sensors.v]
+    sim = AsyncSimulator(sys, feeds=[feed])
+    await sim.run(5)
+    assert sys.E.value == 1.0 + 4 * 2.0
+    assert sys.sensors.v.value == 20.0
+    feed.close()
+
+
+asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Test the cached integer index of the graph of a system.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from dag_utils import *
+from synthetic_systems import make_synthetic_system
+import networkx as nx
+import numpy as np
+
+
+sys = make_synthetic_system(3000, n_subsystems=8, depth=3, coupling=0.2, seed=5)
+dag = get_dag_index(sys)
+print(dag)
+
+# The same edges as the parent and child lists of the nodes
+graph = nx.DiGraph()
+graph.add_nodes_from(id(node) for node in dag.nodes)
+for node in dag.nodes:
+    graph.add_edges_from((id(node), id(c)) for c in node.children if id(c) in graph)
+assert dag.indices.size == graph.number_of_edges()
+
+# Ancestors and descendants across time
+rng = np.random.default_rng(0)
+for i in rng.choice(len(dag), size=50, replace=False):
+    node = dag.nodes[i]
+    # A node is its own ancestor only through a cycle across time
+    assert ({id(n) for n in dag.ancestors(node)} - {id(node)}
+            == nx.ancestors(graph, id(node)))
+    assert ({id(n) for n in dag.descendants(node)} - {id(node)}
+            == nx.descendants(graph, id(node)))
+
+# Within a step, i.e., without the edges into states
+forward = graph.copy()
+forward.remove_edges_from([(u, v) for u, v in graph.edges
+                           if isinstance(dag.nodes[dag.index[v]], State)])
+for i in rng.choice(len(dag), size=50, replace=False):
+    node = dag.nodes[i]
+    assert ({id(n) for n in dag.ancestors(node, across_time=False)}
+            == nx.ancestors(forward, id(node)))
+
+# The forward pass visits every node after the nodes it depends on
+position = {id(node): k for k, node in enumerate(dag.topological_order())}
+assert len(position) == len(dag)
+assert all(position[u] < position[v] for u, v in forward.edges)
+
+# The function queries agree with the ones on plain function lists
+functions = dag.functions
+assert dag.function_dependencies() == get_function_dependencies(functions)
+assert dag.function_levels() == get_function_levels(functions)
+assert dag.strongly_connected_components() == get_strongly_connected_components(functions)
+assert len(dag.function_levels()) == nx.dag_longest_path_length(
+    nx.DiGraph([(j, i) for i, d in dag.function_dependencies().items() for j in d])) + 1
+
+# The cache
+assert get_dag_index(sys) is dag
+with System(name="loop") as loop:
+    a = make_node("V:a:0.0")
+    b = make_node("V:b:0.0")
+
+    @make_function(a)
+    def fa(b=b):
+        return 0.5 * b
+
+first = get_dag_index(loop)
+assert len(first.functions) == 1
+
+# Lookups do not walk the system, so a new function is only seen after
+# the index is invalidated
+with loop:
+    @make_function(b)
+    def fb(a=a):
+        return 0.5 * a
+
+assert get_dag_index(loop) is first
+invalidate_dag_index(loop)
+second = get_dag_index(loop)
+assert second is not first
+assert sorted(second.function_paths) == ["/loop/fa", "/loop/fb"]
+assert second.strongly_connected_components() == [[0, 1]]
+
+# replace() invalidates the index, even if the counts were the same
+c = make_node("V:c:1.0")
+loop.nodes.append(c)
+invalidate_dag_index(loop)
+third = get_dag_index(loop)
+replace(b, c)
+fourth = get_dag_index(loop)
+assert fourth is not third
+assert "c" in [n.name for n in fourth.ancestors(a, across_time=False)]
@@ -0,0 +1,94 @@
+"""Test the typed multi-column data tables.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from data_tables import *
+from replay import DataReplay
+import numpy as np
+
+
+n_rows = 48
+records = np.empty(n_rows, dtype=[("Q", np.float32), ("counts", np.int16),
+                                  ("dusty", np.bool_)])
+records["Q"] = 1361.0 * np.clip(np.sin(2 * np.pi * np.arange(n_rows) / 24), 0, None)
+records["counts"] = np.arange(n_rows) % 7
+records["dusty"] = np.arange(n_rows) % 5 == 0
+
+# The homogeneous block promotes everything to float32
+columns, block = to_column_block(records)
+print(columns, block.dtype, block.shape)
+assert columns == ["Q", "counts", "dusty"]
+assert block.dtype == np.float32 and block.shape == (n_rows, 3)
+
+# The record block keeps the dtype of each column in 7 bytes per row
+table = to_record_block(records)
+print(table.dtype, table.dtype.itemsize)
+assert [table.dtype[c] for c in columns] == [np.float32, np.int16, np.bool_]
+assert table.dtype.itemsize == 4 + 2 + 1
+assert table.nbytes == 7 * n_rows
+
+# Dictionaries, data frames and a common dtype
+table = to_record_block({"a": np.arange(3), "b": np.ones(3)}, dtype=np.float32)
+assert table.dtype == np.dtype([("a", np.float32), ("b", np.float32)])
+try:
+    import pandas as pd
+    frame = pd.DataFrame({"x": [1, 2], "y": [0.5, 1.5]})
+    table = to_record_block(frame, ["y"])
+    assert table.dtype.names == ("y",) and table["y"].tolist() == [0.5, 1.5]
+except ImportError:
+    pass
+for bad, error in [(({"a": np.ones(2)}, ["b"]), ValueError), (([1, 2], None), TypeError)]:
+    try:
+        to_record_block(*bad)
+        assert False
+    except error:
+        pass
+
+# One row fetch per step populates all the columns
+with System(name="habitat") as hab:
+    env = make_data_system(records, name="env",
+                           column_units={"Q": "W/m^2"},
+                           column_descriptions={"counts": "Radiation counts."})
+    exposure = make_node("S:exposure:0.0:J/m^2")
+
+    @make_function(exposure)
+    def f_exposure(exposure=exposure, Q=env.Q, dusty=env.dusty):
+        return exposure + (0.5 if dusty else 1.0) * Q * 3600.0
+
+print(env.Q.units, env.counts.description)
+assert env.Q.units == "W/m^2" and env.counts.description == "Radiation counts."
+assert len(env) == n_rows
+for i in range(n_rows):
+    hab.forward()
+    assert env.Q.value == records["Q"][i]
+    assert env.counts.value == records["counts"][i]
+    assert env.dusty.value == records["dusty"][i]
+    hab.transition()
+scale = np.where(records["dusty"], 0.5, 1.0)
+expected = (scale * records["Q"].astype(float) * 3600.0).sum()
+print(f"exposure = {exposure.value:1.6e} J/m^2, expected = {expected:1.6e} J/m^2")
+assert abs(exposure.value - expected) <= 1e-9 * expected
+
+# The replay reads the same record block
+with System(name="habitat") as hab:
+    env = make_data_system(records, name="env")
+    exposure = make_node("S:exposure:0.0:J/m^2")
+
+    @make_function(exposure)
+    def f_exposure(exposure=exposure, Q=env.Q, dusty=env.dusty):
+        return exposure + (0.5 if dusty else 1.0) * Q * 3600.0
+
+replay = DataReplay(hab, env, env.columns)
+print(replay)
+assert replay.driving == [0, 2]
+assert replay.run() == n_rows
+assert abs(exposure.value - expected) <= 1e-9 * expected
+assert env.counts.value == records["counts"][-1]
@@ -0,0 +1,101 @@
+"""Test the exterior environment derived from one ephemeris query.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from datetime import datetime, timedelta
+
+from cdcm import *
+from exterior_variables import *
+import exterior_variables
+import numpy as np
+
+
+# A synthetic ephemeris: one day of 24 hours with sunlight, one without
+calls = []
+
+
+def get_insolation_ephemeris(start_time, end_time, step_size, phi, lamda, alpha, beta):
+    calls.append((start_time, end_time, step_size, phi, lamda))
+    start = datetime.fromisoformat(start_time)
+    end = datetime.fromisoformat(end_time)
+    hours = np.arange((end - start) // timedelta(hours=1) + 1)
+    return {"Q": np.clip(1300.0 * np.sin(2.0 * np.pi * hours / 48.0), 0.0, None)}
+
+
+exterior_variables.get_insolation_ephemeris = get_insolation_ephemeris
+exterior_variables._query_irradiance.cache_clear()
+SIGMA = exterior_variables.SIGMA
+
+
+# A constant absorbed flux heats the surface to the equilibrium
+# q = emissivity * SIGMA * T^4 + G * (T - T_deep)
+dt = timedelta(hours=1)
+T = get_surface_temperature(np.full(5000, 600.0), dt, conductance=0.0)
+print(T[[0, 10, 100, -1]])
+assert T[0] == 250.0
+assert np.all(np.diff(T) >= 0.0)
+assert np.isclose(0.95 * SIGMA * T[-1] ** 4, 600.0)
+
+# Without sunlight the surface radiates below the deep regolith temperature
+T = get_surface_temperature(np.zeros(100), dt, initial_temperature=350.0)
+print(T[-1])
+assert np.all(np.diff(T) < 0.0) and T[-1] < 250.0
+
+with System(name="hab") as hab:
+    clock = make_clock(dt=1, units="hr")
+
+start_time = datetime(2026, 1, 1)
+env = ExteriorEnvironment("env", clock, start_time, 24 * 30, lat=-89.5, long=0.0)
+print(env)
+assert env.dt == timedelta(hours=1)
+assert env.end_time == start_time + timedelta(hours=24 * 30 - 1)
+
+# The same query again is answered from the cache
+Q = get_irradiance(clock, start_time, 24 * 30, lat=-89.5, long=0.0)
+assert len(calls) == 1
+assert calls[0] == ("2026-01-01T00:00:00", "2026-01-30T23:00:00", "1hr", -89.5, 0.0)
+assert len(Q) == 24 * 30
+
+channels = get_environment_channels(Q, env.dt)
+assert list(channels) == ["solar_irradiance", "exterior_temperature",
+                          "regolith_heat_flux", "sun_view_factor"]
+assert np.array_equal(env.data[:, 0], Q)
+assert np.allclose(env.data[:, 1], channels["exterior_temperature"])
+
+# The regolith takes up heat by day and gives it back at night
+hours = np.arange(24 * 30) % 48
+day, night = (hours > 0) & (hours < 24), hours > 24
+assert np.all(Q[day] > 0.0) and np.all(Q[night] == 0.0)
+flux = channels["regolith_heat_flux"]
+print(flux.min(), flux.max())
+assert np.mean(flux[day]) > 0.0
+assert np.all(flux[night] < 0.0)
+# The surface is warmest after noon and coldest at dawn
+T = channels["exterior_temperature"].reshape(-1, 48)[1:]
+assert np.all((np.argmax(T, axis=1) > 12) & (np.argmax(T, axis=1) < 24))
+assert np.all(np.argmin(T, axis=1) <= 1)
+# With short steps, the heat stored in the surface layer is what flows in
+# minus what is conducted to the deep regolith
+minutes = np.arange(4 * 48 * 60) / 60.0
+fine = get_environment_channels(
+    np.clip(1300.0 * np.sin(2.0 * np.pi * minutes / 48.0), 0.0, None),
+    timedelta(minutes=1))
+T = fine["exterior_temperature"]
+stored = 8.5e4 * np.diff(T)
+net = 60.0 * (fine["regolith_heat_flux"][1:] - 0.1 * (T[1:] - 250.0))
+assert np.isclose(np.sum(net), np.sum(stored), rtol=1e-3)
+assert np.all(np.abs(net - stored) < 0.01 * np.max(np.abs(stored)))
+
+# The view factors of vertical walls do not change over time
+assert np.isclose(env.sky_view_factor.value, 0.5)
+assert np.isclose(env.ground_view_factor.value, 0.5)
+flat = ExteriorEnvironment("flat", clock, start_time, 24 * 30, lat=-89.5, wall_tilt=0.0)
+assert len(calls) == 1
+assert flat.sky_view_factor.value == 1.0 and flat.ground_view_factor.value == 0.0
@@ -0,0 +1,85 @@
+"""Test the batched diagnosis over archived observations.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import os
+import tempfile
+
+from cdcm import *
+from fault_index import FaultPropagationIndex
+import numpy as np
+
+
+with System(name="sys") as sys:
+    clock = make_clock(0.1)
+
+    x1 = make_node("S:x1:0.0")
+    x2 = make_node("S:x2:0.0")
+    r1 = make_node("P:r1:1.0")
+    r2 = make_node("P:r2:2.0")
+    y1 = make_node("V:y1")
+    y2 = make_node("V:y2")
+    y3 = make_node("V:y3")
+
+    @make_function(x1)
+    def f1(x1=x1, r1=r1):
+        return x1 + r1
+
+    @make_function(x2)
+    def f2(x2=x2, r2=r2):
+        return x2 + r2
+
+    @make_function(y1)
+    def g1(x1=x1):
+        return x1
+
+    @make_function(y2)
+    def g2(x2=x2):
+        return x2
+
+    @make_function(y3)
+    def g3(x1=x1, x2=x2):
+        return x1 + x2
+
+
+index = FaultPropagationIndex(sys, sensors=[y1, y2, y3], candidates=[x1, x2, r1, r2])
+print(index.candidate_paths)
+print(index.incidence_matrix())
+# Candidates are sorted: r1, r2, x1, x2
+assert np.array_equal(index.incidence_matrix(), [[1, 0, 1, 0],
+                                                 [0, 1, 0, 1],
+                                                 [1, 1, 1, 1]])
+
+# Random anomaly flags, diagnosed in chunks over two processes
+rng = np.random.default_rng(0)
+flags = rng.random((1000, 3)) < 0.3
+batch = index.diagnose_batch(flags, processes=2, chunk_size=128)
+assert batch.shape == (1000, 4)
+
+# The same as the incremental diagnosis, step by step
+for t in range(flags.shape[0]):
+    index.update(dict(zip(index.sensors, flags[t])))
+    expected = [c in index.candidates() for c in index.candidate_paths]
+    assert np.array_equal(batch[t], expected), t
+print(f"{batch.any(axis=1).sum()} of {len(batch)} steps have a single-fault explanation")
+
+# Values outside the bounds are anomalies; here y1 and y3 are off
+values = np.array([[5.0, 0.5, 5.0], [0.5, 0.5, 0.5]])
+batch = index.diagnose_batch(values, lower=0.0, upper=1.0)
+assert np.array_equal(batch, [[1, 0, 1, 0], [0, 0, 0, 0]])
+
+# The same from an archive with one dataset per sensor
+with tempfile.TemporaryDirectory() as root:
+    import h5py
+    filename = os.path.join(root, "archive.h5")
+    with h5py.File(filename, "w") as f:
+        for j, sensor in enumerate(index.sensors):
+            f[sensor] = values[:, j]
+    assert np.array_equal(index.diagnose_batch(filename, lower=0.0, upper=1.0), batch)
@@ -0,0 +1,65 @@
+"""Test a fault-injection campaign against closed-form outcomes.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from fault_campaign import *
+
+
+def build():
+    with System(name="tank") as tank:
+        clock = make_clock(1.0)
+        level = make_node("S:level:0.0:m")
+        inflow = make_node("P:inflow:1.0:m/s")
+
+        @make_function(level)
+        def f(level=level, inflow=inflow, dt=clock.dt):
+            return level + inflow * dt
+
+    return tank
+
+
+def stop_inflow(tank):
+    tank.inflow.value = 0.0
+
+
+def double_inflow(tank):
+    tank.inflow.value *= 2.0
+
+
+def overflow(tank):
+    return tank.level.value >= 40.0
+
+
+if __name__ == "__main__":
+    faults = [Fault("stuck", stop_inflow, step=10), Fault("boost", double_inflow, step=5)]
+    scenarios = enumerate_scenarios(faults, order=2)
+    print(scenarios)
+    assert [[f.name for f in s] for s in scenarios] == [["stuck"], ["boost"], ["stuck", "boost"]]
+
+    # After 5 warm-up steps the level is 5, then 30 more steps at most
+    campaign = FaultCampaign(build, n_steps=30, warmup_steps=5, terminal=overflow,
+                             outputs=["/tank/level"])
+    expected = [
+        {"steps": 30, "terminated": False, "/tank/level": 5.0 + 10.0},
+        # 5 + 5 + 2 * n >= 40 after n = 15 more steps
+        {"steps": 20, "terminated": True, "/tank/level": 40.0},
+        # 5 + 5 + 2 * 5, then stuck
+        {"steps": 30, "terminated": False, "/tank/level": 20.0},
+    ]
+    for processes in [None, 2]:
+        summaries = list(campaign.run(scenarios, processes=processes, chunksize=1))
+        for summary, known in zip(summaries, expected):
+            print(summary)
+            for key, value in known.items():
+                assert summary[key] == value, (summary, key)
+
+    # Sampled scenarios are reproducible
+    assert sample_scenarios(faults, 5, seed=3) == sample_scenarios(faults, 5, seed=3)
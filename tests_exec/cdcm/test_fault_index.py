@@ -0,0 +1,96 @@
+"""Test the incremental diagnosis of the fault-propagation index.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from fault_index import FaultPropagationIndex
+import numpy as np
+
+
+def make_system():
+    clock = make_clock(0.1)
+
+    x1 = make_node("S:x1:0.1:meters")
+    r1 = make_node("P:r1:1.2:meters/second")
+    c1 = make_node("P:c1:0.1:1/meters/second")
+    s1 = make_node("P:s1:0.01:meters")
+    y1 = make_node("V:y1", units="meters")
+    placeholder = make_node("V:placeholder", units="meters")
+
+    @make_function(x1)
+    def f1(x1=x1, r1=r1, c1=c1, x2=placeholder, dt=clock.dt):
+        return x1 + r1 * dt + c1 * x2 * dt
+
+    @make_function(y1)
+    def g1(x1=x1, s1=s1):
+        return x1 + s1 * np.random.randn()
+
+    sys1 = System(name="sys1", nodes=[x1, r1, c1, f1, s1, y1, g1])
+
+    x2 = make_node("S:x2:0.3:meters")
+    r2 = make_node("P:r2:1.2:meters/second")
+    s2 = make_node("P:s2:0.01:meters")
+    y2 = make_node("V:y2", units="meters")
+
+    @make_function(x2)
+    def f2(x2=x2, r2=r2, dt=clock.dt):
+        return x2 + r2 * dt
+
+    @make_function(y2)
+    def g2(x2=x2, s2=s2):
+        return x2 + s2 * np.random.randn()
+
+    sys2 = System(name="sys2", nodes=[x2, r2, f2, s2, y2, g2])
+
+    # sys2 drives sys1, but not the other way around
+    replace(placeholder, x2)
+    return System(name="combined_system", nodes=[clock, sys1, sys2])
+
+
+def own(paths):
+    """Leave out the nodes of the clock."""
+    return sorted(p for p in paths if "/clock/" not in p)
+
+
+sys = make_system()
+sys1, sys2 = sys.sys1, sys.sys2
+index = FaultPropagationIndex(sys, sensors=[sys1.y1, "/combined_system/sys2/y2"])
+print(index)
+
+S1 = "/combined_system/sys1/"
+S2 = "/combined_system/sys2/"
+assert own(index.ancestors(sys2.y2)) == [S2 + "r2", S2 + "s2", S2 + "x2"]
+assert own(index.ancestors(sys1.y1)) == sorted(
+    [S1 + "c1", S1 + "r1", S1 + "s1", S1 + "x1", S2 + "r2", S2 + "x2"])
+assert own(index.descendants(sys2.r2)) == [S1 + "x1", S1 + "y1", S2 + "x2", S2 + "y2"]
+
+# Only y1 is anomalous: everything upstream of y1 explains it
+index.update({sys1.y1: True})
+assert own(index.candidates()) == own(index.ancestors(sys1.y1))
+
+# Both are anomalous: only the common causes in sys2 explain both
+index.update({"/combined_system/sys2/y2": True})
+print(index.candidates())
+assert own(index.candidates()) == [S2 + "r2", S2 + "x2"]
+# The full explanations come first in the ranking
+assert sorted(index.ranking()[:len(index.candidates())]) == index.candidates()
+
+# y1 recovers
+index.update({sys1.y1: False})
+assert own(index.candidates()) == [S2 + "r2", S2 + "s2", S2 + "x2"]
+
+# A variable that is not a sensor is rejected without changing the state
+try:
+    index.update({sys1.y1: True, sys1.x1: True})
+    raise AssertionError("x1 is not a sensor")
+except ValueError as e:
+    print(e)
+assert index.anomalous == {S2 + "y2"}
+assert own(index.candidates()) == [S2 + "r2", S2 + "s2", S2 + "x2"]
@@ -0,0 +1,81 @@
+"""Test the integrators of make_derivative against known solutions.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from integrators import make_derivative
+import numpy as np
+
+
+def simulate(method, n_steps=10, dt=1.0, **options):
+    with System(name="ode_sys") as sys:
+        clock = make_clock(dt)
+
+        # Driven by the clock: dx/dt = cos(t), x(0) = 0, so x(t) = sin(t)
+        x = make_node("S:x:0.0")
+
+        @make_derivative(x, dt=clock.dt, t=clock.t, method=method, **options)
+        def dxdt(x=x, t=clock.t):
+            return np.cos(t)
+
+        # Decay: dy/dt = -omega y, y(0) = 1, so y(t) = exp(-omega t)
+        y = make_node("S:y:1.0")
+        omega = make_node("P:omega:1.0")
+
+        @make_derivative(y, dt=clock.dt, method=method, **options)
+        def dydt(y=y, omega=omega):
+            return -omega * y
+
+    for i in range(n_steps):
+        sys.forward()
+        sys.transition()
+    return sys.clock.t.value, sys.x.value, sys.y.value
+
+
+# The error after 10 steps of length 1. Without the stage times RK4 gives
+# x = 0.42 here, the result of Euler.
+tolerances = {
+    "rk4": (5e-3, 0.25),
+    "rk45": (1e-5, 1e-4),
+}
+
+for method, (tolerance_x, tolerance_y) in tolerances.items():
+    t, x, y = simulate(method)
+    err_x = abs(x - np.sin(t))
+    err_y = abs(y - np.exp(-t)) / np.exp(-t)
+    print(f"{method:>4}: t = {t:1.1f}, x = {x: 1.6f} (sin(t) = {np.sin(t): 1.6f}), "
+          + f"y = {y:1.3e} (exp(-t) = {np.exp(-t):1.3e})")
+    assert err_x < tolerance_x, (method, err_x)
+    assert err_y < tolerance_y, (method, err_y)
+
+# The convergence order of the time-dependent problem
+for method, order in [("euler", 1), ("rk4", 4)]:
+    errors = []
+    for n_steps in [20, 40]:
+        t, x, _ = simulate(method, n_steps=n_steps, dt=10.0 / n_steps)
+        errors.append(abs(x - np.sin(t)))
+    observed = np.log2(errors[0] / errors[1])
+    print(f"{method}: observed order {observed:1.2f}")
+    assert abs(observed - order) < 0.3
+
+# The decay is stable with implicit Euler even for a stiff rate
+with System(name="stiff_sys") as sys:
+    clock = make_clock(1.0)
+    y = make_node("S:y:1.0")
+
+    @make_derivative(y, dt=clock.dt, method="implicit_euler")
+    def dydt(y=y):
+        return -1000.0 * y
+
+for i in range(5):
+    sys.forward()
+    sys.transition()
+print(f"stiff: y = {sys.y.value:1.3e}")
+assert abs(sys.y.value - 1001.0 ** -5) < 1e-18
@@ -0,0 +1,92 @@
+"""Test the pull-based evaluation of variables that no state depends on.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from lazy_evaluation import LazyExecutor
+from trajectory_recorder import TrajectoryRecorder
+import numpy as np
+
+
+calls = {"h": 0, "g": 0}
+
+
+def make_system():
+    with System(name="lazy_sys") as sys:
+        clock = make_clock(0.1)
+        x = make_node("S:x:1.0:m")
+        u = make_node("V:u:0.0:m")
+        y = make_node("V:y:0.0:m")
+        z = make_node("V:z:0.0:m")
+
+        # The state needs u, nothing needs y and z
+        @make_function(u)
+        def f_u(x=x):
+            return 0.5 * x
+
+        @make_function(x)
+        def f_x(x=x, u=u, dt=clock.dt):
+            return x - dt * u
+
+        @make_function(y)
+        def h(x=x):
+            calls["h"] += 1
+            return 2.0 * x
+
+        @make_function(z)
+        def g(y=y):
+            calls["g"] += 1
+            return y + 1.0
+
+    return sys
+
+
+# x(n) = 0.95^n, y = 2 x and z = y + 1
+sys = make_system()
+executor = LazyExecutor(sys)
+print(executor)
+assert sorted(func.name for func in executor.lazy) == ["g", "h"]
+for i in range(10):
+    executor.forward()
+    if i == 4:
+        # Pulled twice, computed once
+        assert np.isclose(executor.pull(sys.z), 2.0 * 0.95 ** 4 + 1.0)
+        assert np.isclose(executor.pull("/lazy_sys/y"), 2.0 * 0.95 ** 4)
+    executor.transition()
+print(calls)
+assert calls == {"h": 1, "g": 1}
+assert abs(sys.x.value - 0.95 ** 10) < 1e-12
+
+# Without a pull the lazy variables are stale
+assert np.isclose(sys.y.value, 2.0 * 0.95 ** 4)
+
+# A recorder with the executor pulls what it records in every step
+sys = make_system()
+executor = LazyExecutor(sys)
+calls.update(h=0, g=0)
+recorder = TrajectoryRecorder(sys, [sys.x, sys.y], executor=executor)
+for i in range(10):
+    executor.forward()
+    recorder.record()
+    executor.transition()
+xs = recorder.to_numpy("/lazy_sys/x")
+ys = recorder.to_numpy("/lazy_sys/y")
+assert np.allclose(xs, 0.95 ** np.arange(10))
+assert np.allclose(ys, 2.0 * xs)
+# z is not recorded, so it is not computed
+assert calls == {"h": 10, "g": 0}
+
+# The observed variables are computed every step
+sys = make_system()
+executor = LazyExecutor(sys, observed=[sys.y])
+assert [func.name for func in executor.lazy] == ["g"]
+executor.forward()
+executor.pull_all()
+assert sys.z.value == 3.0
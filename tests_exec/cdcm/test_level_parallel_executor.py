@@ -0,0 +1,144 @@
+"""Test the level-parallel executor of the forward pass.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from dag_utils import get_functions, get_function_levels, get_initializers
+from parallel_executor import LevelParallelExecutor
+import numpy as np
+
+
+def make_system():
+    with System(name="combined_system") as sys:
+        clock = make_clock(0.1)
+
+        x1 = make_node("S:x1:0.1:meters")
+        x2 = make_node("S:x2:0.3:meters")
+        r = make_node("P:r:1.2:meters/second")
+        s = make_node("P:s:0.01:meters")
+        u1 = make_node("V:u1", units="meters")
+        u2 = make_node("V:u2", units="meters")
+        y1 = make_node("V:y1", units="meters")
+        y2 = make_node("V:y2", units="meters")
+
+        @make_function(u1)
+        def h1(x1=x1, x2=x2):
+            return np.sin(x1) + x2
+
+        @make_function(u2)
+        def h2(x1=x1, x2=x2):
+            return np.cos(x2) - x1
+
+        @make_function(x1)
+        def f1(x1=x1, u1=u1, r=r, dt=clock.dt):
+            return x1 + r * dt - 0.1 * u1 * dt
+
+        @make_function(x2)
+        def f2(x2=x2, u2=u2, r=r, dt=clock.dt):
+            return x2 + 0.5 * r * dt + 0.1 * u2 * dt
+
+        # The emissions draw from the global generator
+        @make_function(y1)
+        def g1(u1=u1, s=s):
+            return u1 + s * np.random.randn()
+
+        @make_function(y2)
+        def g2(u2=u2, s=s):
+            return u2 + s * np.random.randn()
+
+    return sys
+
+
+# The levels: the clock and h1, h2 only read states, the rest read u1, u2
+sys = make_system()
+functions = [f for _, f in get_functions(sys)]
+levels = [sorted(functions[i].name for i in level)
+          for level in get_function_levels(functions)]
+print(levels)
+assert levels[-1] == ["f1", "f2", "g1", "g2"]
+
+# Reference run
+np.random.seed(1)
+for i in range(50):
+    sys.forward()
+    sys.transition()
+reference = [sys.x1.value, sys.x2.value, sys.y1.value, sys.y2.value]
+
+# The executor, with the thread-safe functions dispatched to the pool even
+# though they are cheap. The emissions stay on the calling thread, so they
+# draw their noise in the same order in every run.
+def run_executor(max_workers):
+    sys = make_system()
+    np.random.seed(1)
+    thread_safe = [sys.h1, sys.h2, sys.f1, sys.f2]
+    with LevelParallelExecutor(sys, max_workers=max_workers, task_overhead=0.0,
+                               thread_safe_functions=thread_safe) as executor:
+        for i in range(50):
+            executor.forward()
+            executor.transition()
+        print(executor)
+    return [sys.x1.value, sys.x2.value, sys.y1.value, sys.y2.value]
+
+
+result = run_executor(4)
+print(reference)
+print(result)
+# The states do not depend on the noise
+assert np.array_equal(reference[:2], result[:2])
+for max_workers in [2, 8]:
+    assert np.array_equal(result, run_executor(max_workers))
+
+# A state with an initializer and a transition function, both thread-safe:
+# the initializer only runs in the first step
+calls = {"init_x": 0, "f": 0}
+with System(name="exp_decay") as sys:
+    clock = make_clock(0.01)
+    x = make_node("S:x:0.0:m")
+    mu = make_node("P:mu:1.0:m")
+    omega = make_node("P:omega:-1.3:1/s")
+
+    @make_function(x)
+    def init_x(mu=mu):
+        calls["init_x"] += 1
+        return mu
+
+    @make_function(x)
+    def f(x=x, omega=omega, dt=clock.dt):
+        calls["f"] += 1
+        return x - dt * omega * x
+
+assert [func.name for func in get_initializers([f for _, f in get_functions(sys)])] == ["init_x"]
+with LevelParallelExecutor(sys, max_workers=2, task_overhead=0.0,
+                           thread_safe_functions=[sys.init_x, sys.f]) as executor:
+    for i in range(10):
+        executor.forward()
+        executor.transition()
+print(calls)
+assert calls == {"init_x": 1, "f": 10}
+
+# Two thread-safe functions writing one variable could run concurrently
+with System(name="race") as sys:
+    clock = make_clock(0.1)
+    y = make_node("V:y:0.0")
+
+    @make_function(y)
+    def g1():
+        return 1.0
+
+    @make_function(y)
+    def g2():
+        return 2.0
+
+try:
+    LevelParallelExecutor(sys, thread_safe_functions=[sys.g1, sys.g2])
+    assert False
+except ValueError as e:
+    print(e)
+LevelParallelExecutor(sys, thread_safe_functions=[sys.g1])
@@ -0,0 +1,86 @@
+"""Test the memory footprint helpers of the nodes.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import sys as _sys
+
+from cdcm import *
+from node_memory import *
+
+
+def make_system(n):
+    with System(name="memory_sys") as sys:
+        for i in range(n):
+            # Built strings, one copy per node
+            x = make_node(f"S:x{i}:1.0", units="".join(["me", "ters"]),
+                          description=" ".join(["A", "decaying", "state."]))
+
+            @make_function(x)
+            def f(x=x):
+                return 0.9 * x
+
+    return sys
+
+
+sys = make_system(100)
+sizes = get_node_sizes(sys)
+print(sizes)
+assert sorted(sizes) == ["Function", "State", "System"]
+assert sizes["State"][1] == 100 and sizes["Function"][1] == 100
+assert sizes["System"][1] == 1
+for name, (size, count) in sizes.items():
+    assert size >= _sys.getsizeof(object())
+
+# The units and descriptions share one copy after interning
+assert sys.x0.units is not sys.x1.units
+count = intern_strings(sys)
+print(f"{count} strings interned")
+assert count >= 2 * 100
+assert sys.x0.units is sys.x1.units
+assert sys.x0.description is sys.x99.description
+
+# 201 nodes, each of them takes some memory
+before, n_nodes = measure_bytes_per_node(lambda: make_system(100))
+after, _ = measure_bytes_per_node(lambda: make_system(100), intern=True)
+print(f"{n_nodes} nodes: {before:1.0f} bytes/node, {after:1.0f} bytes/node interned")
+assert n_nodes == 201
+assert sum(size * count for size, count in sizes.values()) <= before * n_nodes
+assert after < before
+
+# Parameters have no parents and unread outputs no children
+def make_sparse_system(n):
+    with System(name="sparse_sys") as sys:
+        for i in range(n):
+            k = make_node(f"P:k{i}:0.5")
+            y = make_node(f"V:y{i}:0.0")
+
+            @make_function(y)
+            def g(k=k):
+                return 2.0 * k
+
+    return sys
+
+
+sys = make_sparse_system(100)
+count = share_empty_links(sys)
+print(f"{count} empty links shared")
+assert count >= 200
+assert sys.k0.parents is sys.y0.children
+assert len(sys.k0.children) == 1 and len(sys.y0.parents) == 1
+sys.forward()
+assert sys.y0.value == 1.0
+assert unshare_empty_links(sys) == count
+assert sys.k0.parents == [] and sys.k0.parents is not sys.k1.parents
+
+before, n_nodes = measure_bytes_per_node(lambda: make_sparse_system(100))
+after, _ = measure_bytes_per_node(lambda: make_sparse_system(100), share_empty=True)
+print(f"{n_nodes} nodes: {before:1.0f} bytes/node, {after:1.0f} bytes/node shared")
+# At least the empty lists are gone
+assert before - after >= count * _sys.getsizeof([]) / n_nodes
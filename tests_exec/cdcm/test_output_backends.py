@@ -0,0 +1,92 @@
+"""Test the streaming saver with all output backends.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import os
+import tempfile
+
+from cdcm import *
+from output_backends import *
+import numpy as np
+
+
+def make_system():
+    with System(name="sys") as sys:
+        clock = make_clock(0.1)
+        x = make_node("S:x:0.0:m")
+        v = State(name="v", value=np.zeros(3), units="m")
+
+        @make_function(x)
+        def f(x=x):
+            return x + 1.0
+
+        @make_function(v)
+        def g(v=v, x=x):
+            return np.array([x, 2 * x, 3 * x])
+
+    return sys
+
+
+def run(backend, n_steps=100, batch_size=16):
+    sys = make_system()
+    with StreamingSaver(sys, backend, batch_size=batch_size,
+                        nodes=["/sys/x", "/sys/v"]) as saver:
+        for i in range(n_steps):
+            sys.forward()
+            saver.save()
+            sys.transition()
+        # 6 full batches are written, the rest on close
+        assert saver.steps_written == 96
+    return saver
+
+
+# x_i = i and v_i = (i - 1) * [1, 2, 3] with v_0 = 0
+xs = np.arange(100.0)
+vs = np.maximum(xs - 1.0, 0.0)[:, None] * np.array([1.0, 2.0, 3.0])
+
+with tempfile.TemporaryDirectory() as root:
+    import h5py
+    filename = os.path.join(root, "run.h5")
+    run(HDF5Backend(filename))
+    with h5py.File(filename, "r") as f:
+        assert np.array_equal(f["/sys/x"][:], xs)
+        assert np.array_equal(f["/sys/v"][:], vs)
+    print("HDF5 ok")
+
+    import pyarrow as pa
+    filename = os.path.join(root, "run.arrow")
+    run(ArrowIPCBackend(filename, run_id=3))
+    table = pa.ipc.open_file(filename).read_all()
+    assert np.array_equal(table["step"].to_numpy(), np.arange(100))
+    assert np.array_equal(table["run_id"].to_numpy(), np.full(100, 3))
+    assert np.array_equal(table["/sys/x"].to_numpy(), xs)
+    assert np.array_equal(np.array(table["/sys/v"].to_pylist()), vs)
+    print("Arrow IPC ok")
+
+    import pyarrow.dataset as ds
+    for run_id in [0, 1]:
+        run(ParquetBackend(root + "/campaign", run_id=run_id))
+    dataset = ds.dataset(root + "/campaign", partitioning="hive")
+    table = dataset.to_table(filter=ds.field("run_id") == 1)
+    assert table.num_rows == 100
+    assert np.array_equal(np.sort(table["/sys/x"].to_numpy()), xs)
+    assert dataset.to_table().num_rows == 200
+    print("Parquet ok")
+
+# A backend without write_batch() fails when it is made, not during the run
+class IncompleteBackend(OutputBackend):
+    def close(self):
+        pass
+
+try:
+    IncompleteBackend()
+    assert False
+except TypeError as e:
+    print(e)
@@ -0,0 +1,98 @@
+"""Test the counter-based random streams.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from random_streams import RandomStreams, _UNIFORM
+import numpy as np
+
+
+streams = RandomStreams(seed=1, run_id=0)
+
+with System(name="sys") as sys:
+    x1 = make_node("S:x1:0.0")
+    x2 = make_node("S:x2:0.0")
+    y1 = make_node("V:y1")
+    y2 = make_node("V:y2")
+    d1 = make_node("V:d1")
+
+    @make_function(y1)
+    def g1(x1=x1):
+        return x1 + streams.normal(g1)
+
+    # Draws twice per step
+    @make_function(y2, d1)
+    def g2(x2=x2):
+        return x2 + streams.normal(g2), streams.normal(g2)
+
+streams.bind(sys)
+print(streams)
+
+ys = []
+for i in range(2000):
+    sys.forward()
+    ys.append([sys.y1.value, sys.y2.value, sys.d1.value])
+    sys.transition()
+    streams.advance()
+ys = np.array(ys)
+
+# Two draws in the same step are different and uncorrelated
+assert np.all(ys[:, 1] != ys[:, 2])
+corr = np.corrcoef(ys.T)
+print(corr)
+assert np.all(np.abs(corr[np.triu_indices(3, 1)]) < 0.1)
+
+# Every draw is addressable: the first draws equal one vectorized block,
+# the second draws the block with draw=1
+assert np.array_equal(ys[:, 0], streams.normal_block(g1, 0, 2000))
+assert np.array_equal(ys[:, 1], streams.normal_block(g2, 0, 2000))
+assert np.array_equal(ys[:, 2], streams.normal_block(g2, 0, 2000, draw=1))
+assert streams.normal(g1, step=17) == ys[17, 0]
+assert streams.normal("/sys/g2", step=17, draw=1) == ys[17, 2]
+
+# Uniform and normal draws of one stream use different words
+u = streams.uniform_block(g1, 0, 2000)
+assert abs(np.corrcoef(u, ys[:, 0])[0, 1]) < 0.1
+
+# The moments of a long block
+z = streams.normal_block(g1, 0, 100_000, size=2)
+u = streams.uniform_block(g1, 0, 100_000)
+print(z.mean(), z.std(), u.mean(), u.var())
+assert np.all(np.abs(z.mean(axis=0)) < 0.02) and np.all(np.abs(z.std(axis=0) - 1.0) < 0.02)
+assert abs(u.mean() - 0.5) < 0.01 and abs(u.var() - 1.0 / 12.0) < 0.01
+assert np.all((u > 0.0) & (u < 1.0))
+
+# Other runs differ, the same run repeats
+other = RandomStreams(seed=1, run_id=1, system=sys)
+same = RandomStreams(seed=1, run_id=0, system=sys)
+assert not np.array_equal(other.normal_block(g1, 0, 10), ys[:10, 0])
+assert np.array_equal(same.normal_block(g1, 0, 10), ys[:10, 0])
+
+# Streams are resolved from the functions; a mistyped path is rejected
+for stream in ["/sys/g3", Function(name="g3", func=lambda: 0.0)]:
+    try:
+        streams.normal(stream)
+        raise AssertionError(f"{stream} is not a function of sys")
+    except ValueError as e:
+        print(e)
+
+# Consecutive steps drawn with different sizes do not share words
+sizes = [1, 3, 4, 5, 8, 13, 2, 7]
+words = np.concatenate([streams._raw(g1, step, 1, sizes[step % len(sizes)], 0, _UNIFORM)[0]
+                        for step in range(400)])
+assert len(np.unique(words)) == len(words)
+mixed = RandomStreams(seed=1, run_id=0, system=sys)
+values = []
+for step in range(400):
+    values.append(mixed.uniform(g1, sizes[step % len(sizes)]))
+    values.append(mixed.uniform(g1, sizes[(step + 3) % len(sizes)]))
+    mixed.advance()
+values = np.concatenate(values)
+assert len(np.unique(values)) == len(values)
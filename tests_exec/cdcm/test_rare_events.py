@@ -0,0 +1,66 @@
+"""Test multilevel splitting on a random walk with a known exceedance probability.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from rare_events import *
+import numpy as np
+
+
+with System(name="walk") as walk:
+    x = make_node("S:x:0.0")
+
+    @make_function(x)
+    def f(x=x):
+        return x + np.random.randn()
+
+
+def score(walk):
+    return walk.x.value
+
+
+n_steps = 20
+threshold = 14.0
+
+# Reference: the probability that a Gaussian random walk reaches 14 within
+# 20 steps, from ten million vectorized walks
+rng = np.random.default_rng(0)
+hits = 0
+n_walks = 10_000_000
+for _ in range(n_walks // 1_000_000):
+    paths = np.cumsum(rng.standard_normal((1_000_000, n_steps), dtype=np.float32), axis=1)
+    hits += int(np.count_nonzero(paths.max(axis=1) >= threshold))
+reference = hits / n_walks
+reference_error = np.sqrt(reference * (1.0 - reference) / n_walks)
+print(f"reference: {reference:1.3e} +- {reference_error:1.1e}")
+
+levels = pilot_levels(walk, score, threshold, n_steps, n_particles=200, seed=1)
+print("levels:", levels)
+assert levels[-1] == threshold and np.all(np.diff(levels) > 0)
+
+result = multilevel_splitting(walk, score, levels, n_steps, n_particles=1000, seed=2)
+print(result, result.confidence_interval())
+
+# The system is back in its initial state
+assert walk.x.value == 0.0
+
+# Plain Monte Carlo would need far more steps for the same error
+plain = n_steps * (1.0 - reference) / (reference * result.relative_error ** 2)
+print(f"steps: {result.n_steps_simulated} splitting vs. about {plain:1.0f} plain Monte Carlo")
+assert result.n_steps_simulated < plain
+
+# The estimator is unbiased: the mean of independent estimates is within
+# four of its standard errors of the reference
+estimates = [multilevel_splitting(walk, score, levels, n_steps, n_particles=250,
+                                  seed=10 + i).estimate for i in range(12)]
+mean = np.mean(estimates)
+error = np.hypot(np.std(estimates, ddof=1) / np.sqrt(len(estimates)), reference_error)
+print(f"mean of {len(estimates)} estimates: {mean:1.3e} +- {error:1.1e}")
+assert abs(mean - reference) < 4.0 * error
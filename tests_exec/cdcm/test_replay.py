@@ -0,0 +1,100 @@
+"""Test the fast replay of a data system.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import time
+from datetime import timedelta
+
+from cdcm import *
+from replay import DataReplay
+import numpy as np
+
+
+data = np.stack([np.arange(20.0), 100.0 + np.arange(20.0)], axis=1)
+
+
+def make_system():
+    with System(name="replay_sys") as sys:
+        clock = make_clock(1.0)
+        recorded = DataSystem(
+            data=data,
+            name="recorded",
+            columns=["a", "b"],
+            column_units=["meters", "meters"],
+            column_descriptions=["Read by the model.", "Read by nobody."]
+        )
+        x = make_node("S:x:0.0:meters")
+
+        @make_function(x)
+        def fx(x=x, a=recorded.a):
+            return x + a
+
+    return sys
+
+
+# Only fx reads a column
+sys = make_system()
+replay = DataReplay(sys, sys.recorded, ["a", "b"])
+print(replay)
+assert "fx" in [func.name for func in replay.plan]
+assert replay.driving == [0]
+assert replay.pure == [1]
+
+# The state accumulates a, the pure column ends at the last replayed row
+assert replay.run(10) == 10
+print(f"x = {sys.x.value}, b = {sys.recorded.b.value}")
+assert sys.x.value == data[:10, 0].sum()
+assert sys.recorded.b.value == data[9, 1]
+
+# The pure column is up to date whenever the callback sees it
+seen = []
+replay.run(5, callback=lambda row: seen.append((row, sys.recorded.b.value)))
+print(seen)
+assert seen == [(i, data[i, 1]) for i in range(10, 15)]
+assert sys.x.value == data[:15, 0].sum()
+
+# Pacing: 5 steps of one hour at 36000 times real time take 0.4 s at least
+start = time.perf_counter()
+replay.run(5, speedup=36000.0, dt=timedelta(hours=1))
+assert time.perf_counter() - start >= 0.4
+assert len(replay) == 0
+assert sys.x.value == data[:, 0].sum()
+
+# After a sync the data system continues from the next row
+sys = make_system()
+replay = DataReplay(sys, sys.recorded, ["a", "b"])
+replay.run(12)
+replay.sync()
+sys.forward()
+print(f"a = {sys.recorded.a.value}, b = {sys.recorded.b.value}")
+assert sys.recorded.a.value == data[12, 0]
+assert sys.recorded.b.value == data[12, 1]
+assert sys.x.value == data[:12, 0].sum()
+
+# A replay that starts later leaves the data system after its last row
+sys = make_system()
+replay = DataReplay(sys, sys.recorded, ["a", "b"], start_row=5)
+assert replay.run(4) == 4
+replay.sync()
+sys.forward()
+assert sys.recorded.a.value == data[9, 0]
+assert sys.x.value == data[5:9, 0].sum()
+sys.transition()
+sys.forward()
+assert sys.recorded.b.value == data[10, 1]
+
+# Without replayed functions the columns jump to the last row
+with System(name="data_only") as only:
+    recorded = DataSystem(data=data, name="recorded", columns=["a", "b"])
+replay = DataReplay(only, only.recorded, ["a", "b"])
+assert replay.plan == []
+assert replay.run() == 20
+assert only.recorded.a.value == data[-1, 0]
+assert only.recorded.b.value == data[-1, 1]
@@ -0,0 +1,71 @@
+"""Test the sensitivity analysis on functions with known indices.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from sensitivity import *
+import numpy as np
+
+
+def build_ishigami():
+    with System(name="ishigami") as sys:
+        p1 = make_node("P:p1:0.0")
+        p2 = make_node("P:p2:0.0")
+        p3 = make_node("P:p3:0.0")
+        y = make_node("V:y:0.0")
+
+        @make_function(y)
+        def f(p1=p1, p2=p2, p3=p3):
+            return np.sin(p1) + 7.0 * np.sin(p2) ** 2 + 0.1 * p3 ** 4 * np.sin(p1)
+
+    return sys
+
+
+def build_linear():
+    with System(name="linear") as sys:
+        a = make_node("P:a:0.0")
+        b = make_node("P:b:0.0")
+        c = make_node("P:c:0.0")
+        y = make_node("V:y:0.0")
+
+        @make_function(y)
+        def f(a=a, b=b, c=c):
+            return 2.0 * a - 3.0 * b
+
+    return sys
+
+
+def output(sys):
+    return sys.y.value
+
+
+if __name__ == "__main__":
+    assert sorted(get_parameters(build_linear())) == ["/linear/a", "/linear/b", "/linear/c"]
+
+    # The Ishigami function with a = 7, b = 0.1 on [-pi, pi]^3
+    bounds = {f"/ishigami/p{i}": (-np.pi, np.pi) for i in [1, 2, 3]}
+    analysis = SensitivityAnalysis(build_ishigami, bounds, output, n_steps=1)
+    result = analysis.sobol(n=4096, seed=0, processes=2)
+    print(result)
+    S1 = np.array([0.3139, 0.4424, 0.0])
+    ST = np.array([0.5576, 0.4424, 0.2437])
+    assert np.all(np.abs(result["S1"] - S1) < 0.05)
+    assert np.all(np.abs(result["ST"] - ST) < 0.05)
+    assert np.all(result["S1_conf"] > 0.0) and np.all(result["S1_conf"] < 0.1)
+
+    # Morris: the elementary effects of a linear function are its slopes
+    # times the widths of the ranges
+    bounds = {"/linear/a": (0.0, 1.0), "/linear/b": (0.0, 2.0), "/linear/c": (0.0, 1.0)}
+    analysis = SensitivityAnalysis(build_linear, bounds, output, n_steps=1)
+    result = analysis.morris(n_trajectories=10, seed=0)
+    print(result)
+    assert np.allclose(result["mu"], [2.0, -6.0, 0.0])
+    assert np.allclose(result["mu_star"], [2.0, 6.0, 0.0])
+    assert np.allclose(result["sigma"], 0.0)
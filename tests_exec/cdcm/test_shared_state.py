@@ -0,0 +1,92 @@
+"""Test the exchange of states and parameters through shared memory.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import os
+import subprocess
+import sys as _sys
+import threading
+import time
+
+from cdcm import *
+from shared_state import SharedStateBlock
+import numpy as np
+
+
+with System(name="hab") as sys:
+    clock = make_clock(1.0)
+    a = State(name="a", value=np.zeros(100), units="")
+    b = State(name="b", value=np.zeros(100), units="")
+    n_heaters = make_node("P:n_heaters:3")
+    on = make_node("P:on:True")
+    gain = make_node("P:gain:0.5")
+    k = make_node("S:k:0")
+
+    @make_function(a, b, k)
+    def f(k=k, n_heaters=n_heaters, gain=gain):
+        return np.full(100, k + 1.0), np.full(100, k + 1.0), k + 1
+
+block = SharedStateBlock(sys)
+print(block)
+try:
+    # Integer and boolean parameters keep their dtype, other integers become floats
+    assert block.view("/hab/n_heaters").dtype.kind == "i"
+    assert block.view("/hab/on").dtype == bool
+    assert block.view("/hab/k").dtype == np.float64
+
+    # Another handle writes parameters, the simulation pulls them
+    other = SharedStateBlock.attach(block.name)
+    other.write("/hab/n_heaters", 5)
+    other.write("/hab/gain", 0.25)
+    block.pull()
+    print(n_heaters.value, gain.value)
+    assert n_heaters.value == 5 and isinstance(n_heaters.value, int)
+    assert gain.value == 0.25
+    assert on.value is True
+
+    # Reads are consistent while the simulation pushes: a and b always match
+    done = threading.Event()
+
+    def simulate():
+        for i in range(2000):
+            sys.forward()
+            sys.transition()
+            block.push()
+        done.set()
+
+    thread = threading.Thread(target=simulate)
+    thread.start()
+    reads = 0
+    while not done.is_set():
+        values = other.read()
+        assert np.array_equal(values["/hab/a"], values["/hab/b"])
+        assert np.all(values["/hab/a"] == values["/hab/a"][0])
+        reads += 1
+    thread.join()
+    print(f"{reads} consistent reads")
+    assert other.view("/hab/k")[()] == 2000.0
+    other.close()
+
+    # A process that attaches and exits does not take the block with it
+    code = ("from shared_state import SharedStateBlock; "
+            + f"block = SharedStateBlock.attach({block.name!r}); "
+            + "print(block.view('/hab/n_heaters')[()]); block.close()")
+    result = subprocess.run([_sys.executable, "-c", code], capture_output=True,
+                            text=True, env=dict(os.environ), cwd=os.getcwd())
+    print(result.stdout.strip(), result.stderr.strip())
+    assert result.returncode == 0 and result.stdout.strip() == "5"
+    assert "leaked" not in result.stderr
+    # The resource tracker of the other process cleans up after it exited
+    time.sleep(0.5)
+    again = SharedStateBlock.attach(block.name)
+    assert again.view("/hab/n_heaters")[()] == 5
+    again.close()
+finally:
+    block.close()
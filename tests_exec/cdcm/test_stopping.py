@@ -0,0 +1,93 @@
+"""Test the stopping criteria on signals with known behavior.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from datetime import timedelta
+
+from cdcm import *
+from stopping import *
+from time_units import get_timedelta
+import numpy as np
+
+
+assert get_timedelta(1, "hr") == timedelta(hours=1)
+assert get_timedelta(30, "min") == timedelta(minutes=30)
+assert get_timedelta(0.5, "seconds") == timedelta(seconds=0.5)
+
+# An exactly periodic sine with a period of 24 steps. It crosses zero, where
+# a tolerance relative to the value itself would be zero.
+with System(name="daily") as sys:
+    clock = make_clock(dt=1, units="hr")
+    y = make_node("V:y:0.0")
+
+    @make_function(y)
+    def g(t=clock.t):
+        return np.sin(2.0 * np.pi * t / 24.0)
+
+criterion = PeriodicSteadyState(sys.y, 24)
+steps, reason = run_until(sys, [criterion], max_steps=1000)
+print(steps, reason)
+# The buffer holds 24 + 24 + 1 values and is checked every 24 steps
+assert steps == 72
+
+# A low-pass filtered, clipped sine over the lunar day, i.e., with a period
+# of 708.73 hourly steps, that starts far from its periodic steady state
+with System(name="habitat") as hab:
+    clock = make_clock(dt=1, units="hr")
+    Q = make_node("V:Q:0.0:W/m^2")
+    T = make_node("S:T:1000.0:K")
+
+    @make_function(Q)
+    def g(t=clock.t):
+        return 1361.0 * max(0.0, np.sin(2.0 * np.pi * t / 708.7341))
+
+    @make_function(T)
+    def f(T=T, Q=Q):
+        return 0.95 * T + 0.05 * (100.0 + 0.2 * Q)
+
+criterion = PeriodicSteadyState.from_clock(hab.T, hab.clock)
+print(f"period = {criterion.period:1.2f} steps")
+assert abs(criterion.period - 708.7341) < 1e-3
+steps, reason = run_until(hab, [criterion], max_steps=5000)
+print(steps, reason)
+assert 2 * 708 < steps < 5000
+
+# Converged and Threshold on x_n = 1 - 0.9^n
+with System(name="decay") as sys:
+    x = make_node("S:x:0.0")
+
+    @make_function(x)
+    def f(x=x):
+        return 0.9 * x + 0.1
+
+steps, reason = run_until(sys, [Threshold(sys.x, upper=0.5)], max_steps=100)
+print(steps, reason)
+# Step k sees x before its transition, i.e., 1 - 0.9^(k - 1), and
+# 1 - 0.9^6 = 0.47, 1 - 0.9^7 = 0.52
+assert steps == 8
+
+sys.x.value = 0.0
+steps, reason = run_until(sys, [Converged(sys.x, 10, rtol=1e-4)], max_steps=1000)
+print(steps, reason)
+assert 0.9 ** steps < 1e-3
+
+sys.x.value = 0.0
+steps, reason = run_until(sys, [Predicate(lambda: sys.x.value > 0.99, "full")], max_steps=1000)
+assert reason == "full" and 1 - 0.9 ** (steps - 1) > 0.99 > 1 - 0.9 ** (steps - 2)
+
+# A criterion without update() fails when it is made, not during the run
+class IncompleteCriterion(StoppingCriterion):
+    reason = "never"
+
+try:
+    IncompleteCriterion()
+    assert False
+except TypeError as e:
+    print(e)
@@ -0,0 +1,75 @@
+"""Test recording, fitting and swapping a surrogate of a function.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from surrogates import *
+import numpy as np
+
+
+with System(name="sys") as sys:
+    clock = make_clock(0.1)
+
+    with System(name="thermal") as thermal:
+        x = make_node("S:x:0.0")
+        u = make_node("V:u:0.0")
+        q = make_node("V:q:0.0")
+        v = make_node("V:v", value=np.zeros(2))
+
+        @make_function(x)
+        def f_x(x=x, t=clock.t):
+            return 0.9 * x + np.sin(t)
+
+        @make_function(u)
+        def f_u(t=clock.t):
+            return np.cos(0.7 * t)
+
+        # The expensive function: a quadratic, so a degree 2 surrogate is exact
+        @make_function(q, v)
+        def f_heat(x=x, u=u):
+            return 0.5 * x ** 2 + 2.0 * x * u - u + 3.0, np.array([x + u, x * u])
+
+functions = get_subsystem_functions(sys, "/sys/thermal")
+print([f.name for f in functions])
+assert sorted(f.name for f in functions) == ["f_heat", "f_u", "f_x"]
+f_heat = thermal.f_heat
+original = f_heat.func
+
+recorder = SurrogateRecorder(f_heat)
+for i in range(200):
+    sys.forward()
+    sys.transition()
+recorder.stop()
+assert f_heat.func is original
+print(recorder.X.shape, recorder.Y.shape, recorder.output_shapes)
+assert recorder.X.shape == (200, 2) and recorder.Y.shape == (200, 3)
+assert recorder.output_shapes == [(), (2,)]
+
+surrogate = PolynomialSurrogate(degree=2).fit(recorder.X, recorder.Y)
+assert np.allclose(surrogate.predict(recorder.X), recorder.Y, atol=1e-6)
+
+swap = SurrogateSwap(f_heat, surrogate, output_shapes=recorder.output_shapes,
+                     validate=True)
+for i in range(100):
+    sys.forward()
+    assert np.shape(thermal.v.value) == (2,)
+    sys.transition()
+errors = swap.errors()
+print(errors)
+assert np.all(errors["max_abs_error"] < 1e-5)
+assert np.all(errors["r2"] > 1.0 - 1e-9)
+
+swap.restore()
+assert f_heat.func is original
+
+# A linear surrogate cannot represent the quadratic
+linear = PolynomialSurrogate(degree=1).fit(recorder.X, recorder.Y)
+residual = linear.predict(recorder.X) - recorder.Y
+assert np.max(np.abs(residual[:, 0])) > 0.01
@@ -0,0 +1,87 @@
+"""Test the generator of synthetic coupled systems.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from algebraic_loops import find_algebraic_loops
+from dag_utils import iter_nodes, get_functions, get_states
+from synthetic_systems import make_synthetic_system
+import numpy as np
+
+
+def describe(sys):
+    """The structure of a system: every node with the paths of its parents."""
+    paths = {id(node): path for path, node in iter_nodes(sys)}
+    paths.update({id(func): path for path, func in get_functions(sys)})
+    return [(path, type(node).__name__, [paths.get(id(p)) for p in node.parents])
+            for path, node in iter_nodes(sys) if not isinstance(node, System)]
+
+
+def run(sys, n_steps):
+    for i in range(n_steps):
+        sys.forward()
+        sys.transition()
+    return np.array([state.value for _, state in get_states(sys)])
+
+
+# The size of the system
+for n_nodes in [100, 2000, 20000]:
+    sys = make_synthetic_system(n_nodes, n_subsystems=8, depth=3, seed=1)
+    nodes = describe(sys)
+    print(f"{n_nodes}: {len(nodes)} nodes")
+    assert abs(len(nodes) - n_nodes) <= 8
+
+# The nesting: 8 leaves, two levels of pairwise groups and the root
+sys = make_synthetic_system(2000, n_subsystems=8, depth=3, seed=1)
+systems = [path for path, node in iter_nodes(sys) if isinstance(node, System)]
+assert len(systems) == 1 + 2 + 4 + 8
+assert max(path.count("/") for path in systems) == 4
+
+# The same seed gives the same system and trajectory, another one does not
+a = make_synthetic_system(2000, n_subsystems=8, depth=3, seed=1)
+b = make_synthetic_system(2000, n_subsystems=8, depth=3, seed=1)
+c = make_synthetic_system(2000, n_subsystems=8, depth=3, seed=2)
+assert describe(a) == describe(b)
+assert describe(a) != describe(c)
+assert np.array_equal(run(a, 20), run(b, 20))
+
+# The coupling only goes through states, so there are no algebraic loops
+for seed in range(3):
+    sys = make_synthetic_system(2000, n_subsystems=8, coupling=0.3, seed=seed)
+    assert find_algebraic_loops(sys) == []
+
+# The states and the coupling
+sys = make_synthetic_system(20000, n_subsystems=8, state_fraction=0.5,
+                            coupling=0.2, seed=3)
+variables = [node for _, node in iter_nodes(sys) if isinstance(node, Variable)
+             and not isinstance(node, Parameter)]
+fraction = np.mean([isinstance(node, State) for node in variables])
+print(f"state fraction = {fraction:1.3f}")
+assert abs(fraction - 0.5) < 0.03
+owner = {id(node): path.rsplit("/", 1)[0] for path, node in iter_nodes(sys)}
+inputs = [(owner[id(func.children[0])], owner[id(p)])
+          for _, func in get_functions(sys) for p in func.parents
+          if not isinstance(p, Parameter) and p is not func.children[0]]
+across = [p for f, p in inputs if f != p]
+print(f"{len(across)} of {len(inputs)} inputs cross subsystems")
+assert abs(len(across) / len(inputs) - 0.2) < 0.03
+assert all(isinstance(p, State) for _, func in get_functions(sys) for p in func.parents
+           if owner[id(p)] != owner[id(func.children[0])])
+
+# The fan-out within a subsystem
+sys = make_synthetic_system(20000, n_subsystems=8, fan_in=3, max_fan_out=2,
+                            coupling=0.0, seed=4)
+readers = {}
+for _, func in get_functions(sys):
+    for p in func.parents:
+        if not isinstance(p, Parameter) and p is not func.children[0]:
+            readers[id(p)] = readers.get(id(p), 0) + 1
+print(f"max fan-out = {max(readers.values())}")
+assert max(readers.values()) == 2
@@ -0,0 +1,95 @@
+"""Test the simulation of the slice of a system that some targets need.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from system_slice import slice_system
+import numpy as np
+
+
+def make_system():
+    with System(name="hab") as sys:
+        clock = make_clock(0.1)
+
+        with System(name="thermal") as thermal:
+            T = make_node("S:T:290.0:K")
+            Q = make_node("V:Q:0.0:W")
+
+        with System(name="power") as power:
+            soc = make_node("S:soc:1.0")
+            load = make_node("V:load:0.0:W")
+
+        with System(name="comms") as comms:
+            noise = make_node("V:noise:0.0")
+            count = make_node("S:count:0.0")
+
+        # The heater load depends on the temperature of the last step
+        @make_function(load)
+        def f_load(T=T):
+            return 100.0 + 2.0 * (295.0 - T)
+
+        @make_function(soc)
+        def f_soc(soc=soc, load=load, dt=clock.dt):
+            return soc - 1e-4 * load * dt
+
+        @make_function(Q)
+        def f_Q(load=load):
+            return 0.9 * load
+
+        @make_function(T)
+        def f_T(T=T, Q=Q, dt=clock.dt):
+            return T + dt * (Q - 0.3 * (T - 250.0)) / 50.0
+
+        # Unrelated to the state of charge
+        @make_function(noise)
+        def f_noise():
+            return np.random.randn()
+
+        @make_function(count)
+        def f_count(count=count, noise=noise):
+            return count + (noise > 0)
+
+    return sys
+
+
+# The full simulation
+sys = make_system()
+reference = []
+for i in range(200):
+    sys.forward()
+    reference.append(sys.power.soc.value)
+    sys.transition()
+
+# The slice of the state of charge: load, soc, Q and T, but not the comms
+sys = make_system()
+soc = slice_system(sys, targets=["/hab/power/soc"])
+print(soc)
+names = sorted(func.name for func in soc.plan)
+print(names)
+assert {"f_load", "f_soc", "f_Q", "f_T"} <= set(names)
+assert "f_noise" not in names and "f_count" not in names
+assert len(soc.plan) < soc.n_functions
+assert sorted(state.name for state in soc.states) == ["T", "soc"]
+
+recorder = soc.recorder()
+for i in range(200):
+    soc.forward()
+    recorder.record()
+    soc.transition()
+values = recorder.to_numpy("/hab/power/soc")
+assert np.array_equal(values, np.array(reference))
+assert sys.comms.count.value == 0.0
+assert "/hab/comms/noise" not in recorder.to_numpy()
+
+# The load only depends on the temperature within a step, but across time
+# on everything that updates it
+load = slice_system(sys, targets=[sys.power.load])
+assert sorted(func.name for func in load.plan
+              if func.name.startswith("f_")) == ["f_Q", "f_T", "f_load"]
@@ -0,0 +1,108 @@
+"""Test the live telemetry of a running simulation.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+import json
+import os
+import tempfile
+from urllib.request import urlopen
+
+from cdcm import *
+from output_backends import OutputBackend, StreamingSaver
+from telemetry import *
+
+
+class NullBackend(OutputBackend):
+    def write_batch(self, columns, start):
+        pass
+
+    def close(self):
+        pass
+
+
+class PlainSaver:
+    """A saver without a buffer, like the ``SimulationSaver``."""
+
+    def save(self):
+        pass
+
+
+with System(name="tel") as sys:
+    clock = make_clock(1.0)
+
+    with System(name="thermal") as thermal:
+        T = make_node("S:T:300.0:K")
+
+        @make_function(T)
+        def f_T(T=T):
+            return T - 0.01 * (T - 250.0)
+
+    with System(name="power") as power:
+        soc = make_node("S:soc:1.0")
+
+        @make_function(soc)
+        def f_soc(soc=soc):
+            return 0.999 * soc
+
+simulator = Simulator(sys)
+simulator.add_event(1000.0, lambda: None)
+saver = StreamingSaver(sys, NullBackend(), batch_size=8)
+saver.name = "stream"
+path = os.path.join(tempfile.mkdtemp(), "metrics.jsonl")
+prometheus = PrometheusExporter(port=0)
+telemetry = Telemetry(simulator, sample_every=10, savers=[saver, PlainSaver()],
+                      exporters=[JSONLinesExporter(path), prometheus])
+print(telemetry)
+for i in range(30):
+    telemetry.forward()
+    saver.save()
+    telemetry.transition()
+text = urlopen(f"http://127.0.0.1:{prometheus.port}/metrics").read().decode()
+telemetry.close()
+
+# Every line is strict JSON, without NaN for the saver without a buffer
+def no_constants(name):
+    raise ValueError(f"{name} is not valid JSON.")
+
+with open(path) as f:
+    samples = [json.loads(line, parse_constant=no_constants) for line in f]
+for sample in samples:
+    print(sample)
+assert [s["steps_total"] for s in samples] == [10, 20, 30]
+# 10, 20 and 30 rows in batches of 8
+assert [s["saver_buffer_fill"] for s in samples] == [
+    {"stream": 2 / 8}, {"stream": 4 / 8}, {"stream": 6 / 8}]
+assert all(s["event_queue_depth"] == 1 for s in samples)
+assert {"/tel/thermal", "/tel/power"} <= set(samples[-1]["subsystem_seconds"])
+assert all(s["steps_per_second"] > 0 for s in samples)
+
+print(text)
+assert "cdcm_steps_total 30" in text
+assert 'cdcm_saver_buffer_fill{name="stream"} 0.75' in text
+assert 'cdcm_subsystem_seconds{subsystem="/tel/thermal"}' in text
+assert "saver1" not in text
+
+# Resident memory from /proc on Linux, the peak from getrusage, both in bytes
+last = samples[-1]
+print(last["resident_memory_bytes"], last["peak_resident_memory_bytes"])
+assert last["resident_memory_bytes"] > 1 << 20
+# The kernel updates the peak lazily, but both are in the same units
+assert last["peak_resident_memory_bytes"] > 0.9 * last["resident_memory_bytes"]
+assert f"cdcm_peak_resident_memory_bytes {last['peak_resident_memory_bytes']}" in text
+
+# An exporter without export() fails when it is made, not during the run
+class IncompleteExporter(MetricsExporter):
+    pass
+
+try:
+    IncompleteExporter()
+    assert False
+except TypeError as e:
+    print(e)
@@ -0,0 +1,58 @@
+"""Test the in-memory trajectory recorder.
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+from cdcm import *
+from trajectory_recorder import TrajectoryRecorder
+import numpy as np
+
+
+with System(name="exp_decay") as sys:
+    clock = make_clock(0.1)
+
+    x = make_node("S:x:1.0:m")
+    v = State(name="v", value=np.zeros(2), units="m")
+    omega = make_node("P:omega:0.5:1/s")
+
+    @make_function(x)
+    def f(x=x, omega=omega, dt=clock.dt):
+        return x - dt * omega * x
+
+    @make_function(v)
+    def g(v=v, x=x):
+        return v + np.array([x, -x])
+
+# A small capacity, so the columns have to grow
+recorder = TrajectoryRecorder(sys, ["/exp_decay/x", v], capacity=4)
+for i in range(50):
+    sys.forward()
+    recorder.record()
+    sys.transition()
+
+print(recorder)
+xs = recorder.to_numpy("/exp_decay/x")
+vs = recorder.to_numpy("/exp_decay/v")
+
+# x is recorded before the transition, i.e., x_i = 0.95^i
+assert len(recorder) == 50 and recorder.capacity == 64
+assert np.allclose(xs, 0.95 ** np.arange(50))
+assert vs.shape == (50, 2)
+assert np.allclose(vs[:, 0], np.cumsum(xs) - xs)
+assert np.allclose(vs[:, 1], -vs[:, 0])
+
+df = recorder.to_pandas()
+print(df.head())
+assert list(df.columns) == ["/exp_decay/x", "/exp_decay/v[0]", "/exp_decay/v[1]"]
+
+ds = recorder.to_xarray()
+assert ds["/exp_decay/v"].shape == (50, 2)
+
+recorder.clear()
+assert len(recorder) == 0 and recorder.to_numpy("/exp_decay/x").shape == (0,)
@@ -0,0 +1,49 @@
+"""Conversion of clock units to durations
+
+Clocks are made with units like ``"hr"`` (see ``make_clock(dt=1, units="hr")``)
+that ``datetime.timedelta`` does not understand. ``get_timestep()`` maps the
+common spellings to a duration:
+
+    dt = get_timestep(hab.clock)       # timedelta(hours=1)
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["TIME_UNITS", "get_timedelta", "get_timestep"]
+
+
+from datetime import timedelta
+from numbers import Number
+
+from cdcm import *
+
+
+# Spellings of the time units, mapped to the keywords of timedelta
+TIME_UNITS = {
+    **dict.fromkeys(["us", "microsecond", "microseconds"], "microseconds"),
+    **dict.fromkeys(["ms", "millisecond", "milliseconds"], "milliseconds"),
+    **dict.fromkeys(["s", "sec", "secs", "second", "seconds"], "seconds"),
+    **dict.fromkeys(["min", "mins", "minute", "minutes"], "minutes"),
+    **dict.fromkeys(["h", "hr", "hrs", "hour", "hours"], "hours"),
+    **dict.fromkeys(["d", "day", "days"], "days"),
+    **dict.fromkeys(["w", "week", "weeks"], "weeks"),
+}
+
+
+def get_timedelta(value: Number, units: str) -> timedelta:
+    """The duration of ``value`` in ``units``, e.g., ``get_timedelta(1, "hr")``."""
+    key = units.strip().lower()
+    if key not in TIME_UNITS:
+        raise ValueError(f"Unknown time units {units!r}. Use one of {sorted(TIME_UNITS)}.")
+    return timedelta(**{TIME_UNITS[key]: float(value)})
+
+
+def get_timestep(clock: System) -> timedelta:
+    """The duration of one step of a clock made by ``make_clock()``."""
+    return get_timedelta(clock.dt.value, clock.dt.units)
@@ -0,0 +1,152 @@
+"""In-memory recorder of simulation trajectories
+
+Author:
+    Rashi Jain
+
+Date:
+    10.19.2026
+
+"""
+
+
+__all__ = ["TrajectoryRecorder"]
+
+
+from typing import Dict, Sequence, Union
+
+import numpy as np
+
+from cdcm import *
+from dag_utils import iter_nodes
+
+
+class TrajectoryRecorder:
+    """Records the values of variables in growable NumPy columns.
+
+    This is the in-memory counterpart of the ``SimulationSaver`` for short
+    interactive runs. Columns are keyed by the same paths, e.g.
+    ``/sys/x``. Each column is preallocated and doubles in size when it
+    fills up, so recording costs one array assignment per variable.
+
+    Use it like the saver:
+
+        recorder = TrajectoryRecorder(sys)
+        for i in range(n_steps):
+            sys.forward()
+            recorder.record()
+            sys.transition()
+        xs = recorder.to_numpy("/sys/x")
+
+    The arrays returned by ``to_numpy()`` are views into the recorder.
+    They stay valid until the next ``record()`` that grows the columns.
+
+    Arguments:
+        system   -- The system to record.
+        nodes    -- The variables (or their paths) to record. By default all
+                    variables with ``track=True``.
+        capacity -- The initial number of rows.
+        executor -- A ``LazyExecutor`` (or anything with ``pull_all()``) that
+                    computes the recorded variables before every row.
+    """
+
+    def __init__(self,
+                 system: System,
+                 nodes: Sequence[Union[Variable, str]]=None,
+                 *,
+                 capacity: int=1024,
+                 executor=None) -> None:
+        self.system = system
+        self.executor = executor
+        variables = [(path, node) for path, node in iter_nodes(system)
+                     if isinstance(node, Variable)]
+        if nodes is None:
+            variables = [(path, node) for path, node in variables
+                         if getattr(node, "track", True)]
+        else:
+            wanted = {n if isinstance(n, str) else id(n) for n in nodes}
+            variables = [(path, node) for path, node in variables
+                         if path in wanted or id(node) in wanted]
+            if len(variables) < len(wanted):
+                raise ValueError("Some of the requested nodes are not in "
+                                 + f"system {system.name}.")
+        self.paths = [path for path, _ in variables]
+        self.variables = [node for _, node in variables]
+        self.capacity = capacity
+        self.size = 0
+        self.columns = None
+
+    def _allocate(self) -> None:
+        self.columns = []
+        for variable in self.variables:
+            value = np.asarray(variable.value)
+            # Integer values are often just unset initial values of
+            # variables that become floats later on
+            dtype = float if value.dtype.kind in "iuO" else value.dtype
+            self.columns.append(np.empty((self.capacity,) + value.shape, dtype=dtype))
+
+    def _grow(self) -> None:
+        self.capacity *= 2
+        for i, column in enumerate(self.columns):
+            grown = np.empty((self.capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[i] = grown
+
+    def record(self) -> None:
+        """Append the current values of all recorded variables."""
+        if self.executor is not None:
+            self.executor.pull_all(self.variables)
+        if self.columns is None:
+            self._allocate()
+        elif self.size == self.capacity:
+            self._grow()
+        for column, variable in zip(self.columns, self.variables):
+            column[self.size] = variable.value
+        self.size += 1
+
+    def clear(self) -> None:
+        """Drop all recorded rows but keep the allocated memory."""
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def to_numpy(self, path: str=None) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        """Return a view of one column, or a dictionary of all columns."""
+        if self.columns is None:
+            self._allocate()
+        if path is not None:
+            return self.columns[self.paths.index(path)][:self.size]
+        return {p: c[:self.size] for p, c in zip(self.paths, self.columns)}
+
+    def to_pandas(self):
+        """Return the trajectories as a ``pandas.DataFrame``.
+
+        Array-valued variables are split into one column per entry,
+        named ``path[i]``.
+        """
+        import pandas as pd
+
+        data = {}
+        for path, column in self.to_numpy().items():
+            if column.ndim == 1:
+                data[path] = column
+            else:
+                flat = column.reshape(self.size, -1)
+                for i in range(flat.shape[1]):
+                    data[f"{path}[{i}]"] = flat[:, i]
+        return pd.DataFrame(data, copy=False)
+
+    def to_xarray(self):
+        """Return the trajectories as an ``xarray.Dataset`` along ``step``."""
+        import xarray as xr
+
+        data_vars = {}
+        for path, column in self.to_numpy().items():
+            dims = ("step",) + tuple(f"{path}_dim_{i}" for i in range(column.ndim - 1))
+            data_vars[path] = (dims, column)
+        return xr.Dataset(data_vars, coords={"step": np.arange(self.size)})
+
+    def __str__(self) -> str:
+        return (f"TrajectoryRecorder(system={self.system.name}, "
+                + f"variables={len(self.paths)}, rows={self.size}, "
+                + f"capacity={self.capacity})")